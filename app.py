@@ -1,17 +1,62 @@
+import time
+_STARTUP_T0 = time.perf_counter()
+
 import sys
 import os
+import multiprocessing
 from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QObject, QEvent, QTimer
 from styles import STYLES
 
 from ui.main_window import MainWindow
+from ui.settings_page import apply_saved_settings
+
+_IMPORTS_DONE = time.perf_counter()
+
+# Com esta opção o aplicativo mede o tempo até a primeira pintura da janela,
+# imprime o resultado e encerra.
+STARTUP_TIMING_FLAG = "--medir-inicializacao"
+
+class FirstPaintProbe(QObject):
+    """ Registra o instante do primeiro evento de pintura da janela principal. """
+    def __init__(self, window, on_first_paint):
+        super().__init__(window)
+        self.on_first_paint = on_first_paint
+        window.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint:
+            watched.removeEventFilter(self)
+            # Deixa a pintura terminar antes de marcar o tempo.
+            QTimer.singleShot(0, self.on_first_paint)
+        return False
+
+def _report_startup(window_created: float):
+    first_paint = time.perf_counter()
+    print(
+        f"Importações: {(_IMPORTS_DONE - _STARTUP_T0) * 1000:.0f} ms | "
+        f"Construção da janela: {(window_created - _IMPORTS_DONE) * 1000:.0f} ms | "
+        f"Primeira pintura: {(first_paint - _STARTUP_T0) * 1000:.0f} ms"
+    )
+    QApplication.instance().quit()
 
 def main():
 
-    app = QApplication(sys.argv)
+    measure_startup = STARTUP_TIMING_FLAG in sys.argv
+    app = QApplication([arg for arg in sys.argv if arg != STARTUP_TIMING_FLAG])
+    app.setOrganizationName("Grupo Nefron")
+    app.setApplicationName("SISSUP")
     app.setStyleSheet(STYLES)
-    window = MainWindow()
+    apply_saved_settings()
+    # No modo de medição o aquecimento em segundo plano não é iniciado.
+    window = MainWindow(warmup=not measure_startup)
+    if measure_startup:
+        window_created = time.perf_counter()
+        window._first_paint_probe = FirstPaintProbe(window, lambda: _report_startup(window_created))
     window.show()
     sys.exit(app.exec())
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    # Necessário para o pool de processos da exportação em lote no executável do PyInstaller.
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/backends.py
+"""
+Compara os motores de consulta (core/engines.py) em dados sintéticos
+grandes (benchmarks/synthetic.py), nas duas origens de uma competência: o
+banco SQLite da partição e o arquivo em Parquet (core/archive.py).
+
+Para cada escala, origem e motor, mede cada consulta de ENGINE_METHODS
+(melhor de --repeat execuções) e confere a saída com a do motor de
+referência na mesma origem. Termina com código 1 se houver diferença.
+
+Uso, a partir da raiz do projeto:
+    python -m benchmarks.backends --rows 100000 1000000
+    python -m benchmarks.backends --rows 500000 --engine referencia duckdb --output motores.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.equivalence import _compare, _timed
+from benchmarks.synthetic import build_database, write_sources
+from core.archive import PARQUET_AVAILABLE, ArchivedDatabase, archive_partition
+from core.database import Database
+from core.engines import ENGINE_METHODS, QUERY_ENGINES, QueryEngine, get_engine
+from core.partitions import partition_path
+
+def _sources(rows: int, work_dir: str, clinic: str, month: int, year: int, seed: int) -> dict:
+    """ Importa os dados sintéticos na partição e, com o pyarrow, arquiva uma cópia em Parquet. """
+    paths = write_sources(os.path.join(work_dir, 'csv'), rows, year, month, seed)
+    base_dir = os.path.join(work_dir, 'dados')
+    db_path = partition_path(clinic, month, year, base_dir)
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    build_database(db_path, paths).close()
+
+    sources = {'sqlite': Database(db_path)}
+    if PARQUET_AVAILABLE:
+        result = archive_partition(clinic, month, year, base_dir, remove=False)
+        sources['parquet'] = ArchivedDatabase(result['path'])
+    return sources
+
+def run_scale(rows: int, work_dir: str, engines: list, repeat: int, clinic: str, month: int, year: int, seed: int, log=print) -> list:
+    results = []
+    sources = _sources(rows, work_dir, clinic, month, year, seed)
+    try:
+        for source_name, db in sources.items():
+            log(f"  Origem {source_name}:")
+            reference = QueryEngine(db)
+            for method, takes_period in ENGINE_METHODS.items():
+                args = (month, year) if takes_period else ()
+                # A primeira chamada da referência também carrega o arquivo Parquet na memória (ArchivedDatabase).
+                _, expected = _timed(lambda: getattr(reference, method)(*args), 1)
+                cells = []
+                for engine_name in engines:
+                    engine = get_engine(engine_name, db)
+                    seconds, actual = _timed(lambda: getattr(engine, method)(*args), repeat)
+                    differences = _compare(expected, actual)
+                    results.append({
+                        'scale': rows, 'source': source_name, 'engine': engine_name, 'name': method,
+                        'seconds': round(seconds, 4), 'equivalent': not differences, 'differences': differences[:5],
+                    })
+                    cells.append(f"{engine_name} {seconds:>8.3f} s" + ("" if not differences else " (DIFERENTE)"))
+                log(f"    {method:<36} {'  '.join(cells)}")
+    finally:
+        for db in sources.values():
+            db.close()
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--engine', nargs='+', choices=list(QUERY_ENGINES), default=list(QUERY_ENGINES), help="Motores medidos (padrão: todos).")
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000], help="Escalas (linhas de faturamento).")
+    parser.add_argument('--repeat', type=int, default=3, help="Repetições de cada consulta (vale o melhor tempo).")
+    parser.add_argument('--clinic', default='CNN')
+    parser.add_argument('--month', type=int, default=9)
+    parser.add_argument('--year', type=int, default=2025)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Grava os resultados em JSON.")
+    args = parser.parse_args(argv)
+
+    results = []
+    for rows in args.rows:
+        print(f"Escala {rows} linhas:")
+        work_dir = tempfile.mkdtemp(prefix='sissup_motores_')
+        try:
+            results += run_scale(rows, work_dir, args.engine, args.repeat, args.clinic, args.month, args.year, args.seed)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'created': datetime.now().isoformat(timespec='seconds'), 'settings': vars(args), 'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"\nResultados gravados em {args.output}")
+
+    failed = sum(not result['equivalent'] for result in results)
+    print(f"\n{failed} diferença(s) encontrada(s)." if failed else "\nTodas as saídas são equivalentes.")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,223 @@
+# benchmarks/equivalence.py
+"""
+Confere se um motor de consulta alternativo (core/engines.py) produz a
+mesma saída que a implementação de referência (Database).
+
+Sobre o mesmo banco sintético (benchmarks/synthetic.py) ou um banco
+existente, executa cada consulta de ENGINE_METHODS e o prepare() de cada
+relatório de REPORT_REGISTRY com os dois motores, compara os DataFrames e
+os resumos célula a célula e mostra a razão entre os tempos. Termina com
+código 1 se houver qualquer diferença.
+
+Uso, a partir da raiz do projeto:
+    python -m benchmarks.equivalence --rows 1000 100000
+    python -m benchmarks.equivalence --db database.db --engine vetorizado --output equivalencia.json
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import build_database, write_sources
+from core.database import Database
+from core.engines import ENGINE_METHODS, QUERY_ENGINES, QueryEngine, get_engine
+from core.reports import REPORT_REGISTRY
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOGO_PATH = os.path.join(PROJECT_DIR, 'assets', 'logo.png')
+
+# Tolerância relativa para colunas de ponto flutuante (somas em outra ordem).
+FLOAT_TOLERANCE = 1e-9
+
+def _same_value(expected, actual) -> bool:
+    expected_missing = expected is None or (not isinstance(expected, str) and pd.isna(expected))
+    actual_missing = actual is None or (not isinstance(actual, str) and pd.isna(actual))
+    if expected_missing or actual_missing:
+        return expected_missing and actual_missing
+    if isinstance(expected, (float, np.floating)) or isinstance(actual, (float, np.floating)):
+        try:
+            return math.isclose(float(expected), float(actual), rel_tol=FLOAT_TOLERANCE, abs_tol=FLOAT_TOLERANCE)
+        except (TypeError, ValueError):
+            return False
+    return expected == actual
+
+def compare_frames(expected: pd.DataFrame, actual: pd.DataFrame, max_differences: int = 20) -> list:
+    """
+    Compara dois DataFrames: tipos das colunas e valores célula a célula, na
+    ordem das linhas. Retorna a lista de diferenças em texto (vazia se forem
+    equivalentes).
+    """
+    if not isinstance(expected, pd.DataFrame) or not isinstance(actual, pd.DataFrame):
+        return [f"tipos diferentes: {type(expected).__name__} != {type(actual).__name__}"]
+    differences = []
+    if list(expected.columns) != list(actual.columns):
+        differences.append(f"colunas diferentes: {list(expected.columns)} != {list(actual.columns)}")
+    if len(expected) != len(actual):
+        differences.append(f"número de linhas diferente: {len(expected)} != {len(actual)}")
+    if differences:
+        return differences
+
+    for column in expected.columns:
+        if expected[column].dtype != actual[column].dtype:
+            differences.append(f"coluna '{column}': tipo {expected[column].dtype} != {actual[column].dtype}")
+    for column in expected.columns:
+        expected_values = expected[column].to_numpy(dtype=object)
+        actual_values = actual[column].to_numpy(dtype=object)
+        for row in np.flatnonzero([not _same_value(e, a) for e, a in zip(expected_values, actual_values)]):
+            differences.append(f"linha {row}, coluna '{column}': {expected_values[row]!r} != {actual_values[row]!r}")
+            if len(differences) >= max_differences:
+                differences.append("... (demais diferenças omitidas)")
+                return differences
+    return differences
+
+def compare_summaries(expected: dict, actual: dict) -> list:
+    """ Compara dois resumos (dicionários) chave a chave, na mesma ordem. """
+    expected = expected or {}
+    actual = actual or {}
+    if list(expected) != list(actual):
+        return [f"chaves diferentes: {list(expected)} != {list(actual)}"]
+    return [f"'{key}': {expected[key]!r} != {actual[key]!r}" for key in expected if not _same_value(expected[key], actual[key])]
+
+def _compare(expected, actual) -> list:
+    if isinstance(expected, dict) or isinstance(actual, dict):
+        return compare_summaries(expected, actual)
+    return compare_frames(expected, actual)
+
+def _timed(func, repeat: int):
+    """
+    Melhor tempo de repeat execuções e o resultado da última. Uma exceção
+    vira o resultado ('erro', tipo, mensagem), para ser comparada como saída.
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            result = func()
+        except Exception as e:
+            return time.perf_counter() - start, ('erro', type(e).__name__, str(e))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def _is_error(result) -> bool:
+    return isinstance(result, tuple) and len(result) == 3 and result[0] == 'erro'
+
+def _run_check(name: str, reference_call, candidate_call, repeat: int) -> dict:
+    reference_seconds, expected = _timed(reference_call, repeat)
+    candidate_seconds, actual = _timed(candidate_call, repeat)
+    if _is_error(expected) or _is_error(actual):
+        describe = lambda result: f"{result[1]}: {result[2]}" if _is_error(result) else "sem erro"
+        differences = [] if _is_error(expected) and _is_error(actual) and expected == actual else [f"referência: {describe(expected)} / motor: {describe(actual)}"]
+    elif isinstance(expected, tuple):
+        differences = []
+        for part, expected_part, actual_part in zip(('dados', 'resumo'), expected, actual):
+            differences += [f"{part}: {difference}" for difference in _compare(expected_part, actual_part)]
+    else:
+        differences = _compare(expected, actual)
+    return {
+        'name': name,
+        'reference_seconds': round(reference_seconds, 4),
+        'candidate_seconds': round(candidate_seconds, 4),
+        'ratio': round(candidate_seconds / reference_seconds, 3) if reference_seconds else None,
+        'equivalent': not differences,
+        'differences': differences,
+    }
+
+def _prepare(report_class, db, params):
+    report = report_class(db, LOGO_PATH, **params)
+    try:
+        return report.prepare(report.get_data())
+    except ValueError as e:
+        # Relatório sem dados: a mensagem também precisa ser a mesma nos dois motores.
+        return (pd.DataFrame({'erro': [str(e)]}), {})
+
+def check_engine(db: Database, engine_name: str, month: int, year: int, clinic: str, repeat: int = 1, log=print) -> list:
+    """ Compara o motor engine_name com o de referência em todas as consultas e relatórios. """
+    reference = QueryEngine(db)
+    candidate = get_engine(engine_name, db)
+    checks = []
+    for method, takes_period in ENGINE_METHODS.items():
+        args = (month, year) if takes_period else ()
+        checks.append(_run_check(
+            method,
+            lambda method=method, args=args: getattr(reference, method)(*args),
+            lambda method=method, args=args: getattr(candidate, method)(*args),
+            repeat,
+        ))
+    params = {'clinic': clinic, 'month': month, 'year': year}
+    for report_name, report_class in REPORT_REGISTRY.items():
+        checks.append(_run_check(
+            f"relatório {report_name}",
+            lambda report_class=report_class: _prepare(report_class, reference, params),
+            lambda report_class=report_class: _prepare(report_class, candidate, params),
+            repeat,
+        ))
+
+    for check in checks:
+        status = "OK" if check['equivalent'] else "DIFERENTE"
+        ratio = f"{check['ratio']:.2f}x" if check['ratio'] is not None else "-"
+        log(f"  {check['name']:<38} {status:<9} {check['reference_seconds']:>8.3f} s -> {check['candidate_seconds']:>8.3f} s  ({ratio})")
+        for difference in check['differences']:
+            log(f"      {difference}")
+    return checks
+
+def _synthetic_database(rows: int, work_dir: str, month: int, year: int, seed: int) -> Database:
+    paths = write_sources(os.path.join(work_dir, 'csv'), rows, year, month, seed)
+    return build_database(os.path.join(work_dir, 'equivalencia.db'), paths)
+
+def main(argv=None):
+    candidates = [name for name in QUERY_ENGINES if name != QueryEngine.name]
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--engine', nargs='+', choices=candidates, default=candidates, help="Motores comparados com a referência.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000], help="Escalas do banco sintético (linhas de faturamento).")
+    parser.add_argument('--db', help="Usa um banco existente em vez do sintético.")
+    parser.add_argument('--repeat', type=int, default=1, help="Repetições de cada consulta (vale o melhor tempo).")
+    parser.add_argument('--clinic', default='CNN')
+    parser.add_argument('--month', type=int, default=9)
+    parser.add_argument('--year', type=int, default=2025)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Grava os resultados em JSON.")
+    args = parser.parse_args(argv)
+
+    results = []
+    scales = [None] if args.db else args.rows
+    for rows in scales:
+        work_dir = None
+        if rows is None:
+            db = Database(args.db)
+        else:
+            work_dir = tempfile.mkdtemp(prefix='sissup_equiv_')
+            db = _synthetic_database(rows, work_dir, args.month, args.year, args.seed)
+        try:
+            for engine_name in args.engine:
+                print(f"Motor '{engine_name}' x referência ({args.db or f'{rows} linhas sintéticas'}):")
+                checks = check_engine(db, engine_name, args.month, args.year, args.clinic, args.repeat)
+                results.append({'engine': engine_name, 'scale': rows, 'database': args.db, 'checks': checks})
+        finally:
+            db.close()
+            if work_dir:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'created': datetime.now().isoformat(timespec='seconds'), 'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"\nResultados gravados em {args.output}")
+
+    failed = sum(not check['equivalent'] for result in results for check in result['checks'])
+    print(f"\n{failed} diferença(s) encontrada(s)." if failed else "\nTodas as saídas são equivalentes.")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+# benchmarks/pdf_render.py
+"""
+Compara a renderização de PDF em passada única (doc.build de export_to_pdf)
+com a renderização em partes paralelas (export_to_pdf_chunked) para uma
+listagem grande no formato do relatório Geral Convênio (paisagem).
+
+Uso, a partir da raiz do projeto:
+    python -m benchmarks.pdf_render --rows 2000 8000 --workers 1 4
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from reportlab.lib.pagesizes import letter, landscape
+
+from core.exporter import export_to_pdf, export_to_pdf_chunked
+from core.utils import resource_path, format_brl
+
+def make_convenio_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """ DataFrame com as colunas de generate_convenio_geral_data. """
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp('2025-09-01')
+    return pd.DataFrame({
+        'Nome': [f"PACIENTE {i:06d} DOS SANTOS" + (" DE OLIVEIRA E ALBUQUERQUE" if i % 7 == 0 else "") for i in range(rows)],
+        'Matrícula': [f"{rng.integers(10**8, 10**9)}" for _ in range(rows)],
+        'Número da Guia': [str(350000000 + i) for i in range(rows)],
+        'Lote': rng.integers(1, 40, rows).astype(str),
+        'Quant.': rng.integers(1, 14, rows),
+        'Programa Tratamento': rng.choice(['HEMODIÁLISE', 'HEMODIAFILTRAÇÃO'], rows),
+        'Plano': rng.choice(['ENFERMARIA', 'APARTAMENTO', 'EXECUTIVO'], rows),
+        'Total': rng.random(rows).round(2) * 6000,
+        'Data Início': start + pd.to_timedelta(rng.integers(0, 10, rows), unit='D'),
+        'Data Final': start + pd.to_timedelta(rng.integers(10, 29, rows), unit='D'),
+    })
+
+def _timed(func, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[2000, 8000])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    parser.add_argument('--repeat', type=int, default=1, help="Repetições por cenário (vale o menor tempo).")
+    args = parser.parse_args(argv)
+
+    logo_path = resource_path('assets/logo.png')
+    pagesize = landscape(letter)
+
+    print(f"{'linhas':>8} {'modo':<22} {'tempo (s)':>10} {'ganho':>7}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for rows in args.rows:
+            df = make_convenio_frame(rows)
+            totals = {"Quantidade de Guias": rows, "Valor Total": format_brl(df['Total'].sum())}
+            path = os.path.join(tmp_dir, 'relatorio.pdf')
+
+            baseline = min(_timed(export_to_pdf, df, path, logo_path, "Benchmark", totals, pagesize=pagesize, parallel=False) for _ in range(args.repeat))
+            print(f"{rows:>8} {'passada única':<22} {baseline:>10.2f} {1.0:>6.2f}x")
+
+            for workers in args.workers:
+                elapsed = min(_timed(export_to_pdf_chunked, df, path, logo_path, "Benchmark", totals, pagesize=pagesize, max_workers=workers) for _ in range(args.repeat))
+                print(f"{rows:>8} {f'partes ({workers} proc.)':<22} {elapsed:>10.2f} {baseline / elapsed:>6.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+# benchmarks/suite.py
+"""
+Suíte de benchmarks com dados sintéticos (benchmarks/synthetic.py): para
+cada escala, mede Database.import_from_csv de cada fonte, cada
+generate_*_data (e get_remarcacoes_data / calculate_convenio_summary) e a
+exportação de cada relatório de REPORT_REGISTRY em Excel e PDF.
+
+Os resultados são gravados em JSON (um arquivo por execução) para comparar
+execuções ao longo do tempo com --compare.
+
+Uso, a partir da raiz do projeto:
+    python -m benchmarks.suite --rows 1000 100000 --output resultados.json
+    python -m benchmarks.suite --rows 100000 --compare resultados_anteriores.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from benchmarks.synthetic import SOURCE_TABLES, build_database, write_sources
+from core import perf_log
+from core.reports import REPORT_REGISTRY
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOGO_PATH = os.path.join(PROJECT_DIR, 'assets', 'logo.png')
+FORMATS = {'Excel': 'xlsx', 'PDF': 'pdf'}
+
+# Consultas medidas: nome -> função(db, mês, ano).
+QUERIES = {
+    'generate_geral_report_data': lambda db, month, year: db.generate_geral_report_data(),
+    'generate_fistulas_report_data': lambda db, month, year: db.generate_fistulas_report_data(),
+    'generate_continuidade_report_data': lambda db, month, year: db.generate_continuidade_report_data(month, year),
+    'generate_convenio_geral_data': lambda db, month, year: db.generate_convenio_geral_data(),
+    'get_remarcacoes_data': lambda db, month, year: db.get_remarcacoes_data(),
+    'calculate_convenio_summary': lambda db, month, year: db.calculate_convenio_summary(),
+}
+
+def _rows(result):
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+def _measure(func, repeat: int) -> dict:
+    """ Executa func repeat vezes; retorna os tempos, o melhor e o resultado da última execução. """
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return {'seconds': min(times), 'runs': [round(t, 4) for t in times], 'result': result}
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+def _environment() -> dict:
+    import numpy
+    import openpyxl
+    import reportlab
+    return {
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'pandas': pd.__version__,
+        'numpy': numpy.__version__,
+        'openpyxl': openpyxl.__version__,
+        'reportlab': reportlab.Version,
+        'git_commit': _git_commit(),
+    }
+
+def _stage_durations(records: list) -> dict:
+    """ Duração (ms) das etapas relatorio.* registradas pelo perf_log durante a exportação. """
+    return {
+        record['operacao'].split('.', 1)[1]: record.get('duracao_ms')
+        for record in records if record.get('operacao', '').startswith('relatorio.') and record['operacao'] != 'relatorio.export'
+    }
+
+def run_scale(rows: int, work_dir: str, repeat: int, formats: list, clinic: str, month: int, year: int, max_pdf_rows: int, seed: int, log=print) -> list:
+    """ Gera os dados de uma escala, executa todas as medições e retorna a lista de resultados. """
+    results = []
+
+    def add(group, name, measured, file_format=None, **extra):
+        entry = {
+            'scale': rows, 'group': group, 'name': name, 'format': file_format,
+            'rows': _rows(measured['result']) if 'rows' not in extra else extra.pop('rows'),
+            'seconds': round(measured['seconds'], 4), 'runs': measured['runs'], **extra,
+        }
+        results.append(entry)
+        label = f"{name} ({file_format})" if file_format else name
+        log(f"  {group:<8} {label:<45} {entry['seconds']:>9.3f} s  {entry['rows'] if entry['rows'] is not None else '':>9}")
+
+    data_dir = os.path.join(work_dir, 'csv')
+    generated = _measure(lambda: write_sources(data_dir, rows, year, month, seed), 1)
+    add('geracao', 'synthetic.write_sources', generated, rows=rows)
+    paths = generated['result']
+
+    for table_name in SOURCE_TABLES:
+        # Cada repetição importa em um banco novo, para medir sempre a importação completa.
+        def import_table(table_name=table_name):
+            db_path = os.path.join(work_dir, 'import.db')
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+            build_database(db_path, paths, [table_name]).close()
+            return None
+        file_rows = sum(1 for _ in open(paths[table_name], encoding='latin-1')) - 1
+        add('import', table_name, _measure(import_table, repeat), rows=file_rows)
+
+    db = build_database(os.path.join(work_dir, 'bench.db'), paths)
+    try:
+
+        for name, query in QUERIES.items():
+            add('query', name, _measure(lambda query=query: query(db, month, year), repeat))
+
+        output_dir = os.path.join(work_dir, 'saida')
+        os.makedirs(output_dir, exist_ok=True)
+        params = {'clinic': clinic, 'month': month, 'year': year}
+        for report_name, report_class in REPORT_REGISTRY.items():
+            report = report_class(db, LOGO_PATH, **params)
+            try:
+                report_rows = len(report.prepare(report.get_data())[0])
+            except ValueError as e:
+                log(f"  report   {report_name}: {e}")
+                continue
+            for file_format in formats:
+                if file_format == 'PDF' and max_pdf_rows and report_rows > max_pdf_rows:
+                    log(f"  report   {report_name} ({file_format}): ignorado, {report_rows} linhas > --max-pdf-rows")
+                    continue
+                file_path = os.path.join(output_dir, f"{report_class.__name__}.{FORMATS[file_format]}")
+                stages = {}
+
+                def export(report=report, file_format=file_format, file_path=file_path):
+                    with perf_log.capture() as records:
+                        report.export(file_path, file_format)
+                    stages.update(_stage_durations(records))
+
+                try:
+                    measured = _measure(export, repeat)
+                except NotImplementedError:
+                    continue
+                add('report', report_name, measured, file_format, rows=report_rows,
+                    file_size=os.path.getsize(file_path), stages_ms=stages)
+    finally:
+        db.close()
+    return results
+
+def compare(previous: dict, current: dict, log=print):
+    """ Mostra a variação de tempo das medições presentes nas duas execuções. """
+    def key(entry):
+        return (entry['scale'], entry['group'], entry['name'], entry.get('format'))
+
+    before = {key(entry): entry for entry in previous.get('results', [])}
+    log(f"\nComparação com {previous.get('created', '?')} (commit {previous.get('environment', {}).get('git_commit') or '?'}):")
+    for entry in current['results']:
+        old = before.get(key(entry))
+        if not old or not old['seconds']:
+            continue
+        ratio = entry['seconds'] / old['seconds']
+        label = f"{entry['name']} ({entry['format']})" if entry.get('format') else entry['name']
+        log(f"  {entry['scale']:>8} {entry['group']:<8} {label:<45} {old['seconds']:>9.3f} s -> {entry['seconds']:>9.3f} s  ({ratio:.2f}x)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000], help="Escalas (linhas de faturamento), de 1000 a 2000000.")
+    parser.add_argument('--repeat', type=int, default=3, help="Repetições de cada medição (vale o melhor tempo).")
+    parser.add_argument('--formats', nargs='+', choices=list(FORMATS), default=list(FORMATS))
+    parser.add_argument('--max-pdf-rows', type=int, default=50000, help="Não exporta em PDF relatórios com mais linhas que isso (0 = sem limite).")
+    parser.add_argument('--clinic', default='CNN')
+    parser.add_argument('--month', type=int, default=9)
+    parser.add_argument('--year', type=int, default=2025)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Arquivo JSON de resultados (padrão: benchmark_<data>.json).")
+    parser.add_argument('--compare', help="JSON de uma execução anterior para comparação.")
+    parser.add_argument('--work-dir', help="Pasta para os CSVs e bancos gerados (padrão: pasta temporária, apagada ao final).")
+    args = parser.parse_args(argv)
+
+    # As etapas de cada exportação vêm do perf_log, capturadas sem gravar no arquivo de log.
+    perf_log.set_enabled(True)
+    created = datetime.now()
+    run = {'created': created.isoformat(timespec='seconds'), 'environment': _environment(), 'settings': vars(args), 'results': []}
+    for rows in args.rows:
+        print(f"Escala {rows} linhas:")
+        work_dir = os.path.join(args.work_dir, str(rows)) if args.work_dir else tempfile.mkdtemp(prefix='sissup_bench_')
+        os.makedirs(work_dir, exist_ok=True)
+        try:
+            with perf_log.capture():
+                run['results'] += run_scale(rows, work_dir, args.repeat, args.formats, args.clinic, args.month, args.year, args.max_pdf_rows, args.seed)
+        finally:
+            if not args.work_dir:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = args.output or f"benchmark_{created:%Y%m%d_%H%M%S}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(run, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados gravados em {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(json.load(f), run)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,397 @@
+# benchmarks/synthetic.py
+"""
+Gera arquivos CSV sintéticos (latin-1, separador ';', datas dd/mm/aaaa
+hh:mm:ss, decimais com vírgula) para as seis fontes de get_clean_headers,
+no formato exportado pelo sistema da clínica.
+
+Os nomes dos pacientes e os números de guia são os mesmos em todas as
+fontes: a guia do faturamento SUS é o Nº da APAC do laudo, e os pacientes
+do faturamento aparecem nas sessões, na estatística mensal e nos eventos de
+cateter/FAV. Assim os relatórios encontram os cruzamentos que encontrariam
+com dados reais.
+
+Uso, a partir da raiz do projeto:
+    python -m benchmarks.synthetic --rows 100000 --output dados_sinteticos
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from config import get_clean_headers
+from core.database import Database
+
+SOURCE_TABLES = ['laudos_apac', 'sessoes_hd', 'estatistica_mensal', 'eventos_cateter', 'faturamento_geral', 'faturamento_convenio']
+
+# Linhas de faturamento por paciente no mês (sessões, extras, exames e medicamentos).
+LINES_PER_PATIENT = 13
+# Pacientes por bloco dos arquivos de faturamento (limita a memória nas escalas grandes).
+CHUNK_PATIENTS = 20000
+
+FIRST_NAMES = [
+    'MARIA', 'JOSE', 'ANA', 'JOAO', 'ANTONIO', 'FRANCISCA', 'FRANCISCO', 'ANTONIA', 'CARLOS', 'ADRIANA',
+    'PAULO', 'JULIANA', 'PEDRO', 'MARCIA', 'LUCAS', 'FERNANDA', 'LUIZ', 'PATRICIA', 'MARCOS', 'ALINE',
+    'RAIMUNDO', 'SANDRA', 'SEBASTIAO', 'CAMILA', 'MANOEL', 'AMANDA', 'RAFAEL', 'BRUNA', 'DANIEL', 'JESSICA',
+    'MARCELO', 'LETICIA', 'BRUNO', 'JULIA', 'EDUARDO', 'LUCIANA', 'FELIPE', 'VANESSA', 'RAIMUNDA', 'MARIANA',
+]
+MIDDLE_NAMES = [
+    'APARECIDA', 'CARLOS', 'DA CONCEICAO', 'DE FATIMA', 'HENRIQUE', 'AUGUSTO', 'CRISTINA', 'EDUARDO', 'LUIZA', 'ROBERTO',
+    'DAS GRACAS', 'VITOR', 'HELENA', 'GABRIEL', 'BEATRIZ', 'MIGUEL', 'FERNANDO', 'LUCIA', 'RICARDO', 'TERESA',
+]
+SURNAMES = [
+    'SILVA', 'SANTOS', 'OLIVEIRA', 'SOUZA', 'RODRIGUES', 'FERREIRA', 'ALVES', 'PEREIRA', 'LIMA', 'GOMES',
+    'COSTA', 'RIBEIRO', 'MARTINS', 'CARVALHO', 'ALMEIDA', 'LOPES', 'SOARES', 'FERNANDES', 'VIEIRA', 'BARBOSA',
+    'ROCHA', 'DIAS', 'NASCIMENTO', 'ANDRADE', 'MOREIRA', 'NUNES', 'MARQUES', 'MACHADO', 'MENDES', 'FREITAS',
+    'CARDOSO', 'RAMOS', 'GONCALVES', 'SANTANA', 'TEIXEIRA', 'ARAUJO', 'PINTO', 'CAVALCANTI', 'MONTEIRO', 'MOURA',
+]
+
+SUS_SESSION_SERVICE = 'HEMODIÁLISE MÁXIMO 3 SESSÕES POR SEMANA'
+SUS_EXTRA_SERVICE = 'HEMODIÁLISE EXTRA'
+SUS_OTHER_ITEMS = [
+    ('Exames', 'DOSAGEM DE HEMOGLOBINA'), ('Exames', 'DOSAGEM DE UREIA'), ('Exames', 'DOSAGEM DE CREATININA'),
+    ('Exames', 'DOSAGEM DE POTASSIO'), ('Exames', 'DOSAGEM DE CALCIO'), ('Exames', 'DOSAGEM DE FOSFORO'),
+    ('Exames', 'DOSAGEM DE TRANSAMINASE GLUTAMICO-PIRUVICA'), ('Exames', 'HEMATOCRITO'),
+    ('Exames', 'DOSAGEM DE FERRITINA'), ('Exames', 'DOSAGEM DE PARATORMONIO'),
+    ('Medicamentos', 'ALFAEPOETINA 4.000 UI'), ('Medicamentos', 'SACARATO DE HIDROXIDO FERRICO 100 MG'),
+    ('Medicamentos', 'CALCITRIOL 1 MCG'), ('Medicamentos', 'HEPARINA SODICA 5.000 UI'),
+]
+CONVENIOS = ['UNIMED', 'BRADESCO SAUDE', 'SULAMERICA', 'CASSI', 'GEAP', 'AMIL']
+PLANOS = ['ENFERMARIA', 'APARTAMENTO', 'EXECUTIVO']
+PROGRAMAS = ['HEMODIÁLISE', 'HEMODIAFILTRAÇÃO']
+SAIDA_SITUACOES = ['Óbito', 'Transferência de centro', 'Transplante', 'Alta']
+# (acesso, evento, tipo) dos eventos de cateter e FAV.
+CATETER_EVENTS = [
+    ('Cateter', 'Colocação', 'Duplo Lumen HD'),
+    ('Cateter', 'Colocação', 'Longa Perm. HD'),
+    ('Cateter', 'Retirada', 'Longa Perm. HD'),
+    ('Cateter', 'Retirada', 'Duplo Lumen HD'),
+    ('Fístula', 'Confecção', 'Autógena'),
+    ('Fístula', 'Confecção', 'Heteróloga'),
+    ('Fístula', 'Fechamento', 'Autógena'),
+    ('Fístula', 'Intervenção', 'Autógena'),
+]
+
+def _patient_names(rng, count: int) -> np.ndarray:
+    """ Nomes distintos no formato NOME NOME_DO_MEIO SOBRENOME SOBRENOME. """
+    sizes = (len(FIRST_NAMES), len(MIDDLE_NAMES), len(SURNAMES), len(SURNAMES))
+    combinations = int(np.prod(sizes))
+    codes = rng.choice(combinations, size=min(count, combinations), replace=False)
+    first, middle, surname1, surname2 = np.unravel_index(codes, sizes)
+    names = (
+        pd.Series(np.array(FIRST_NAMES)[first]) + ' ' + pd.Series(np.array(MIDDLE_NAMES)[middle]) + ' '
+        + pd.Series(np.array(SURNAMES)[surname1]) + ' ' + pd.Series(np.array(SURNAMES)[surname2])
+    ).to_numpy(dtype=object)
+    if count > combinations:
+        # Acima do número de combinações, os nomes repetidos ganham um sufixo.
+        extra = np.array([f"{names[i % combinations]} {i // combinations + 1}" for i in range(combinations, count)], dtype=object)
+        names = np.concatenate([names, extra])
+    return names
+
+def _dates(rng, count: int, year: int, month: int, first_day: int = 1, last_day: int = None) -> pd.Series:
+    """ Datas aleatórias no mês, como texto dd/mm/aaaa hh:mm:ss. """
+    start = pd.Timestamp(year=year, month=month, day=first_day)
+    last_day = last_day or start.days_in_month
+    offsets = pd.to_timedelta(rng.integers(0, last_day - first_day + 1, count), unit='D')
+    return pd.Series(start + offsets).dt.strftime('%d/%m/%Y 00:00:00')
+
+def _decimal(values: np.ndarray) -> pd.Series:
+    """ Números com duas casas e vírgula decimal, como nos arquivos exportados. """
+    return pd.Series(np.round(values, 2)).map('{:.2f}'.format).str.replace('.', ',', regex=False)
+
+def _digits(rng, count: int, length: int) -> np.ndarray:
+    return rng.integers(10 ** (length - 1), 10 ** length, count).astype(str)
+
+def _frame(table_name: str, columns: dict, rows: int) -> pd.DataFrame:
+    """ Monta o DataFrame com todas as colunas do cabeçalho (as ausentes ficam vazias). """
+    data = {}
+    for header in get_clean_headers(table_name):
+        value = columns.get(header, '')
+        data[header] = value if not np.isscalar(value) else np.full(rows, value, dtype=object)
+    return pd.DataFrame(data)
+
+class Population:
+    """
+    Pacientes e guias compartilhados por todas as fontes: os pacientes SUS
+    (com Nº de APAC, que é a guia do faturamento SUS) e os de convênio (com
+    o número da guia do convênio). rows é o número aproximado de linhas de
+    cada arquivo de faturamento; há rows / LINES_PER_PATIENT pacientes de cada tipo.
+    """
+    def __init__(self, rows: int, year: int = 2025, month: int = 9, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.year = year
+        self.month = month
+        self.seed = seed
+        self.sus_count = max(rows // LINES_PER_PATIENT, 10)
+        self.convenio_count = max(rows // LINES_PER_PATIENT, 10)
+        self.names = _patient_names(rng, self.sus_count + self.convenio_count)
+        self.prontuarios = np.arange(1, len(self.names) + 1).astype(str)
+        self.apac_numbers = (3525000000000 + rng.choice(10 ** 8, self.sus_count, replace=False)).astype(str)
+        self.guide_numbers = (800000000 + rng.choice(10 ** 8, self.convenio_count, replace=False)).astype(str)
+        self.convenios = rng.choice(CONVENIOS, self.convenio_count)
+        saida = rng.random(self.sus_count) < 0.05
+        self.situacao = np.where(saida, rng.choice(SAIDA_SITUACOES, self.sus_count), 'Em tratamento')
+
+    @property
+    def count(self) -> int:
+        return len(self.names)
+
+    @property
+    def competencia(self) -> str:
+        return f"{self.month:02d}/{self.year}"
+
+    @property
+    def month_end(self) -> int:
+        return pd.Timestamp(year=self.year, month=self.month, day=1).days_in_month
+
+    def rng(self, table_name: str, chunk: int = 0):
+        """ Gerador próprio de cada fonte (e bloco), para que as fontes não dependam umas das outras. """
+        return np.random.default_rng([self.seed, SOURCE_TABLES.index(table_name), chunk])
+
+def _faturamento_geral(pop: Population, start: int, stop: int, chunk: int) -> pd.DataFrame:
+    """ Faturamento SUS dos pacientes start:stop: sessões, às vezes extras, e vários exames/medicamentos. """
+    rng = pop.rng('faturamento_geral', chunk)
+    patients = np.arange(start, stop)
+    count = len(patients)
+    other_count = rng.integers(LINES_PER_PATIENT - 4, LINES_PER_PATIENT + 1, count)
+    has_extra = rng.random(count) < 0.15
+    # Itens distintos por paciente: os primeiros other_count de uma permutação aleatória do catálogo.
+    order = rng.random((count, len(SUS_OTHER_ITEMS))).argsort(axis=1)
+    chosen = np.arange(len(SUS_OTHER_ITEMS)) < other_count[:, None]
+    patient_of_line = np.concatenate([patients, patients[has_extra], np.repeat(patients, chosen.sum(axis=1))])
+    item_codes = np.concatenate([np.zeros(count, dtype=int), np.ones(int(has_extra.sum()), dtype=int), 2 + order[chosen]])
+    services = np.array([SUS_SESSION_SERVICE, SUS_EXTRA_SERVICE] + [item for _, item in SUS_OTHER_ITEMS], dtype=object)
+    groups = np.array(['Hemodiálise', 'Hemodiálise'] + [group for group, _ in SUS_OTHER_ITEMS], dtype=object)
+    lines = len(patient_of_line)
+    quant = np.where(item_codes == 0, rng.integers(11, 14, lines), np.where(item_codes == 1, rng.integers(1, 3, lines), 1))
+    unit_price = np.where(item_codes <= 1, 218.47, rng.uniform(1.85, 60.0, lines))
+    year, month = pop.year, pop.month
+    df = _frame('faturamento_geral', {
+        'posicao': (start * LINES_PER_PATIENT + np.arange(1, lines + 1)).astype(str),
+        # Uma pequena parte das linhas é de outro convênio.
+        'convenio': np.where(rng.random(lines) < 0.02, rng.choice(CONVENIOS, lines), 'SUS'),
+        'data': _dates(rng, lines, year, month),
+        'cod_prontuario': pop.prontuarios[patient_of_line],
+        'nome': pop.names[patient_of_line],
+        'matricula': _digits(rng, lines, 15),
+        'numero_guia': pop.apac_numbers[patient_of_line],
+        'senha_autoriz': _digits(rng, lines, 8),
+        'lote': rng.integers(1, 40, lines).astype(str),
+        'data_envio': _dates(rng, lines, year, month, first_day=min(25, pop.month_end)),
+        'protocolo': _digits(rng, lines, 10),
+        'titulo': pop.competencia,
+        'data_inc_titulo': _dates(rng, lines, year, month, first_day=min(25, pop.month_end)),
+        'executante': 'CLINICA DE NEFROLOGIA',
+        'tipo_atendimento': 'AMBULATORIAL',
+        'servico_material': services[item_codes],
+        'codigo': (305010000 + item_codes).astype(str),
+        'grupo': groups[item_codes],
+        'quant': quant.astype(str),
+        'total': _decimal(quant * unit_price),
+        'tipo_guia': 'APAC',
+        'programa_tratamento': 'HEMODIÁLISE',
+        'tipo_cobranca': 'PRODUÇÃO',
+    }, lines)
+    # ~1% das linhas vem duplicada no arquivo, como acontece nas exportações reais.
+    return pd.concat([df, df[rng.random(lines) < 0.01]], ignore_index=True)
+
+def _faturamento_convenio(pop: Population, start: int, stop: int, chunk: int) -> pd.DataFrame:
+    """ Faturamento de convênio das guias start:stop: uma linha por sessão, agregada por guia no relatório. """
+    rng = pop.rng('faturamento_convenio', chunk)
+    guides = np.arange(start, stop)
+    count = len(guides)
+    guide_of_line = np.repeat(guides, rng.integers(LINES_PER_PATIENT - 2, LINES_PER_PATIENT + 1, count))
+    local_of_line = guide_of_line - start
+    lines = len(guide_of_line)
+    programa = rng.choice(PROGRAMAS, count, p=[0.8, 0.2])[local_of_line]
+    year, month = pop.year, pop.month
+    return _frame('faturamento_convenio', {
+        'posicao': (start * LINES_PER_PATIENT + np.arange(1, lines + 1)).astype(str),
+        'convenio': pop.convenios[guide_of_line],
+        'data': _dates(rng, lines, year, month),
+        'cod_prontuario': pop.prontuarios[pop.sus_count + guide_of_line],
+        'nome': pop.names[pop.sus_count + guide_of_line],
+        'matricula': _digits(rng, count, 12)[local_of_line],
+        'numero_guia': pop.guide_numbers[guide_of_line],
+        'senha_autoriz': _digits(rng, lines, 8),
+        'lote': rng.integers(1, 40, count).astype(str)[local_of_line],
+        'data_envio': _dates(rng, lines, year, month, first_day=min(25, pop.month_end)),
+        'protocolo': _digits(rng, lines, 10),
+        'titulo': pop.competencia,
+        'data_inc_titulo': _dates(rng, lines, year, month, first_day=min(25, pop.month_end)),
+        'executante': 'CLINICA DE NEFROLOGIA',
+        'tipo': 'SP/SADT',
+        'servico_material': np.where(programa == 'HEMODIÁLISE', 'SESSÃO DE HEMODIÁLISE', 'SESSÃO DE HEMODIAFILTRAÇÃO'),
+        'codigo': '30909023',
+        'grupo': 'Procedimentos',
+        'quant': '1',
+        'total': _decimal(rng.uniform(350, 650, lines)),
+        'tipo_guia': 'SP/SADT',
+        'programa_tratamento': programa,
+        'tipo_apresentacao': 'ELETRÔNICA',
+        'plano': rng.choice(PLANOS, count)[local_of_line],
+    }, lines)
+
+def _laudos_apac(pop: Population) -> pd.DataFrame:
+    """ Um laudo por paciente SUS, com saídas no mês e fim de validade variado. """
+    rng = pop.rng('laudos_apac')
+    count = pop.sus_count
+    saida = pop.situacao != 'Em tratamento'
+    first_of_month = pd.Timestamp(year=pop.year, month=pop.month, day=1)
+    final = (first_of_month + pd.to_timedelta(rng.integers(0, 4, count) * 31, unit='D')).to_period('M').to_timestamp(how='end').normalize()
+    return _frame('laudos_apac', {
+        'nome': pop.names[:count],
+        'inicio_prog': _dates(rng, count, pop.year - 3, 1, last_day=28),
+        'codigo_procedimento': '0305010107',
+        'tratamento_procedimento': np.where(rng.random(count) < 0.97, 'Hemodiálise II (máximo 3 sessões por semana)', 'Diálise Peritoneal'),
+        'situacao': pop.situacao,
+        'data_saida': np.where(saida, _dates(rng, count, pop.year, pop.month), ''),
+        'n_apac': pop.apac_numbers,
+        'inicio': _dates(rng, count, pop.year, pop.month, last_day=1),
+        'final': pd.Series(final).dt.strftime('%d/%m/%Y 00:00:00'),
+        'solicitante': 'DR. MEDICO NEFROLOGISTA',
+        'turno': rng.choice(['1º TURNO', '2º TURNO', '3º TURNO'], count),
+        'cns': _digits(rng, count, 15),
+        'cpf': _digits(rng, count, 11),
+        'telefone': _digits(rng, count, 11),
+        'cidade': 'FORTALEZA',
+        'servico': 'HEMODIÁLISE',
+    }, count)
+
+def _sessoes_hd(pop: Population) -> pd.DataFrame:
+    rng = pop.rng('sessoes_hd')
+    count = pop.count
+    hd_normais = rng.integers(10, 14, count)
+    hd_extras = (rng.random(count) < 0.15).astype(int)
+    hd_remarcadas = np.where(rng.random(count) < 0.1, rng.integers(1, 3, count), 0)
+    falta = (rng.random(count) < 0.05).astype(int)
+    return _frame('sessoes_hd', {
+        'nome': pop.names,
+        'convenio': np.concatenate([np.full(pop.sus_count, 'SUS', dtype=object), pop.convenios]),
+        'hd_normais': hd_normais.astype(str),
+        'hd_extras': hd_extras.astype(str),
+        'hd_remarcadas': hd_remarcadas.astype(str),
+        'falta': falta.astype(str),
+        'nao_cobra': '0',
+        'total_exceto_faltas': (hd_normais + hd_extras - falta).astype(str),
+    }, count)
+
+def _estatistica_mensal(pop: Population) -> pd.DataFrame:
+    """ Todos os pacientes, ~5% com entrada no mês; alguns aparecem de novo com outra data de entrada. """
+    rng = pop.rng('estatistica_mensal')
+    count = pop.count
+    new_patient = rng.random(count) < 0.05
+    reagent = lambda share: np.where(rng.random(count) < share, 'Reagente', 'Negativo')
+    df = _frame('estatistica_mensal', {
+        'num': np.arange(1, count + 1).astype(str),
+        'nome': pop.names,
+        'dt_nasc': _dates(rng, count, 1960, 1, last_day=28),
+        'sexo': rng.choice(['M', 'F'], count),
+        'cpf': _digits(rng, count, 11),
+        'cns': _digits(rng, count, 15),
+        'dt_entr': np.where(new_patient, _dates(rng, count, pop.year, pop.month), _dates(rng, count, pop.year - 2, 1, last_day=28)),
+        'diag': 'N18.0',
+        'cr': _decimal(rng.uniform(4, 12, count)),
+        'u_pre': _decimal(rng.uniform(80, 200, count)),
+        'u_pos': _decimal(rng.uniform(20, 60, count)),
+        'n_s': '3',
+        'hep_c': reagent(0.03),
+        'hbsag': reagent(0.02),
+        'hiv': reagent(0.01),
+        'obito': np.concatenate([np.where(pop.situacao == 'Óbito', 'S', ''), np.full(pop.convenio_count, '', dtype=object)]),
+    }, count)
+    reentry = df[rng.random(count) < 0.02].copy()
+    reentry['dt_entr'] = _dates(rng, len(reentry), pop.year - 1, 6, last_day=28).to_numpy()
+    return pd.concat([df, reentry], ignore_index=True)
+
+def _eventos_cateter(pop: Population) -> pd.DataFrame:
+    """ Cerca de 25% dos pacientes com um ou dois eventos de cateter/FAV no mês. """
+    rng = pop.rng('eventos_cateter')
+    patients = np.flatnonzero(rng.random(pop.count) < 0.25)
+    patients = np.concatenate([patients, patients[rng.random(len(patients)) < 0.3]])
+    count = len(patients)
+    events = np.array(CATETER_EVENTS, dtype=object)[rng.integers(0, len(CATETER_EVENTS), count)]
+    is_sus = patients < pop.sus_count
+    convenio = np.full(count, 'SUS', dtype=object)
+    convenio[~is_sus] = pop.convenios[patients[~is_sus] - pop.sus_count]
+    return _frame('eventos_cateter', {
+        'data': _dates(rng, count, pop.year, pop.month),
+        'acesso': events[:, 0],
+        'nome': pop.names[patients],
+        'evento': events[:, 1],
+        'tipo': events[:, 2],
+        'localizacao': rng.choice(['Jugular D', 'Jugular E', 'Femoral D', 'Braço E', 'Antebraço E'], count),
+        'convenio': convenio,
+        'nao_cobra': np.where(rng.random(count) < 0.05, 'X', ''),
+        'medico': 'DR. CIRURGIAO VASCULAR',
+        'programa_na_data': 'HEMODIÁLISE',
+        'programa_ref': 'HEMODIÁLISE',
+        'programa_atual': 'HEMODIÁLISE',
+    }, count)
+
+def iter_sources(rows: int, year: int = 2025, month: int = 9, seed: int = 0, chunk_patients: int = CHUNK_PATIENTS):
+    """
+    Gera (tabela, DataFrame) para as seis fontes, na ordem de SOURCE_TABLES.
+    Os arquivos de faturamento vêm em vários blocos consecutivos de
+    chunk_patients pacientes, para que 2 milhões de linhas caibam na memória.
+    """
+    pop = Population(rows, year, month, seed)
+    yield 'laudos_apac', _laudos_apac(pop)
+    yield 'sessoes_hd', _sessoes_hd(pop)
+    yield 'estatistica_mensal', _estatistica_mensal(pop)
+    yield 'eventos_cateter', _eventos_cateter(pop)
+    for table_name, builder, count in (
+        ('faturamento_geral', _faturamento_geral, pop.sus_count),
+        ('faturamento_convenio', _faturamento_convenio, pop.convenio_count),
+    ):
+        for chunk, start in enumerate(range(0, count, chunk_patients)):
+            yield table_name, builder(pop, start, min(start + chunk_patients, count), chunk)
+
+def build_sources(rows: int, year: int = 2025, month: int = 9, seed: int = 0) -> dict:
+    """ Retorna {tabela: DataFrame} com as seis fontes inteiras (para escalas que cabem na memória). """
+    parts = {}
+    for table_name, df in iter_sources(rows, year, month, seed):
+        parts.setdefault(table_name, []).append(df)
+    return {table_name: pd.concat(frames, ignore_index=True) for table_name, frames in parts.items()}
+
+def build_database(db_path: str, paths: dict, tables: list = SOURCE_TABLES) -> Database:
+    """ Importa os CSVs de write_sources (paths) das tabelas em um Database em db_path. Retorna o banco aberto. """
+    db = Database(db_path)
+    try:
+        for table_name in tables:
+            if not db.import_from_csv(paths[table_name], table_name):
+                raise RuntimeError(f"Falha ao importar {table_name}.")
+    except BaseException:
+        db.close()
+        raise
+    return db
+
+def write_sources(output_dir: str, rows: int, year: int = 2025, month: int = 9, seed: int = 0) -> dict:
+    """ Grava os CSVs das seis fontes em output_dir. Retorna {tabela: caminho}. """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for table_name, df in iter_sources(rows, year, month, seed):
+        path = os.path.join(output_dir, f"{table_name}.csv")
+        first_chunk = table_name not in paths
+        df.to_csv(path, sep=';', index=False, encoding='latin-1', mode='w' if first_chunk else 'a', header=first_chunk)
+        paths[table_name] = path
+    return paths
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000, help="Linhas aproximadas de cada arquivo de faturamento (ex.: 1000 a 2000000).")
+    parser.add_argument('--output', default='dados_sinteticos', help="Pasta de saída dos CSVs.")
+    parser.add_argument('--month', type=int, default=9)
+    parser.add_argument('--year', type=int, default=2025)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for table_name, path in write_sources(args.output, args.rows, args.year, args.month, args.seed).items():
+        print(f"{table_name:<22} {os.path.getsize(path) / 1024 / 1024:>8.1f} MB  {path}")
+
+if __name__ == '__main__':
+    main()
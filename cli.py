@@ -0,0 +1,328 @@
+# cli.py
+"""
+Modo de linha de comando do SISSUP, sem interface gráfica (não inicia o Qt).
+
+Uso:
+    python cli.py importar --clinica CNN --mes 9 --ano 2025 laudos_apac=laudos.csv faturamento_geral=fat.csv
+    python cli.py importar --clinica CNN --mes 9 --ano 2025 --pasta exportacoes/
+    python cli.py relatorio --relatorio Geral --clinica CNN --mes 9 --ano 2025 --formato PDF --saida geral.pdf
+    python cli.py fechamento --mes 9 --ano 2025 --saida fechamento/
+    python cli.py consolidado --mes 9 --ano 2025 --formato PDF --saida rede.pdf
+    python cli.py tendencia --mes 9 --ano 2025 --clinica CNN --saida tendencia_cnn.xlsx
+    python cli.py indicadores
+    python cli.py particionar --db database.db --clinica CNN --mes 9 --ano 2025
+    python cli.py arquivar --mes 9 --ano 2024
+
+Os dados ficam em um banco por clínica e competência, dentro da pasta
+--dados (padrão: dados/). --db usa um banco específico no lugar da
+partição; no fechamento ele pode conter {clinica}, trocado pelo nome de
+cada clínica (como em safe_filename). Cada clínica do fechamento é gerada
+em um processo próprio, em <saida>/<clínica>. O consolidado resume cada
+clínica com dados na competência em um processo próprio e junta os
+resumos em um único relatório da rede.
+
+Cada importação em uma partição atualiza o histórico de indicadores
+mensais (<dados>/agregados.db), lido pela tendência. "indicadores"
+recalcula esse histórico a partir de todas as partições, inclusive as
+arquivadas, e "particionar" copia um banco único antigo para a partição
+informada.
+
+Atualização de uma versão anterior ao particionamento: os dados do banco
+único (database.db) só voltam a aparecer depois de copiados para uma
+partição, com "particionar" ou pela pergunta que o aplicativo faz ao abrir
+enquanto não houver partições.
+
+"arquivar" grava as partições de uma competência fechada em Parquet
+(<dados>/<clínica>/arquivo/<aaaa-mm>/) e remove os bancos; relatório,
+fechamento e consolidado continuam lendo a competência arquivada.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+
+from config import get_table_configs, DATA_SOURCE_TITLES, RENDER_CACHE_MAX_BYTES, CLINICS, LEGACY_DATABASE, PARTITIONS_DIR
+from core import perf_log, aggregates, archive
+from core.database import Database
+from core.partitions import has_imports, list_partitions, import_legacy_database
+from core.render_cache import RenderCache, cache_dir_for
+from core.reports import REPORT_REGISTRY
+from core.utils import resource_path
+
+def _fail(message: str) -> int:
+    print(f"Erro: {message}", file=sys.stderr)
+    return 1
+
+def _database_path(args) -> str:
+    """ Banco informado em --db ou, sem ele, o da partição da clínica e competência. """
+    if args.db:
+        return args.db
+    missing = [option for option, value in (('--clinica', args.clinica), ('--mes', args.mes), ('--ano', args.ano)) if value is None]
+    if missing:
+        raise ValueError(f"Informe {', '.join(missing)} (ou --db).")
+    return archive.resolve_path(args.clinica, args.mes, args.ano, args.dados)
+
+def _import_sources(args) -> int:
+    tables = get_table_configs()
+    sources = []
+    for item in args.arquivos:
+        table_name, separator, file_path = item.partition('=')
+        if not separator:
+            return _fail(f"Use TABELA=ARQUIVO (recebido '{item}').")
+        sources.append((table_name, file_path))
+    if args.pasta:
+        for table_name in tables:
+            file_path = os.path.join(args.pasta, f"{table_name}.csv")
+            if os.path.exists(file_path):
+                sources.append((table_name, file_path))
+    if not sources:
+        return _fail("Nenhum arquivo informado.")
+    unknown = [table_name for table_name, _ in sources if table_name not in tables]
+    if unknown:
+        return _fail(f"Tabela(s) desconhecida(s): {', '.join(unknown)}. Disponíveis: {', '.join(tables)}.")
+
+    try:
+        db_path = _database_path(args)
+    except ValueError as e:
+        return _fail(str(e))
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    db = archive.open_database(db_path)
+    failures = 0
+    imported_tables = []
+    try:
+        for table_name, file_path in sources:
+            try:
+                imported = db.import_from_csv(file_path, table_name)
+            except Exception as e:
+                imported = False
+                print(f"  {e}", file=sys.stderr)
+            title = DATA_SOURCE_TITLES.get(table_name, table_name)
+            if imported:
+                imported_tables.append(table_name)
+                print(f"{title}: importado de {file_path}.")
+            else:
+                failures += 1
+                print(f"{title}: falha ao importar {file_path}.", file=sys.stderr)
+        if imported_tables and not args.db:
+            _update_aggregates(args, db, imported_tables)
+    finally:
+        db.close()
+    return 1 if failures else 0
+
+def _update_aggregates(args, db, tables=None):
+    """ Atualiza o histórico de indicadores da partição de args. Uma falha só gera aviso. """
+    try:
+        store = aggregates.AggregatesStore(aggregates.aggregates_path(args.dados))
+        try:
+            aggregates.update_partition(store, db, args.clinica, args.mes, args.ano, tables)
+        finally:
+            store.close()
+    except Exception as e:
+        print(f"Aviso: o histórico de indicadores não foi atualizado: {e}", file=sys.stderr)
+
+def _create_output_dir(file_path: str):
+    """ Cria a pasta do arquivo de saída, se ainda não existir. """
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+
+def _export_report(args) -> int:
+    report_class = REPORT_REGISTRY[args.relatorio]
+    db_path = _database_path(args)
+    if not os.path.exists(db_path):
+        return _fail(f"Banco de dados não encontrado: {db_path}")
+
+    db = archive.open_database(db_path)
+    try:
+        report = report_class(db, resource_path('assets/logo.png'), clinic=args.clinica, month=args.mes, year=args.ano)
+        cache = None if args.sem_cache else RenderCache(cache_dir_for(db.db_name), RENDER_CACHE_MAX_BYTES)
+        try:
+            _create_output_dir(args.saida)
+            report.export(args.saida, args.formato, cache=cache)
+        except (ValueError, NotImplementedError, OSError) as e:
+            return _fail(str(e))
+    finally:
+        db.close()
+    print(f"{report.title}: {args.saida}")
+    return 0
+
+def _close_month(args) -> int:
+    from core.month_close import close_all, database_for
+
+    clinics = args.clinicas or CLINICS
+    unknown = [clinic for clinic in clinics if clinic not in CLINICS]
+    if unknown:
+        return _fail(f"Clínica(s) desconhecida(s): {', '.join(unknown)}. Disponíveis: {', '.join(CLINICS)}.")
+    if args.db:
+        databases = {clinic: database_for(args.db, clinic) for clinic in clinics}
+    else:
+        databases = {clinic: archive.resolve_path(clinic, args.mes, args.ano, args.dados) for clinic in clinics}
+        if not args.clinicas:
+            # Sem lista explícita, fecha só as clínicas com dados importados na competência (ou arquivados).
+            databases = {clinic: path for clinic, path in databases.items() if os.path.isdir(path) or has_imports(path)}
+            if not databases:
+                return _fail(f"Nenhuma clínica tem dados importados em {args.mes:02d}/{args.ano} ({args.dados}).")
+
+    def report(result):
+        if result.get('error'):
+            print(f"{result['clinic']}: ERRO - {result['error']}", file=sys.stderr)
+            return
+        print(f"{result['clinic']}: {len(result['files'])} arquivo(s).")
+        for message in result['skipped']:
+            print(f"  {message}")
+
+    results = close_all(databases, args.mes, args.ano, args.saida, zip_files=args.zip, max_workers=args.processos, progress=report)
+    return 1 if any(result.get('error') for result in results) else 0
+
+def _consolidated_report(args) -> int:
+    from core.consolidated import ConsolidatedReport
+
+    unknown = [clinic for clinic in args.clinicas or [] if clinic not in CLINICS]
+    if unknown:
+        return _fail(f"Clínica(s) desconhecida(s): {', '.join(unknown)}. Disponíveis: {', '.join(CLINICS)}.")
+    report = ConsolidatedReport(None, resource_path('assets/logo.png'), month=args.mes, year=args.ano, base_dir=args.dados, clinics=args.clinicas, max_workers=args.processos)
+    try:
+        _create_output_dir(args.saida)
+        report.export(args.saida, args.formato)
+    except (ValueError, NotImplementedError, OSError) as e:
+        return _fail(str(e))
+    print(f"{report.title}: {args.saida}")
+    return 0
+
+def _partition_legacy(args) -> int:
+    try:
+        path = import_legacy_database(args.db, args.clinica, args.mes, args.ano, args.dados)
+    except (FileNotFoundError, FileExistsError) as e:
+        return _fail(str(e))
+    print(f"{args.db} copiado para {path}.")
+    db = Database(path)
+    try:
+        _update_aggregates(args, db)
+    finally:
+        db.close()
+    return 0
+
+def _archive_month(args) -> int:
+    if args.clinica:
+        clinics = [args.clinica]
+    else:
+        clinics = [partition['clinic'] for partition in list_partitions(args.dados) if partition['month'] == args.mes and partition['year'] == args.ano]
+        if not clinics:
+            return _fail(f"Nenhuma partição a arquivar em {args.mes:02d}/{args.ano} ({args.dados}).")
+
+    failed = False
+    for clinic in clinics:
+        try:
+            result = archive.archive_partition(clinic, args.mes, args.ano, args.dados, remove=not args.manter)
+        except (FileNotFoundError, FileExistsError, RuntimeError) as e:
+            print(f"{clinic}: ERRO - {e}", file=sys.stderr)
+            failed = True
+            continue
+        print(f"{clinic}: {sum(result['tables'].values())} linha(s), {result['database_bytes'] / 1024:.0f} KB -> {result['archive_bytes'] / 1024:.0f} KB em {result['path']}.")
+    return 1 if failed else 0
+
+def _rebuild_aggregates(args) -> int:
+    count = aggregates.rebuild(args.dados, progress=lambda partition: print(f"{partition['clinic']} {partition['month']:02d}/{partition['year']}"))
+    print(f"Indicadores recalculados para {count} partição(ões) em {aggregates.aggregates_path(args.dados)}.")
+    return 0
+
+def _trend_report(args) -> int:
+    from core.trends import TrendReport
+
+    report = TrendReport(None, resource_path('assets/logo.png'), clinic=args.clinica, month=args.mes, year=args.ano, months=args.meses, base_dir=args.dados)
+    try:
+        _create_output_dir(args.saida)
+        report.export(args.saida, args.formato)
+    except (ValueError, NotImplementedError, OSError) as e:
+        return _fail(str(e))
+    print(f"{report.title}: {args.saida}")
+    return 0
+
+def _add_data_dir_argument(parser):
+    parser.add_argument('--dados', default=PARTITIONS_DIR, help=f"Pasta dos bancos por clínica e competência (padrão: {PARTITIONS_DIR}).")
+
+def _add_partition_arguments(parser, required: bool = False):
+    parser.add_argument('--clinica', required=required, choices=CLINICS)
+    parser.add_argument('--mes', type=int, required=required, choices=range(1, 13), metavar='MES')
+    parser.add_argument('--ano', type=int, required=required)
+    _add_data_dir_argument(parser)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='sissup', description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--log-desempenho', action='store_true', help="Registra os tempos no log de desempenho (como SISSUP_PERF_LOG=1).")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    importar = commands.add_parser('importar', help="Importa arquivos CSV para o banco da clínica e competência.")
+    _add_partition_arguments(importar)
+    importar.add_argument('--db', help="Importa para este banco em vez da partição.")
+    importar.add_argument('--pasta', help="Importa de uma pasta os arquivos <tabela>.csv que existirem.")
+    importar.add_argument('arquivos', nargs='*', metavar='TABELA=ARQUIVO')
+    importar.set_defaults(handler=_import_sources)
+
+    relatorio = commands.add_parser('relatorio', help="Gera um relatório.")
+    relatorio.add_argument('--relatorio', required=True, choices=list(REPORT_REGISTRY))
+    _add_partition_arguments(relatorio, required=True)
+    relatorio.add_argument('--db', help="Lê deste banco em vez da partição.")
+    relatorio.add_argument('--formato', choices=['Excel', 'PDF'], default='Excel')
+    relatorio.add_argument('--saida', required=True, help="Arquivo gerado.")
+    relatorio.add_argument('--sem-cache', action='store_true', help="Não usa o cache de relatórios renderizados.")
+    relatorio.set_defaults(handler=_export_report)
+
+    fechamento = commands.add_parser('fechamento', help="Gera todos os relatórios do mês para cada clínica.")
+    fechamento.add_argument('--mes', type=int, required=True, choices=range(1, 13), metavar='MES')
+    fechamento.add_argument('--ano', type=int, required=True)
+    _add_data_dir_argument(fechamento)
+    fechamento.add_argument('--db', help="Lê deste banco em vez das partições; pode conter {clinica}.")
+    fechamento.add_argument('--saida', required=True, help="Pasta de saída.")
+    fechamento.add_argument('--clinicas', nargs='+', metavar='CLINICA', help="Clínicas a fechar (padrão: todas).")
+    fechamento.add_argument('--processos', type=int, help="Número máximo de processos em paralelo.")
+    fechamento.add_argument('--zip', action='store_true', help="Compacta as exportações de cada grupo em um ZIP.")
+    fechamento.set_defaults(handler=_close_month)
+
+    consolidado = commands.add_parser('consolidado', help="Gera o resumo Geral e Convênio de todas as clínicas em um só relatório.")
+    consolidado.add_argument('--mes', type=int, required=True, choices=range(1, 13), metavar='MES')
+    consolidado.add_argument('--ano', type=int, required=True)
+    _add_data_dir_argument(consolidado)
+    consolidado.add_argument('--clinicas', nargs='+', metavar='CLINICA', help="Clínicas consolidadas (padrão: todas com dados na competência).")
+    consolidado.add_argument('--processos', type=int, help="Número máximo de processos em paralelo.")
+    consolidado.add_argument('--formato', choices=['Excel', 'PDF'], default='Excel')
+    consolidado.add_argument('--saida', required=True, help="Arquivo gerado.")
+    consolidado.set_defaults(handler=_consolidated_report)
+
+    tendencia = commands.add_parser('tendencia', help="Gera a evolução mensal dos indicadores a partir do histórico.")
+    tendencia.add_argument('--mes', type=int, required=True, choices=range(1, 13), metavar='MES', help="Última competência.")
+    tendencia.add_argument('--ano', type=int, required=True)
+    tendencia.add_argument('--meses', type=int, default=12, help="Número de competências (padrão: 12).")
+    tendencia.add_argument('--clinica', choices=CLINICS, help="Clínica (padrão: soma de todas).")
+    _add_data_dir_argument(tendencia)
+    tendencia.add_argument('--formato', choices=['Excel', 'PDF'], default='Excel')
+    tendencia.add_argument('--saida', required=True, help="Arquivo gerado.")
+    tendencia.set_defaults(handler=_trend_report)
+
+    indicadores = commands.add_parser('indicadores', help="Recalcula o histórico de indicadores a partir de todas as partições, inclusive as arquivadas.")
+    _add_data_dir_argument(indicadores)
+    indicadores.set_defaults(handler=_rebuild_aggregates)
+
+    particionar = commands.add_parser('particionar', help="Copia um banco único antigo para a partição de uma clínica e competência.")
+    particionar.add_argument('--db', default=LEGACY_DATABASE, help=f"Banco antigo (padrão: {LEGACY_DATABASE}).")
+    _add_partition_arguments(particionar, required=True)
+    particionar.set_defaults(handler=_partition_legacy)
+
+    arquivar = commands.add_parser('arquivar', help="Grava as partições de uma competência fechada em Parquet e remove os bancos.")
+    arquivar.add_argument('--mes', type=int, required=True, choices=range(1, 13), metavar='MES')
+    arquivar.add_argument('--ano', type=int, required=True)
+    arquivar.add_argument('--clinica', choices=CLINICS, help="Clínica (padrão: todas com banco na competência).")
+    _add_data_dir_argument(arquivar)
+    arquivar.add_argument('--manter', action='store_true', help="Mantém o banco da partição depois de arquivar.")
+    arquivar.set_defaults(handler=_archive_month)
+    return parser
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.log_desempenho:
+        perf_log.set_enabled(True)
+    return args.handler(args)
+
+if __name__ == '__main__':
+    # Necessário para o pool de processos do fechamento no executável do PyInstaller.
+    multiprocessing.freeze_support()
+    sys.exit(main())
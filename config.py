@@ -72,7 +72,8 @@ REPORT_DEFINITIONS = {
     "Relatório de Fechamento SUS": {
         "imports": ["laudos_apac", "faturamento_geral", "sessoes_hd", "estatistica_mensal", "eventos_cateter"],
         "corrections": ["Remarcações"],
-        "exports": ["Geral", "Entrada", "Saída", "Fístulas", "Continuidade"]
+        "exports": ["Geral", "Entrada", "Saída", "Fístulas", "Continuidade"],
+        "workbook": ["Geral", "Entrada", "Saída", "Fístulas", "Continuidade", "Remarcações"]
     },
     "Relatório de Faturamento Convênio": {
         "imports": ["faturamento_convenio"],
@@ -81,6 +82,44 @@ REPORT_DEFINITIONS = {
     }
 }
 
+# Clínicas faturadas (ordem da seleção na tela de relatórios).
+CLINICS = [
+    "Renal Clínica", "Instituto do Rim", "Nefron Clínica", "CNN",
+    "Pronto Rim", "Clínica do Rim", "Hospital do Rim"
+]
+
+# Bancos particionados: um arquivo por clínica e competência, em
+# PARTITIONS_DIR/<clínica>/<aaaa-mm>.db (ver core.partitions).
+PARTITIONS_DIR = "dados"
+
+# Banco único das versões anteriores às partições; copiado para uma partição
+# com core.partitions.import_legacy_database (a janela principal oferece a cópia).
+LEGACY_DATABASE = "database.db"
+
+# Indicadores mensais por clínica (ver core.aggregates), dentro de PARTITIONS_DIR.
+AGGREGATES_FILE = "agregados.db"
+
+# Competências arquivadas em Parquet (ver core.archive): PARTITIONS_DIR/<clínica>/ARCHIVE_DIR/<aaaa-mm>/.
+ARCHIVE_DIR = "arquivo"
+ARCHIVE_COMPRESSION = "zstd"
+
+# Motor de consulta dos relatórios (ver core.engines): "referencia" (Database),
+# "vetorizado" ou "duckdb" (requer o pacote duckdb).
+QUERY_ENGINE = "referencia"
+
+# Faturamento Convênio lido em blocos desse número de linhas (memória limitada
+# pelo número de guias); 0 lê a tabela inteira de uma vez.
+CONVENIO_CHUNK_ROWS = 100000
+
+# Cache dos relatórios renderizados (pasta ao lado do banco de dados).
+RENDER_CACHE_DIR = "render_cache"
+RENDER_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# Log de desempenho (core.perf_log), na pasta de trabalho ao lado do banco.
+PERF_LOG_FILE = "desempenho.log"
+PERF_LOG_MAX_BYTES = 2 * 1024 * 1024
+PERF_LOG_BACKUPS = 3
+
 DATA_SOURCE_TITLES = {
     "laudos_apac": "Laudos de APAC",
     "faturamento_geral": "Faturamento Geral (SUS)",
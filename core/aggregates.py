@@ -0,0 +1,163 @@
+# core/aggregates.py
+"""
+Histórico mensal de indicadores (KPIs) por clínica.
+
+Cada importação substitui a tabela da partição, então os números de meses
+anteriores só continuam disponíveis se forem guardados à parte. Depois de
+cada importação, os indicadores que dependem da tabela importada são
+recalculados para aquela clínica e competência e gravados em um banco
+pequeno, <pasta dos dados>/agregados.db, com uma linha por
+(clínica, competência, indicador). As demais competências não são tocadas.
+
+Os relatórios de tendência leem só esse banco, sem as linhas brutas.
+"""
+
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from config import PARTITIONS_DIR, AGGREGATES_FILE
+from core.connections import ConnectionManager
+
+CONVENIO_TABLE = 'faturamento_convenio'
+
+# Indicadores -> rótulo exibido (os mesmos nomes de coluna do consolidado).
+KPI_LABELS = {
+    'pacientes': 'Pacientes',
+    'sessoes_totais': 'Sessões Totais',
+    'sessoes_hd': 'Sessões HD',
+    'sessoes_extras': 'Sessões Extras',
+    'cdl': 'CDL',
+    'hbv': 'HBV',
+    'hcv': 'HCV',
+    'hiv': 'HIV',
+    'guias_convenio': 'Guias Convênio',
+    'sessoes_convenio': 'Sessões Convênio',
+    'sessoes_hd_convenio': 'Sessões HD Convênio',
+    'sessoes_hdf_convenio': 'Sessões HDF Convênio',
+    'valor_convenio': 'Valor Convênio',
+}
+
+# Indicadores do Geral (SUS) -> chave do resumo de GeralReport.
+GERAL_KPIS = {
+    'pacientes': 'Pacientes na Listagem',
+    'sessoes_totais': 'Sessões Totais',
+    'sessoes_hd': 'Sessões HD',
+    'sessoes_extras': 'Sessões Extras',
+    'cdl': 'Colocações de CDL',
+    'hbv': 'Total HBV',
+    'hcv': 'Total HCV',
+    'hiv': 'Total HIV',
+}
+
+# Indicadores do Convênio -> chave de Database.get_convenio_totals.
+CONVENIO_KPIS = {
+    'guias_convenio': 'guias',
+    'sessoes_convenio': 'sessoes',
+    'sessoes_hd_convenio': 'sessoes_hd',
+    'sessoes_hdf_convenio': 'sessoes_hdf',
+    'valor_convenio': 'valor',
+}
+
+def aggregates_path(base_dir: str = PARTITIONS_DIR) -> str:
+    return os.path.join(base_dir, AGGREGATES_FILE)
+
+def compute_kpis(db, clinic: str, month: int, year: int, tables: list = None) -> dict:
+    """
+    Calcula os indicadores de uma partição. Com tables, só os grupos (Geral,
+    Convênio) que dependem de alguma dessas tabelas. Grupos com fontes não
+    importadas ficam de fora. Retorna {indicador: valor}.
+    """
+    from core.reports import EmptyReportError, GeralReport
+
+    geral_tables = GeralReport.source_tables
+    statuses = db.get_import_statuses(geral_tables + [CONVENIO_TABLE])['tables']
+    affects = lambda group_tables: tables is None or any(table in group_tables for table in tables)
+    values = {}
+
+    if affects(geral_tables) and all(statuses[table] is not None for table in geral_tables):
+        report = GeralReport(db, None, clinic=clinic, month=month, year=year)
+        try:
+            _, summary = report.prepare(report.get_data())
+        except EmptyReportError:
+            # Nenhum paciente na listagem.
+            summary = {}
+        values.update({kpi: summary.get(key, 0) for kpi, key in GERAL_KPIS.items()})
+
+    if affects([CONVENIO_TABLE]) and statuses[CONVENIO_TABLE] is not None:
+        totals = db.get_convenio_totals()
+        values.update({kpi: totals.get(key, 0) for kpi, key in CONVENIO_KPIS.items()})
+    return values
+
+class AggregatesStore:
+    """
+    Banco dos indicadores mensais: tabela kpis_mensais com uma linha por
+    (clínica, ano, mês, indicador). update() substitui só os indicadores
+    informados daquela clínica e competência.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connections = ConnectionManager(path)
+        with self.connections.writer() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kpis_mensais (clinica TEXT NOT NULL, ano INTEGER NOT NULL, mes INTEGER NOT NULL, "
+                "indicador TEXT NOT NULL, valor REAL, atualizado_em TEXT, PRIMARY KEY (clinica, ano, mes, indicador))"
+            )
+
+    def close(self):
+        self.connections.close()
+
+    def update(self, clinic: str, month: int, year: int, values: dict):
+        if not values:
+            return
+        updated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self.connections.writer() as conn:
+            conn.executemany(
+                "INSERT INTO kpis_mensais (clinica, ano, mes, indicador, valor, atualizado_em) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (clinica, ano, mes, indicador) DO UPDATE SET valor = excluded.valor, atualizado_em = excluded.atualizado_em",
+                [(clinic, int(year), int(month), kpi, float(value), updated_at) for kpi, value in values.items()]
+            )
+
+    def history(self, start: tuple, end: tuple, clinics: list = None) -> pd.DataFrame:
+        """
+        Indicadores de start a end ((ano, mês), inclusive), em formato longo:
+        colunas clinica, ano, mes, indicador e valor.
+        """
+        query = "SELECT clinica, ano, mes, indicador, valor FROM kpis_mensais WHERE (ano * 100 + mes) BETWEEN ? AND ?"
+        params = [start[0] * 100 + start[1], end[0] * 100 + end[1]]
+        if clinics:
+            query += f" AND clinica IN ({', '.join('?' * len(clinics))})"
+            params += list(clinics)
+        return pd.read_sql_query(query + " ORDER BY ano, mes, clinica", self.connections.reader(), params=params)
+
+def update_partition(store: AggregatesStore, db, clinic: str, month: int, year: int, tables: list = None) -> dict:
+    """ Recalcula e grava os indicadores de uma partição (ver compute_kpis). """
+    values = compute_kpis(db, clinic, month, year, tables)
+    store.update(clinic, month, year, values)
+    return values
+
+def rebuild(base_dir: str = PARTITIONS_DIR, progress=None) -> int:
+    """
+    Recalcula os indicadores de todas as partições de base_dir (ex.: dados
+    importados antes do histórico existir), inclusive as competências
+    arquivadas em Parquet (ver archive.list_competencias). Retorna o número
+    de partições.
+    """
+    from core.archive import list_competencias, open_database
+
+    notify = progress or (lambda partition: None)
+    partitions = list_competencias(base_dir)
+    store = AggregatesStore(aggregates_path(base_dir))
+    try:
+        for partition in partitions:
+            db = open_database(partition['path'])
+            try:
+                update_partition(store, db, partition['clinic'], partition['month'], partition['year'])
+            finally:
+                db.close()
+            notify(partition)
+    finally:
+        store.close()
+    return len(partitions)
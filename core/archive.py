@@ -0,0 +1,221 @@
+# core/archive.py
+"""
+Arquivo das competências fechadas em Parquet.
+
+archive_partition() grava as tabelas do banco de uma clínica e competência
+em arquivos Parquet compactados (PARTITIONS_DIR/<clínica>/ARCHIVE_DIR/
+<aaaa-mm>/<tabela>.parquet, com um manifest.json) e remove o banco SQLite
+da partição, que deixa de ocupar espaço e de pesar no vacuum e no backup.
+
+ArchivedDatabase lê uma competência arquivada com as mesmas consultas de
+Database (generate_*, get_import_statuses...), então relatórios, motores e
+o fechamento funcionam sobre ela sem mudanças.
+"""
+
+import json
+import os
+import re
+import shutil
+import sqlite3
+import threading
+from datetime import datetime
+from importlib.util import find_spec
+
+import pandas as pd
+
+from config import get_table_configs, CLINICS, PARTITIONS_DIR, ARCHIVE_DIR, ARCHIVE_COMPRESSION
+from core import perf_log
+from core.database import Database
+from core.utils import safe_filename
+
+# Opcional: o Parquet é gravado e lido pelo pandas com o pyarrow.
+PARQUET_AVAILABLE = find_spec('pyarrow') is not None
+
+MANIFEST_FILE = 'manifest.json'
+
+_ARCHIVE_DIR_NAME = re.compile(r'^(\d{4})-(\d{2})$')
+
+def archive_path(clinic: str, month: int, year: int, base_dir: str = PARTITIONS_DIR) -> str:
+    """ Pasta do arquivo de uma clínica e competência. """
+    return os.path.join(base_dir, safe_filename(clinic), ARCHIVE_DIR, f"{int(year):04d}-{int(month):02d}")
+
+def is_archived(clinic: str, month: int, year: int, base_dir: str = PARTITIONS_DIR) -> bool:
+    return os.path.exists(os.path.join(archive_path(clinic, month, year, base_dir), MANIFEST_FILE))
+
+def list_archives(base_dir: str = PARTITIONS_DIR) -> list:
+    """
+    Competências arquivadas, no mesmo formato de list_partitions ('path' é a
+    pasta do arquivo). Pastas fora do padrão <aaaa-mm> (ex.: um <aaaa-mm>.tmp
+    deixado por um arquivamento interrompido) ficam de fora.
+    """
+    archives = []
+    for clinic in CLINICS:
+        clinic_dir = os.path.join(base_dir, safe_filename(clinic), ARCHIVE_DIR)
+        if not os.path.isdir(clinic_dir):
+            continue
+        for name in sorted(os.listdir(clinic_dir)):
+            match = _ARCHIVE_DIR_NAME.match(name)
+            path = os.path.join(clinic_dir, name)
+            if match and os.path.exists(os.path.join(path, MANIFEST_FILE)):
+                archives.append({'clinic': clinic, 'month': int(match.group(2)), 'year': int(match.group(1)), 'path': path})
+    return archives
+
+def list_competencias(base_dir: str = PARTITIONS_DIR) -> list:
+    """
+    Partições e competências arquivadas, no formato de list_partitions, uma
+    entrada por (clínica, ano, mês). Se uma competência tiver banco e
+    arquivo, vale o banco.
+    """
+    from core.partitions import list_partitions
+
+    return list({
+        (entry['clinic'], entry['year'], entry['month']): entry
+        for entry in list_archives(base_dir) + list_partitions(base_dir)
+    }.values())
+
+def resolve_path(clinic: str, month: int, year: int, base_dir: str = PARTITIONS_DIR) -> str:
+    """ Banco da partição ou, se a competência foi arquivada, a pasta do arquivo. """
+    from core.partitions import partition_path
+
+    path = partition_path(clinic, month, year, base_dir)
+    if not os.path.exists(path) and is_archived(clinic, month, year, base_dir):
+        return archive_path(clinic, month, year, base_dir)
+    return path
+
+def open_database(path: str) -> Database:
+    """ Database de um arquivo de banco ou ArchivedDatabase de uma pasta de arquivo. """
+    if os.path.isdir(path) and os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        return ArchivedDatabase(path)
+    return Database(path)
+
+def _require_parquet():
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError("O pacote 'pyarrow' é necessário para o arquivo em Parquet.")
+
+def archive_partition(clinic: str, month: int, year: int, base_dir: str = PARTITIONS_DIR, remove: bool = True) -> dict:
+    """
+    Arquiva a partição da clínica e competência. Antes de remover o banco, o
+    histórico de indicadores (core.aggregates) é atualizado e o número de
+    linhas de cada arquivo Parquet é conferido com o da tabela. Com
+    remove=False o banco é mantido.
+
+    O banco não deve estar aberto em outro processo (ex.: a tela de
+    relatórios na mesma competência). Retorna {'path', 'tables' ({tabela:
+    linhas}), 'database_bytes', 'archive_bytes'}.
+    """
+    from core.aggregates import AggregatesStore, aggregates_path, update_partition
+    from core.partitions import partition_path
+
+    _require_parquet()
+    db_path = partition_path(clinic, month, year, base_dir)
+    target = archive_path(clinic, month, year, base_dir)
+    if os.path.exists(target):
+        raise FileExistsError(f"A competência {month:02d}/{year} de {clinic} já está arquivada: {target}")
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Banco de dados não encontrado: {db_path}")
+
+    database_bytes = sum(os.path.getsize(path) for path in (db_path, f"{db_path}-wal") if os.path.exists(path))
+    tmp_dir = f"{target}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    tables = {}
+    try:
+        with perf_log.timed('arquivo', clinica=clinic, competencia=f"{month:02d}/{year}") as record:
+            db = Database(db_path)
+            try:
+                store = AggregatesStore(aggregates_path(base_dir))
+                try:
+                    update_partition(store, db, clinic, month, year)
+                finally:
+                    store.close()
+
+                conn = db._read_conn()
+                for table_name in list(get_table_configs()) + ['import_log']:
+                    df = pd.read_sql_query(f"SELECT * FROM {table_name}", conn)
+                    df.to_parquet(os.path.join(tmp_dir, f"{table_name}.parquet"), compression=ARCHIVE_COMPRESSION, index=False)
+                    tables[table_name] = len(df)
+            finally:
+                db.close()
+
+            import pyarrow.parquet as pq
+            for table_name, rows in tables.items():
+                written = pq.read_metadata(os.path.join(tmp_dir, f"{table_name}.parquet")).num_rows
+                if written != rows:
+                    raise RuntimeError(f"Arquivo de '{table_name}' incompleto: {written} de {rows} linhas.")
+
+            manifest = {
+                'clinic': clinic, 'month': int(month), 'year': int(year),
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'compression': ARCHIVE_COMPRESSION, 'tables': tables,
+            }
+            with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_dir, target)
+            record['linhas'] = sum(tables.values())
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    if remove:
+        for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+    archive_bytes = sum(os.path.getsize(os.path.join(target, name)) for name in os.listdir(target))
+    return {'path': target, 'tables': tables, 'database_bytes': database_bytes, 'archive_bytes': archive_bytes}
+
+class ArchivedDatabase(Database):
+    """
+    Competência arquivada, somente leitura, com as consultas de Database.
+
+    No primeiro uso, as tabelas Parquet são carregadas uma única vez em um
+    banco SQLite em memória, compartilhado por todas as threads (o sqlite3
+    compilado em modo serializado aceita uma conexão usada por várias
+    threads), e as consultas de Database rodam sobre ele sem alteração, com o
+    mesmo resultado do banco original. A memória usada é a de uma competência
+    de uma clínica, liberada em close().
+    """
+    def __init__(self, archive_dir: str):
+        _require_parquet()
+        with open(os.path.join(archive_dir, MANIFEST_FILE), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.archive_dir = archive_dir
+        self.db_name = archive_dir
+        self._conn = None
+        self._conn_lock = threading.Lock()
+
+    def close(self):
+        with self._conn_lock:
+            conn, self._conn = self._conn, None
+        if conn is not None:
+            conn.close()
+
+    def _read_conn(self):
+        with self._conn_lock:
+            if self._conn is None:
+                with perf_log.timed('arquivo.leitura', competencia=f"{self.manifest['month']:02d}/{self.manifest['year']}") as record:
+                    conn = sqlite3.connect(':memory:', check_same_thread=False)
+                    for table_name in self.manifest['tables']:
+                        df = pd.read_parquet(os.path.join(self.archive_dir, f"{table_name}.parquet"))
+                        df.to_sql(table_name, conn, index=False)
+                    record['linhas'] = sum(self.manifest['tables'].values())
+                self._conn = conn
+            return self._conn
+
+    def create_tables(self):
+        pass
+
+    def import_from_csv(self, file_path, table_name):
+        raise ValueError(f"A competência {self.manifest['month']:02d}/{self.manifest['year']} de {self.manifest['clinic']} está arquivada e não aceita importações.")
+
+    def get_storage_stats(self):
+        return {
+            'file_size': sum(os.path.getsize(os.path.join(self.archive_dir, name)) for name in os.listdir(self.archive_dir)),
+            'wal_size': 0,
+            'journal_mode': 'parquet',
+            'tables': [
+                {'name': table_name, 'rows': rows, 'indexes': [], 'status_query_plan': '', 'status_query_uses_index': False}
+                for table_name, rows in self.manifest['tables'].items()
+            ],
+        }
+
+    def run_maintenance(self, action):
+        raise ValueError("A competência está arquivada em Parquet: não há manutenção do banco a fazer.")
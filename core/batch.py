@@ -0,0 +1,150 @@
+# core/batch.py
+"""
+Exportação em lote: gera vários relatórios de uma vez, calculando cada
+DataFrame de origem uma única vez e renderizando os arquivos em paralelo.
+"""
+
+import os
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from core.exporter import export_workbook
+from core.reports import EmptyReportError
+from core import perf_log
+from core.utils import safe_filename
+
+FORMAT_EXTENSIONS = {'Excel': 'xlsx', 'PDF': 'pdf'}
+
+def _render_task(report_class, logo_path, params, df, summary, path, file_format):
+    """
+    Executado no processo filho: o relatório é recriado sem banco de dados.
+    Retorna os registros de desempenho, gravados pelo processo principal.
+    """
+    with perf_log.capture() as records:
+        report = report_class(None, logo_path, **params)
+        report.render(df, summary, path, file_format)
+    return records
+
+def output_filename(report, file_format):
+    return f"{safe_filename(report.title)}.{FORMAT_EXTENSIONS[file_format]}"
+
+def _prepare_reports(reports, notify):
+    """
+    Executa as etapas de consulta e transformação de todos os relatórios,
+    buscando cada get_data distinto uma única vez. Retorna a lista de
+    (relatório, df, resumo) e as mensagens dos relatórios sem dados.
+    """
+    notify('query')
+    raw_data = {}
+    for report in reports:
+        key = type(report).get_data
+        if key not in raw_data:
+            raw_data[key] = report.get_data()
+
+    notify('transform')
+    prepared = []
+    skipped = []
+    for report in reports:
+        try:
+            df, summary = report.prepare(raw_data[type(report).get_data])
+        except EmptyReportError as ve:
+            skipped.append(str(ve))
+            continue
+        prepared.append((report, df, summary))
+
+    if not prepared:
+        raise EmptyReportError("Nenhum dos relatórios selecionados possui dados para exportar.")
+    return prepared, skipped
+
+def export_all(reports, output_dir, formats=('Excel', 'PDF'), zip_name=None, max_workers=None, progress=None):
+    """
+    Exporta todos os relatórios em todos os formatos para output_dir (ou para
+    um único arquivo ZIP, se zip_name for informado).
+
+    Relatórios que compartilham o mesmo get_data (ex.: Geral, Entrada e Saída)
+    reutilizam o mesmo DataFrame bruto. A renderização roda em um pool de
+    processos; com max_workers=1 tudo é feito no processo atual.
+
+    Retorna um dicionário com 'files' (caminhos gerados) e 'skipped'
+    (mensagens dos relatórios sem dados). progress(etapa) segue as mesmas
+    etapas de BaseReport.export.
+    """
+    notify = progress or (lambda stage: None)
+
+    prepared, skipped = _prepare_reports(reports, notify)
+
+    notify('render')
+    os.makedirs(output_dir, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(prefix='.sissup_lote_', dir=output_dir)
+    try:
+        tasks = []
+        for report, df, summary in prepared:
+            for file_format in formats:
+                staged_path = os.path.join(staging_dir, output_filename(report, file_format))
+                tasks.append((type(report), report.default_logo_path, report.params, df, summary, staged_path, file_format))
+
+        workers = max_workers or min(len(tasks), os.cpu_count() or 1)
+        if workers <= 1:
+            for task in tasks:
+                perf_log.write_records(_render_task(*task))
+                notify('render')
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending = {executor.submit(_render_task, *task) for task in tasks}
+                try:
+                    while pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            perf_log.write_records(future.result())
+                        notify('render')
+                except BaseException:
+                    for future in pending:
+                        future.cancel()
+                    raise
+
+        notify('write')
+        staged_files = sorted(os.listdir(staging_dir))
+        if zip_name:
+            zip_path = os.path.join(output_dir, zip_name)
+            tmp_zip = os.path.join(staging_dir, '.parcial.zip')
+            with zipfile.ZipFile(tmp_zip, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+                for filename in staged_files:
+                    zf.write(os.path.join(staging_dir, filename), arcname=filename)
+            os.replace(tmp_zip, zip_path)
+            files = [zip_path]
+        else:
+            files = []
+            for filename in staged_files:
+                final_path = os.path.join(output_dir, filename)
+                os.replace(os.path.join(staging_dir, filename), final_path)
+                files.append(final_path)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    return {'files': files, 'skipped': skipped}
+
+def export_single_workbook(reports, file_path, progress=None):
+    """
+    Grava os relatórios como abas de uma única pasta de trabalho Excel, em uma
+    só sessão de escrita. Relatórios sem dados ficam de fora. Retorna o mesmo
+    dicionário de export_all.
+    """
+    notify = progress or (lambda stage: None)
+    prepared, skipped = _prepare_reports(reports, notify)
+
+    notify('render')
+    sheets = [report.excel_sheet(df, summary) for report, df, summary in prepared]
+    directory, filename = os.path.split(os.path.abspath(file_path))
+    stem, extension = os.path.splitext(filename)
+    tmp_path = os.path.join(directory, f".{stem}.parcial{extension}")
+    try:
+        export_workbook(sheets, tmp_path)
+        notify('write')
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return {'files': [file_path], 'skipped': skipped}
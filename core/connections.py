@@ -0,0 +1,83 @@
+# core/connections.py
+"""
+Gerenciamento das conexões SQLite, para que importações (escrita) e leituras
+de relatórios possam acontecer ao mesmo tempo em threads diferentes.
+"""
+
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+
+class _ThreadReader:
+    """ Conexão de leitura guardada no threading.local; fecha ao ser descartada com a thread. """
+    __slots__ = ('conn', '__weakref__')
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __del__(self):
+        self.conn.close()
+
+class ConnectionManager:
+    """
+    Conexões de um arquivo de banco SQLite:
+
+    - uma única conexão de escrita, usada por uma thread de cada vez dentro
+      de writer(), que confirma (ou desfaz) a transação ao sair;
+    - uma conexão somente leitura por thread (reader()), criada no primeiro
+      uso e reaproveitada pela mesma thread. Ela é fechada quando a thread
+      termina (threads do QThreadPool que expiram, QThreads de importação),
+      ou em close().
+
+    O banco é colocado em modo WAL, em que as leituras enxergam o último
+    estado confirmado sem esperar pela escrita em andamento. Se o sistema de
+    arquivos não suportar WAL (ex.: algumas pastas de rede), o SQLite mantém o
+    modo anterior e busy_timeout faz as leituras aguardarem a escrita.
+    Nenhum cursor é compartilhado: cada consulta cria o seu.
+    """
+    def __init__(self, db_path: str, busy_timeout: float = 10.0):
+        self.db_path = os.path.abspath(db_path)
+        self.busy_timeout = busy_timeout
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        self._readers = weakref.WeakSet()
+        self._readers_lock = threading.Lock()
+        self._writer = sqlite3.connect(self.db_path, timeout=busy_timeout, check_same_thread=False)
+        self.journal_mode = self._writer.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        if self.journal_mode.lower() == 'wal':
+            self._writer.execute("PRAGMA synchronous=NORMAL")
+
+    @contextmanager
+    def writer(self):
+        """ Conexão de escrita, exclusiva durante o bloco with. """
+        with self._write_lock:
+            try:
+                yield self._writer
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                raise
+
+    def reader(self) -> sqlite3.Connection:
+        """ Conexão somente leitura da thread atual. """
+        reader = getattr(self._local, 'reader', None)
+        if reader is None:
+            uri = f"{Path(self.db_path).as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, timeout=self.busy_timeout, check_same_thread=False)
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout * 1000)}")
+            reader = self._local.reader = _ThreadReader(conn)
+            with self._readers_lock:
+                self._readers.add(reader)
+        return reader.conn
+
+    def close(self):
+        with self._readers_lock:
+            readers = list(self._readers)
+            self._readers.clear()
+        for reader in readers:
+            reader.conn.close()
+        with self._write_lock:
+            self._writer.close()
@@ -0,0 +1,177 @@
+# core/consolidated.py
+"""
+Relatório consolidado da rede: os números do Geral (SUS) e do Faturamento
+Convênio de todas as clínicas com dados na competência, uma linha por
+clínica e o total do grupo no resumo.
+
+Cada clínica é resumida em um processo próprio, sobre o banco da sua
+partição (core/partitions.py). Só os resumos, alguns números por clínica,
+voltam ao processo principal: as linhas brutas de todas as clínicas nunca
+são carregadas juntas.
+"""
+
+import pandas as pd
+from reportlab.lib.pagesizes import letter, landscape
+
+from config import PARTITIONS_DIR, DATA_SOURCE_TITLES
+from core import perf_log
+from core.archive import list_competencias, open_database
+from core.exporter import export_workbook, export_to_pdf
+from core.month_close import run_per_clinic
+from core.reports import BaseReport, EmptyReportError, GeralReport
+from core.utils import format_brl
+
+CONVENIO_TABLE = 'faturamento_convenio'
+
+# Colunas do consolidado -> chave do resumo de GeralReport.
+GERAL_COLUMNS = {
+    'Pacientes': 'Pacientes na Listagem',
+    'Sessões HD': 'Sessões HD',
+    'Sessões Extras': 'Sessões Extras',
+    'CDL': 'Colocações de CDL',
+    'HBV': 'Total HBV',
+    'HCV': 'Total HCV',
+    'HIV': 'Total HIV',
+}
+
+# Colunas do consolidado -> chave de Database.get_convenio_totals.
+CONVENIO_COLUMNS = {
+    'Guias Convênio': 'guias',
+    'Sessões Convênio': 'sessoes',
+    'Valor Convênio': 'valor',
+}
+
+def summarize_clinic(db_path: str, clinic: str, month: int, year: int) -> dict:
+    """
+    Resume uma clínica: {'clinic', 'geral', 'convenio', 'missing'}. 'geral' é
+    o resumo de GeralReport e 'convenio' o de Database.get_convenio_totals;
+    cada um fica None quando as fontes não foram importadas (listadas em
+    'missing').
+    """
+    db = open_database(db_path)
+    try:
+        with perf_log.timed('consolidado.clinica', clinica=clinic, competencia=f"{month:02d}/{year}"):
+            statuses = db.get_import_statuses(GeralReport.source_tables + [CONVENIO_TABLE])['tables']
+            missing = [table for table, status in statuses.items() if status is None]
+
+            geral = None
+            if not any(table in missing for table in GeralReport.source_tables):
+                report = GeralReport(db, None, clinic=clinic, month=month, year=year)
+                df_raw = report.get_data()
+                try:
+                    _, geral = report.prepare(df_raw)
+                except EmptyReportError:
+                    # Nenhum paciente na listagem.
+                    geral = {key: 0 for key in GERAL_COLUMNS.values()}
+
+            convenio = None
+            if CONVENIO_TABLE not in missing:
+                convenio = db.get_convenio_totals() or {key: 0 for key in CONVENIO_COLUMNS.values()}
+    finally:
+        db.close()
+    return {'clinic': clinic, 'geral': geral, 'convenio': convenio, 'missing': missing}
+
+def collect_summaries(databases: dict, month: int, year: int, max_workers: int = None, progress=None) -> list:
+    """
+    Resume em paralelo as clínicas de databases ({clínica: caminho do banco}).
+    Retorna os resultados de summarize_clinic na ordem de databases; uma
+    clínica com erro traz 'error'.
+    """
+    tasks = {clinic: (db_path, clinic, month, year) for clinic, db_path in databases.items()}
+    results = run_per_clinic(summarize_clinic, tasks, max_workers, progress)
+    return [results[clinic] for clinic in databases]
+
+class ConsolidatedReport(BaseReport):
+    """
+    Consolidado da rede em uma competência. Não lê um banco só: db é
+    ignorado (pode ser None) e as partições vêm de base_dir. Parâmetros:
+    month, year, base_dir (padrão PARTITIONS_DIR), clinics (padrão: todas
+    com dados) e max_workers.
+
+    Como não tem um banco de origem, não usa o RenderCache.
+    """
+    sheet_name = "Consolidado"
+
+    @property
+    def title(self) -> str:
+        month = self.params.get('month', 0)
+        year = self.params.get('year', 0)
+        return f"Consolidado da Rede - {month:02d}.{year}"
+
+    def databases(self) -> dict:
+        """ Partições da competência, inclusive arquivadas: {clínica: caminho do banco ou do arquivo}. """
+        month = self.params.get('month')
+        year = self.params.get('year')
+        clinics = self.params.get('clinics')
+        base_dir = self.params.get('base_dir', PARTITIONS_DIR)
+        return {
+            partition['clinic']: partition['path']
+            for partition in list_competencias(base_dir)
+            if partition['month'] == month and partition['year'] == year and (not clinics or partition['clinic'] in clinics)
+        }
+
+    def get_data(self) -> pd.DataFrame:
+        databases = self.databases()
+        if not databases:
+            return pd.DataFrame()
+        results = collect_summaries(databases, self.params.get('month'), self.params.get('year'), self.params.get('max_workers'))
+
+        rows = []
+        for result in results:
+            row = {'Clínica': result['clinic']}
+            for column, key in GERAL_COLUMNS.items():
+                row[column] = (result.get('geral') or {}).get(key)
+            for column, key in CONVENIO_COLUMNS.items():
+                row[column] = (result.get('convenio') or {}).get(key)
+            if result.get('error'):
+                row['Observação'] = f"Erro: {result['error']}"
+            elif result.get('missing'):
+                row['Observação'] = "Sem " + ", ".join(DATA_SOURCE_TITLES.get(table, table) for table in result['missing'])
+            else:
+                row['Observação'] = ""
+            rows.append(row)
+
+        df = pd.DataFrame(rows)
+        for column in list(GERAL_COLUMNS) + ['Guias Convênio', 'Sessões Convênio']:
+            df[column] = df[column].astype('Int64')
+        df['Valor Convênio'] = df['Valor Convênio'].astype('Float64').round(2)
+        return df
+
+    def filter_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df[['Clínica'] + list(GERAL_COLUMNS) + list(CONVENIO_COLUMNS) + ['Observação']]
+
+    def get_summary(self, df: pd.DataFrame) -> dict:
+        hd_sessions = int(df['Sessões HD'].sum())
+        extra_sessions = int(df['Sessões Extras'].sum())
+        return {
+            "Clínicas": len(df),
+            "Pacientes na Listagem": int(df['Pacientes'].sum()),
+            'Sessões Totais': hd_sessions + extra_sessions,
+            'Sessões HD': hd_sessions,
+            'Sessões Extras': extra_sessions,
+            'Colocações de CDL': int(df['CDL'].sum()),
+            'Total HBV': int(df['HBV'].sum()),
+            'Total HCV': int(df['HCV'].sum()),
+            'Total HIV': int(df['HIV'].sum()),
+            "Guias de Convênio": int(df['Guias Convênio'].sum()),
+            "Sessões de Convênio": int(df['Sessões Convênio'].sum()),
+            "Valor Total de Convênio": format_brl(float(df['Valor Convênio'].sum())),
+        }
+
+    def prepare(self, df_raw: pd.DataFrame):
+        if df_raw.empty:
+            month = self.params.get('month', 0)
+            year = self.params.get('year', 0)
+            raise EmptyReportError(f"Nenhuma clínica tem dados importados em {month:02d}/{year}.")
+        return super().prepare(df_raw)
+
+    def excel_sheet(self, df: pd.DataFrame, summary: dict) -> tuple:
+        return (self.sheet_name, df, summary, "RESUMO DA REDE")
+
+    def render(self, df: pd.DataFrame, summary: dict, file_path: str, file_format: str):
+        if file_format.lower() == 'excel':
+            export_workbook([self.excel_sheet(df, summary)], file_path)
+        elif file_format.lower() == 'pdf':
+            export_to_pdf(df, file_path, self.get_logo_path(), self.title, summary, pagesize=landscape(letter))
+        else:
+            raise NotImplementedError(f"Formato de arquivo '{file_format}' não suportado.")
@@ -0,0 +1,194 @@
+# core/csv_preview.py
+"""
+Leitura paginada de arquivos CSV para a visualização prévia. Um índice com o
+deslocamento (em bytes) de cada linha é montado em segundo plano; a tela só
+lê e interpreta as linhas que estão sendo exibidas.
+"""
+
+import csv
+import os
+import threading
+from array import array
+
+import numpy as np
+import pandas as pd
+from PySide6.QtCore import QObject, QRunnable, Signal, Slot
+
+class CsvLineIndex:
+    """
+    Índice de linhas de um CSV (separador ';', latin-1). As primeiras
+    skip_lines linhas (cabeçalho) ficam fora do índice.
+
+    O índice é construído por blocos com index_next_chunk(); rows_indexed()
+    e read_rows() podem ser chamados de outra thread enquanto isso acontece.
+
+    Observação: o índice considera uma linha física por registro; campos entre
+    aspas com quebra de linha aparecem divididos na visualização.
+    """
+    CHUNK_BYTES = 4 * 1024 * 1024
+
+    def __init__(self, file_path: str, encoding: str = 'latin-1', sep: str = ';', skip_lines: int = 1):
+        self.file_path = file_path
+        self.encoding = encoding
+        self.sep = sep
+        self.file_size = os.path.getsize(file_path)
+        self._offsets = array('q')
+        self._lock = threading.Lock()
+        self._complete = False
+        self._scan_pos = 0
+        self._to_skip = skip_lines
+        self._index_file = None
+        self._read_file = None
+        if self.file_size > 0:
+            if self._to_skip > 0:
+                self._to_skip -= 1
+            else:
+                self._offsets.append(0)
+
+    def is_complete(self) -> bool:
+        return self._complete
+
+    def rows_indexed(self) -> int:
+        """ Linhas completas já indexadas (todas, depois que o índice termina). """
+        with self._lock:
+            count = len(self._offsets)
+            return count if self._complete else max(count - 1, 0)
+
+    def index_next_chunk(self) -> bool:
+        """ Indexa o próximo bloco do arquivo. Retorna False quando o arquivo terminou. """
+        if self._complete:
+            return False
+        if self._index_file is None:
+            self._index_file = open(self.file_path, 'rb')
+        data = self._index_file.read(self.CHUNK_BYTES)
+        if not data:
+            self._index_file.close()
+            self._index_file = None
+            with self._lock:
+                self._complete = True
+            return False
+
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        starts = np.flatnonzero(buffer == 10) + (self._scan_pos + 1)
+        self._scan_pos += len(data)
+        if self._to_skip > 0:
+            skipped = min(self._to_skip, len(starts))
+            starts = starts[skipped:]
+            self._to_skip -= skipped
+        starts = starts[starts < self.file_size]
+        with self._lock:
+            self._offsets.frombytes(starts.astype(np.int64).tobytes())
+        return True
+
+    def build(self, cancel_event: threading.Event = None, progress=None):
+        """ Indexa o restante do arquivo, chamando progress(linhas) a cada bloco. """
+        try:
+            while self.index_next_chunk():
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                if progress:
+                    progress(self.rows_indexed())
+        finally:
+            if self._index_file is not None:
+                self._index_file.close()
+                self._index_file = None
+
+    def read_rows(self, start: int, stop: int) -> list:
+        """ Lê e interpreta as linhas [start, stop) do índice. """
+        with self._lock:
+            available = len(self._offsets)
+            stop = min(stop, available)
+            if start >= stop:
+                return []
+            begin = self._offsets[start]
+            end = self._offsets[stop] if stop < available else self.file_size
+        if self._read_file is None:
+            self._read_file = open(self.file_path, 'rb')
+        self._read_file.seek(begin)
+        text = self._read_file.read(end - begin).decode(self.encoding)
+        lines = text.split('\n')[:stop - start]
+        return [next(csv.reader((line.rstrip('\r'),), delimiter=self.sep), []) for line in lines]
+
+    def close(self):
+        if self._read_file is not None:
+            self._read_file.close()
+            self._read_file = None
+
+class CsvIndexSignals(QObject):
+    progress = Signal(int)
+    finished = Signal(int, str)
+
+class CsvIndexJob(QRunnable):
+    """ Termina a construção de um CsvLineIndex fora da thread da interface. """
+    def __init__(self, line_index: CsvLineIndex):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.line_index = line_index
+        self.signals = CsvIndexSignals()
+        self._cancel_event = threading.Event()
+        self._done_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._done_event.wait(timeout)
+
+    @Slot()
+    def run(self):
+        try:
+            self.line_index.build(self._cancel_event, self.signals.progress.emit)
+            self.signals.finished.emit(self.line_index.rows_indexed(), "")
+        except Exception as e:
+            self.signals.finished.emit(self.line_index.rows_indexed(), str(e))
+        finally:
+            self._done_event.set()
+
+class CsvFrameSignals(QObject):
+    finished = Signal(object, str)
+
+class CsvFrameJob(QRunnable):
+    """
+    Carrega o CSV inteiro em um DataFrame (todas as colunas como texto) fora
+    da thread da interface. Usado quando a visualização precisa ordenar ou
+    filtrar, o que exige todas as linhas em memória.
+    """
+    # Trabalhos desligados de quem os iniciou (detach), mantidos vivos até terminar a leitura.
+    _detached = set()
+    _detached_lock = threading.Lock()
+
+    def __init__(self, file_path: str, headers: list):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.file_path = file_path
+        self.headers = list(headers)
+        self.signals = CsvFrameSignals()
+        self._done_event = threading.Event()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._done_event.wait(timeout)
+
+    def detach(self):
+        """
+        A leitura não pode ser interrompida: em vez de esperar, quem iniciou o
+        trabalho o entrega a si mesmo. O resultado é descartado e o trabalho é
+        liberado quando a leitura terminar.
+        """
+        with self._detached_lock:
+            if not self._done_event.is_set():
+                self._detached.add(self)
+
+    @Slot()
+    def run(self):
+        try:
+            df = pd.read_csv(self.file_path, sep=';', encoding='latin-1', header=None, skiprows=1, dtype=str)
+            if len(df.columns) != len(self.headers):
+                raise ValueError(f"O arquivo possui {len(df.columns)} colunas, mas são esperadas {len(self.headers)}.")
+            df.columns = self.headers
+            self.signals.finished.emit(df, "")
+        except Exception as e:
+            self.signals.finished.emit(None, str(e))
+        finally:
+            with self._detached_lock:
+                self._done_event.set()
+                self._detached.discard(self)
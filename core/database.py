@@ -3,25 +3,53 @@ import pandas as pd
 from datetime import datetime
 import os
 
-from config import get_table_configs, get_clean_headers
+from config import get_table_configs, get_clean_headers, CONVENIO_CHUNK_ROWS
+from core.utils import format_brl
+from core.connections import ConnectionManager
+from core import perf_log
+
+# Agregados por guia do Faturamento Convênio: coluna -> (coluna de origem, função).
+# first, sum, min e max podem ser reaplicados sobre agregados parciais (ver _aggregate_convenio_chunks).
+CONVENIO_GUIDE_AGGREGATES = {
+    'nome': ('nome', 'first'),
+    'matricula': ('matricula', 'first'),
+    'lote': ('lote', 'first'),
+    'programa_tratamento': ('programa_tratamento', 'first'),
+    'plano': ('plano', 'first'),
+    'quant': ('quant', 'sum'),
+    'total': ('total', 'sum'),
+    'data_inicio': ('data', 'min'),
+    'data_final': ('data', 'max'),
+}
+
+def create_schema(conn):
+    """ Cria as tabelas de Database que ainda não existirem na conexão. """
+    conn.execute("CREATE TABLE IF NOT EXISTS laudos_apac (id INTEGER PRIMARY KEY, nome TEXT, tratamento_procedimento TEXT, situacao TEXT, data_saida TEXT, n_apac TEXT, final TEXT, data_importacao DATE)")
+    conn.execute("CREATE TABLE IF NOT EXISTS sessoes_hd (id INTEGER PRIMARY KEY, nome TEXT, hd_normais INTEGER, hd_extras INTEGER, hd_remarcadas INTEGER, data_importacao DATE)")
+    conn.execute("CREATE TABLE IF NOT EXISTS estatistica_mensal (id INTEGER PRIMARY KEY, nome TEXT, dt_entr TEXT, hep_c TEXT, hbsag TEXT, hiv TEXT, alta_amb TEXT, obito TEXT, data_importacao DATE)")
+    conn.execute("CREATE TABLE IF NOT EXISTS eventos_cateter (id INTEGER PRIMARY KEY, data TEXT, acesso TEXT, nome TEXT, evento TEXT, tipo TEXT, localizacao TEXT, convenio TEXT, nao_cobra TEXT, data_importacao DATE)")
+    conn.execute("CREATE TABLE IF NOT EXISTS faturamento_geral (id INTEGER PRIMARY KEY, posicao TEXT, convenio TEXT, data TEXT, cod_prontuario TEXT, nome TEXT, matricula TEXT, numero_guia TEXT, senha_autoriz TEXT, lote TEXT, data_envio TEXT, protocolo TEXT, titulo TEXT, data_inc_titulo TEXT, executante TEXT, tipo_atendimento TEXT, servico_material TEXT, codigo TEXT, grupo TEXT, quant REAL, total REAL, tipo_guia TEXT, programa_tratamento TEXT, tipo_cobranca TEXT, data_importacao DATE)")
+    conn.execute("CREATE TABLE IF NOT EXISTS faturamento_convenio (id INTEGER PRIMARY KEY, posicao TEXT, convenio TEXT, data TEXT, cod_prontuario TEXT, nome TEXT, matricula TEXT, numero_guia TEXT, senha_autoriz TEXT, lote TEXT, data_envio TEXT, protocolo TEXT, titulo TEXT, data_inc_titulo TEXT, executante TEXT, tipo TEXT, servico_material TEXT, codigo TEXT, grupo TEXT, quant REAL, total REAL, tipo_guia TEXT, programa_tratamento TEXT, tipo_apresentacao TEXT, plano TEXT, data_importacao DATE)")
+    conn.execute("CREATE TABLE IF NOT EXISTS import_log (id INTEGER PRIMARY KEY AUTOINCREMENT, table_name TEXT, data_importacao DATE, linhas INTEGER)")
 
 class Database:
 
     def __init__(self, db_name="database.db"):
         self.db_name = db_name
-        self.conn = sqlite3.connect(self.db_name, check_same_thread=False)
-        self.cursor = self.conn.cursor()
+        self.connections = ConnectionManager(self.db_name)
         self.create_tables()
 
+    def close(self):
+        self.connections.close()
+
+    def _read_conn(self):
+        """ Conexão somente leitura da thread atual (ver ConnectionManager). """
+        return self.connections.reader()
+
     def create_tables(self):
         try:
-            self.cursor.execute("CREATE TABLE IF NOT EXISTS laudos_apac (id INTEGER PRIMARY KEY, nome TEXT, tratamento_procedimento TEXT, situacao TEXT, data_saida TEXT, n_apac TEXT, final TEXT, data_importacao DATE)")
-            self.cursor.execute("CREATE TABLE IF NOT EXISTS sessoes_hd (id INTEGER PRIMARY KEY, nome TEXT, hd_normais INTEGER, hd_extras INTEGER, hd_remarcadas INTEGER, data_importacao DATE)")
-            self.cursor.execute("CREATE TABLE IF NOT EXISTS estatistica_mensal (id INTEGER PRIMARY KEY, nome TEXT, dt_entr TEXT, hep_c TEXT, hbsag TEXT, hiv TEXT, alta_amb TEXT, obito TEXT, data_importacao DATE)")
-            self.cursor.execute("CREATE TABLE IF NOT EXISTS eventos_cateter (id INTEGER PRIMARY KEY, data TEXT, acesso TEXT, nome TEXT, evento TEXT, tipo TEXT, localizacao TEXT, convenio TEXT, nao_cobra TEXT, data_importacao DATE)")
-            self.cursor.execute("CREATE TABLE IF NOT EXISTS faturamento_geral (id INTEGER PRIMARY KEY, posicao TEXT, convenio TEXT, data TEXT, cod_prontuario TEXT, nome TEXT, matricula TEXT, numero_guia TEXT, senha_autoriz TEXT, lote TEXT, data_envio TEXT, protocolo TEXT, titulo TEXT, data_inc_titulo TEXT, executante TEXT, tipo_atendimento TEXT, servico_material TEXT, codigo TEXT, grupo TEXT, quant REAL, total REAL, tipo_guia TEXT, programa_tratamento TEXT, tipo_cobranca TEXT, data_importacao DATE)")
-            self.cursor.execute("CREATE TABLE IF NOT EXISTS faturamento_convenio (id INTEGER PRIMARY KEY, posicao TEXT, convenio TEXT, data TEXT, cod_prontuario TEXT, nome TEXT, matricula TEXT, numero_guia TEXT, senha_autoriz TEXT, lote TEXT, data_envio TEXT, protocolo TEXT, titulo TEXT, data_inc_titulo TEXT, executante TEXT, tipo TEXT, servico_material TEXT, codigo TEXT, grupo TEXT, quant REAL, total REAL, tipo_guia TEXT, programa_tratamento TEXT, tipo_apresentacao TEXT, plano TEXT, data_importacao DATE)")
-            self.conn.commit()
+            with self.connections.writer() as conn:
+                create_schema(conn)
         except sqlite3.Error as e:
             print(f"Erro ao criar tabelas: {e}")
 
@@ -36,16 +64,26 @@ class Database:
         if not table_config or not clean_headers:
             raise ValueError(f"Não há configuração para a tabela '{table_name}'.")
 
-        df = pd.read_csv(file_path, sep=';', encoding='latin-1', header=None, skiprows=1, dtype=str)
+        with perf_log.timed('importacao', tabela=table_name, arquivo=os.path.basename(file_path)) as total:
+            imported = self._import_dataframe(file_path, table_name, table_config, clean_headers)
+            total['linhas'] = imported
+        return bool(imported)
+
+    def _import_dataframe(self, file_path, table_name, table_config, clean_headers):
+        """ Etapas de import_from_csv. Retorna o número de linhas gravadas. """
+        with perf_log.timed('importacao.leitura', tabela=table_name) as record:
+            df = pd.read_csv(file_path, sep=';', encoding='latin-1', header=None, skiprows=1, dtype=str)
+            record['linhas'] = len(df)
 
         if len(df.columns) != len(clean_headers):
             raise ValueError(f"O arquivo '{os.path.basename(file_path)}' possui {len(df.columns)} colunas, mas a configuração espera {len(clean_headers)}.")
 
         df.columns = clean_headers
 
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                df[col] = df[col].str.strip()
+        with perf_log.timed('importacao.limpeza', tabela=table_name, linhas=len(df)):
+            for col in df.columns:
+                if df[col].dtype == 'object':
+                    df[col] = df[col].str.strip()
 
         date_format = '%d/%m/%Y %H:%M:%S'
         date_cols = {
@@ -56,14 +94,15 @@ class Database:
             'faturamento_convenio': ['data', 'data_envio', 'data_inc_titulo']
         }
         if table_name in date_cols:
-            for col in date_cols[table_name]:
-                if col in df.columns:
-                    df[col] = pd.to_datetime(df[col], format=date_format, errors='coerce').dt.strftime('%Y-%m-%d %H:%M:%S')
+            with perf_log.timed('importacao.datas', tabela=table_name, linhas=len(df)):
+                for col in date_cols[table_name]:
+                    if col in df.columns:
+                        df[col] = pd.to_datetime(df[col], format=date_format, errors='coerce').dt.strftime('%Y-%m-%d %H:%M:%S')
 
         df.dropna(subset=['nome'], inplace=True)
         df = df[df['nome'] != '']
         if df.empty:
-            return False
+            return 0
 
         final_columns = table_config['final_columns']
         df_final = df[final_columns].copy()
@@ -75,35 +114,151 @@ class Database:
             "faturamento_convenio": ['quant', 'total']
         }
         if table_name in numeric_cols_map:
-            for col in numeric_cols_map[table_name]:
-                if col in df_final.columns:
-                    df_final[col] = df_final[col].astype(str).str.replace(',', '.', regex=False)
-                    df_final[col] = pd.to_numeric(df_final[col], errors='coerce').fillna(0)
-
-        if table_name == 'sessoes_hd':
-            for col in numeric_cols_map[table_name]:
-                df_final[col] = df_final[col].astype(int)
-
-        df_final.to_sql(table_name, self.conn, if_exists='replace', index=False)
-        self.conn.commit()
-        return True
+            with perf_log.timed('importacao.numericos', tabela=table_name, linhas=len(df_final)):
+                for col in numeric_cols_map[table_name]:
+                    if col in df_final.columns:
+                        df_final[col] = df_final[col].astype(str).str.replace(',', '.', regex=False)
+                        df_final[col] = pd.to_numeric(df_final[col], errors='coerce').fillna(0)
+
+                if table_name == 'sessoes_hd':
+                    for col in numeric_cols_map[table_name]:
+                        df_final[col] = df_final[col].astype(int)
+
+        with perf_log.timed('importacao.gravacao', tabela=table_name, linhas=len(df_final)):
+            with self.connections.writer() as conn:
+                df_final.to_sql(table_name, conn, if_exists='replace', index=False)
+                conn.execute(
+                    "INSERT INTO import_log (table_name, data_importacao, linhas) VALUES (?, ?, ?)",
+                    (table_name, df_final['data_importacao'].iloc[0], len(df_final))
+                )
+        return len(df_final)
 
     def get_last_import_info(self, table_name):
         try:
             query = f"SELECT data_importacao, COUNT(*) as linhas FROM {table_name} GROUP BY data_importacao ORDER BY data_importacao DESC LIMIT 1"
-            self.cursor.execute(query)
-            row = self.cursor.fetchone()
+            row = self._read_conn().execute(query).fetchone()
             if row:
                 return {'data_importacao': row[0], 'linhas': row[1]}
         except Exception:
             return None
 
+    def get_import_statuses(self, table_names, include_remarcacoes=False):
+        """
+        Versão em lote de get_last_import_info: uma única consulta retorna a
+        última importação de cada tabela (None se vazia) e, opcionalmente, o
+        total de sessões remarcadas (chave 'remarcacoes_count').
+        Pode ser chamada fora da thread da interface.
+        """
+        known_tables = set(get_table_configs())
+        table_names = [t for t in dict.fromkeys(table_names) if t in known_tables]
+        selects = [
+            f"SELECT ?, data_importacao, COUNT(*) FROM {t} WHERE data_importacao = (SELECT MAX(data_importacao) FROM {t})"
+            for t in table_names
+        ]
+        params = list(table_names)
+        if include_remarcacoes:
+            selects.append("SELECT ?, NULL, COALESCE(SUM(hd_remarcadas), 0) FROM sessoes_hd")
+            params.append('remarcacoes_count')
+
+        result = {'tables': {t: None for t in table_names}}
+        if not selects:
+            return result
+        try:
+            rows = self._read_conn().execute(" UNION ALL ".join(selects), params).fetchall()
+        except sqlite3.Error:
+            return result
+        for key, data_importacao, count in rows:
+            if key == 'remarcacoes_count':
+                result['remarcacoes_count'] = count
+            elif data_importacao is not None:
+                result['tables'][key] = {'data_importacao': data_importacao, 'linhas': count}
+        return result
+
+    def get_import_versions(self, table_names):
+        """
+        Retorna, para cada tabela, uma identificação da importação atual:
+        o id do último registro em import_log mais a data e o número de linhas.
+        Muda sempre que a tabela é reimportada.
+        """
+        versions = {}
+        for table_name in table_names:
+            try:
+                row = self._read_conn().execute("SELECT MAX(id) FROM import_log WHERE table_name = ?", (table_name,)).fetchone()
+                log_id = row[0] if row else None
+            except sqlite3.Error:
+                log_id = None
+            info = self.get_last_import_info(table_name) or {}
+            versions[table_name] = [log_id, info.get('data_importacao'), info.get('linhas')]
+        return versions
+
+    def get_storage_stats(self):
+        """
+        Dados para a página de diagnóstico: tamanho do arquivo do banco (e do
+        WAL), número de linhas e índices de cada tabela, e se a consulta da
+        situação da importação (MAX(data_importacao)) usa algum índice.
+        """
+        wal_path = f"{self.db_name}-wal"
+        stats = {
+            'file_size': os.path.getsize(self.db_name) if os.path.exists(self.db_name) else 0,
+            'wal_size': os.path.getsize(wal_path) if os.path.exists(wal_path) else 0,
+            'journal_mode': self.connections.journal_mode,
+            'tables': [],
+        }
+        conn = self._read_conn()
+        table_names = list(get_table_configs()) + ['import_log']
+        for table_name in table_names:
+            try:
+                rows = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+                indexes = [row[1] for row in conn.execute(f"PRAGMA index_list({table_name})")]
+                plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN SELECT MAX(data_importacao) FROM {table_name}"))
+            except sqlite3.Error:
+                continue
+            stats['tables'].append({
+                'name': table_name,
+                'rows': rows,
+                'indexes': indexes,
+                'status_query_plan': plan,
+                'status_query_uses_index': 'INDEX' in plan.upper(),
+            })
+        return stats
+
+    def run_maintenance(self, action):
+        """
+        Executa uma tarefa de manutenção ('analyze', 'vacuum', 'checkpoint' ou
+        'integrity_check') e retorna uma mensagem com o resultado.
+        """
+        with self.connections.writer() as conn:
+            if action == 'analyze':
+                conn.execute("ANALYZE")
+                conn.execute("PRAGMA optimize")
+                return "Estatísticas do banco atualizadas."
+            if action == 'vacuum':
+                before = os.path.getsize(self.db_name)
+                conn.commit()
+                conn.execute("VACUUM")
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                after = os.path.getsize(self.db_name)
+                return f"Banco compactado: {before / 1024 / 1024:.1f} MB → {after / 1024 / 1024:.1f} MB."
+            if action == 'checkpoint':
+                busy, log_pages, moved_pages = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+                if busy:
+                    return "O WAL não pôde ser totalmente transferido: há leituras em andamento. Tente novamente."
+                return "WAL transferido para o arquivo principal do banco."
+            if action == 'integrity_check':
+                problems = [row[0] for row in conn.execute("PRAGMA quick_check")]
+                if problems == ['ok']:
+                    return "Nenhum problema de integridade encontrado."
+                return "Problemas encontrados:\n" + "\n".join(problems[:20])
+        raise ValueError(f"Tarefa de manutenção desconhecida: '{action}'.")
+
+    @perf_log.timed_call()
     def generate_geral_report_data(self):
         try:
-            df_apac = pd.read_sql_query("SELECT * FROM laudos_apac", self.conn, parse_dates=['data_saida', 'final'])
-            df_estatistica = pd.read_sql_query("SELECT * FROM estatistica_mensal", self.conn, parse_dates=['dt_entr'])
-            df_cateter = pd.read_sql_query("SELECT * FROM eventos_cateter", self.conn)
-            df_faturamento = pd.read_sql_query("SELECT * FROM faturamento_geral", self.conn)
+            conn = self._read_conn()
+            df_apac = pd.read_sql_query("SELECT * FROM laudos_apac", conn, parse_dates=['data_saida', 'final'])
+            df_estatistica = pd.read_sql_query("SELECT * FROM estatistica_mensal", conn, parse_dates=['dt_entr'])
+            df_cateter = pd.read_sql_query("SELECT * FROM eventos_cateter", conn)
+            df_faturamento = pd.read_sql_query("SELECT * FROM faturamento_geral", conn)
         except pd.io.sql.DatabaseError as e:
             raise ValueError(f"Erro ao ler tabelas do banco de dados: {e}. Verifique se todas as fontes de dados foram importadas.")
 
@@ -144,38 +299,40 @@ class Database:
                 return f"{situacao_abbr} {data_br}"
             return ''
         df_final['Saída'] = df_final.apply(format_saida, axis=1)
-        df_final['Entrada'] = df_final['dt_entr'].dt.strftime('%d/%m/%Y')
+        df_final['Entrada'] = df_final['dt_entr']
         df_final.rename(columns={'nome': 'Nome', 'n_apac': 'Nº APAC', 'hd_normais': 'HD', 'hd_extras': 'Extras'}, inplace=True)
         final_cols = ['Nome', 'Nº APAC', 'HD', 'Extras', 'CDL', 'Sorologia', 'Entrada', 'Saída']
         df_final = df_final[final_cols]
         for col in ['HD', 'Extras']:
              df_final[col] = pd.to_numeric(df_final[col], errors='coerce').fillna(0).astype(int)
-        for col in ['CDL', 'Sorologia', 'Entrada', 'Saída']:
+        for col in ['CDL', 'Sorologia', 'Saída']:
             df_final[col] = df_final[col].fillna('')
         return df_final
 
     def get_remarcacoes_count(self):
         try:
             query = "SELECT SUM(hd_remarcadas) FROM sessoes_hd"
-            self.cursor.execute(query)
-            result = self.cursor.fetchone()
+            result = self._read_conn().execute(query).fetchone()
             return result[0] if result and result[0] is not None else 0
         except sqlite3.Error:
             return 0
 
+    @perf_log.timed_call()
     def get_remarcacoes_data(self):
         try:
             query = "SELECT nome, hd_normais, hd_extras, hd_remarcadas FROM sessoes_hd WHERE hd_remarcadas > 0"
-            df = pd.read_sql_query(query, self.conn)
+            df = pd.read_sql_query(query, self._read_conn())
             df.rename(columns={'nome': 'Nome','hd_normais': 'HD Normais','hd_extras': 'HD Extras','hd_remarcadas': 'HD Remarcadas'}, inplace=True)
             return df
         except (sqlite3.Error, pd.io.sql.DatabaseError):
             return pd.DataFrame()
 
+    @perf_log.timed_call()
     def generate_fistulas_report_data(self):
         try:
-            df_eventos = pd.read_sql_query("SELECT * FROM eventos_cateter", self.conn)
-            df_apac = pd.read_sql_query("SELECT nome, n_apac FROM laudos_apac", self.conn)
+            conn = self._read_conn()
+            df_eventos = pd.read_sql_query("SELECT * FROM eventos_cateter", conn)
+            df_apac = pd.read_sql_query("SELECT nome, n_apac FROM laudos_apac", conn)
         except pd.io.sql.DatabaseError as e:
             raise ValueError(f"Erro ao ler as tabelas 'eventos_cateter' ou 'laudos_apac': {e}.")
 
@@ -206,49 +363,82 @@ class Database:
         df_final = df_final.sort_values(by=['Fístula', 'Nome'], ascending=True).reset_index(drop=True)
         return df_final
 
+    @perf_log.timed_call()
     def generate_continuidade_report_data(self, month, year):
         try:
-            df_apac = pd.read_sql_query("SELECT * FROM laudos_apac", self.conn, parse_dates=['final'])
+            df_apac = pd.read_sql_query("SELECT * FROM laudos_apac", self._read_conn(), parse_dates=['final'])
         except pd.io.sql.DatabaseError as e:
             raise ValueError(f"Erro ao ler a tabela 'laudos_apac': {e}.")
 
         end_of_month = pd.Timestamp(year=year, month=month, day=1).to_period('M').to_timestamp('M').normalize()
         df_base = df_apac[df_apac['tratamento_procedimento'].str.contains('Hemodiálise', case=False, na=False) & (df_apac['final'] > end_of_month)].copy()
-        df_base['Final'] = df_base['final'].dt.strftime('%d/%m/%Y')
+        df_base['Final'] = df_base['final']
         df_final = df_base.rename(columns={'nome': 'Nome', 'n_apac': 'Nº APAC'})
         final_cols = ['Nome', 'Nº APAC', 'Final']
         df_final = df_final[final_cols]
         df_final = df_final.sort_values(by='Nome', ascending=True).reset_index(drop=True)
         return df_final
 
+    @staticmethod
+    def _convert_convenio(df):
+        if 'data' in df:
+            df['data'] = pd.to_datetime(df['data'], errors='coerce')
+        df['quant'] = pd.to_numeric(df['quant'], errors='coerce').fillna(0)
+        df['total'] = pd.to_numeric(df['total'], errors='coerce').fillna(0)
+        return df
+
     def _get_raw_convenio_data(self):
         try:
-            df = pd.read_sql_query("SELECT * FROM faturamento_convenio", self.conn)
+            df = pd.read_sql_query("SELECT * FROM faturamento_convenio", self._read_conn())
             if df.empty:
                 return pd.DataFrame()
-            df['data'] = pd.to_datetime(df['data'], errors='coerce')
-            df['quant'] = pd.to_numeric(df['quant'], errors='coerce').fillna(0)
-            df['total'] = pd.to_numeric(df['total'], errors='coerce').fillna(0)
-            return df
+            return self._convert_convenio(df)
         except (pd.io.sql.DatabaseError, sqlite3.Error) as e:
             raise ValueError(f"Erro ao ler a tabela 'faturamento_convenio': {e}. Verifique se a fonte de dados foi importada.")
 
-    def generate_convenio_geral_data(self):
-        df = self._get_raw_convenio_data()
-        if df.empty:
+    def _iter_convenio_chunks(self, columns, chunk_rows):
+        """ faturamento_convenio em blocos de chunk_rows linhas, na ordem da tabela e convertidos como em _get_raw_convenio_data. """
+        try:
+            for df in pd.read_sql_query(f"SELECT {', '.join(columns)} FROM faturamento_convenio", self._read_conn(), chunksize=chunk_rows):
+                if not df.empty:
+                    yield self._convert_convenio(df)
+        except (pd.io.sql.DatabaseError, sqlite3.Error) as e:
+            raise ValueError(f"Erro ao ler a tabela 'faturamento_convenio': {e}. Verifique se a fonte de dados foi importada.")
+
+    def _aggregate_convenio_chunks(self, chunk_rows):
+        """
+        Agregados por guia (CONVENIO_GUIDE_AGGREGATES) lendo a tabela em
+        blocos: cada bloco é agregado e juntado aos agregados anteriores,
+        que vêm primeiro, para que o 'first' continue sendo o da primeira
+        linha preenchida. Só os agregados e um bloco ficam na memória.
+        Retorna None se a tabela estiver vazia.
+        """
+        columns = ['numero_guia'] + list(dict.fromkeys(column for column, _ in CONVENIO_GUIDE_AGGREGATES.values()))
+        functions = {name: function for name, (_, function) in CONVENIO_GUIDE_AGGREGATES.items()}
+        agg_df = None
+        for df in self._iter_convenio_chunks(columns, chunk_rows):
+            partial = df.groupby('numero_guia').agg(**CONVENIO_GUIDE_AGGREGATES)
+            agg_df = partial if agg_df is None else pd.concat([agg_df, partial]).groupby(level=0).agg(functions)
+        return agg_df
+
+    @perf_log.timed_call()
+    def generate_convenio_geral_data(self, chunk_rows=None):
+        """
+        Uma linha por guia do faturamento de convênio. Com chunk_rows (padrão
+        CONVENIO_CHUNK_ROWS; 0 lê a tabela inteira), a tabela é lida em blocos
+        desse número de linhas e a memória usada depende do número de guias,
+        não do número de linhas.
+        """
+        chunk_rows = CONVENIO_CHUNK_ROWS if chunk_rows is None else chunk_rows
+        if chunk_rows:
+            agg_df = self._aggregate_convenio_chunks(chunk_rows)
+        else:
+            df = self._get_raw_convenio_data()
+            agg_df = None if df.empty else df.groupby('numero_guia').agg(**CONVENIO_GUIDE_AGGREGATES)
+        if agg_df is None:
             return pd.DataFrame()
 
-        agg_df = df.groupby('numero_guia').agg(
-            nome=('nome', 'first'),
-            matricula=('matricula', 'first'),
-            lote=('lote', 'first'),
-            programa_tratamento=('programa_tratamento', 'first'),
-            plano=('plano', 'first'),
-            quant=('quant', 'sum'),
-            total=('total', 'sum'),
-            data_inicio=('data', 'min'),
-            data_final=('data', 'max')
-        ).reset_index()
+        agg_df = agg_df.reset_index()
 
         agg_df.rename(columns={
             'nome': 'Nome',
@@ -264,9 +454,7 @@ class Database:
         }, inplace=True)
 
         agg_df = agg_df.sort_values(by='Nome', ascending=True).reset_index(drop=True)
-        agg_df['Total'] = agg_df['Total'].apply(lambda x: f"R$ {x:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
-        agg_df['Data Início'] = agg_df['Data Início'].dt.strftime('%d/%m/%Y')
-        agg_df['Data Final'] = agg_df['Data Final'].dt.strftime('%d/%m/%Y')
+        agg_df['Total'] = agg_df['Total'].round(2)
 
         final_columns_order = [
             'Nome', 'Matrícula', 'Número da Guia', 'Lote', 'Quant.',
@@ -275,23 +463,52 @@ class Database:
 
         return agg_df[final_columns_order]
 
-    def calculate_convenio_summary(self):
-        df = self._get_raw_convenio_data()
-        if df.empty:
+    def get_convenio_totals(self, chunk_rows=None):
+        """
+        Totais do faturamento de convênio sem formatação ({} sem dados):
+        guias, sessoes, sessoes_hd, sessoes_hdf e valor (float). chunk_rows
+        como em generate_convenio_geral_data.
+        """
+        chunk_rows = CONVENIO_CHUNK_ROWS if chunk_rows is None else chunk_rows
+        if chunk_rows:
+            chunks = self._iter_convenio_chunks(['numero_guia', 'programa_tratamento', 'quant', 'total'], chunk_rows)
+        else:
+            chunks = [self._get_raw_convenio_data()]
+
+        guides = set()
+        sessions = sessions_hd = sessions_hdf = value = 0
+        rows = 0
+        for df in chunks:
+            if df.empty:
+                continue
+            rows += len(df)
+            programa_str = df['programa_tratamento'].astype(str).str.upper()
+            guides.update(df['numero_guia'].dropna().unique())
+            sessions += df['quant'].sum()
+            sessions_hd += df[programa_str.str.contains("HEMODIÁLISE", na=False)]['quant'].sum()
+            sessions_hdf += df[programa_str.str.contains("HEMODIAFILTRA", na=False)]['quant'].sum()
+            value += df['total'].sum()
+        if not rows:
             return {}
 
-        qtd_guias = df['numero_guia'].nunique()
-        total_sessoes = df['quant'].sum()
-        valor_total = df['total'].sum()
+        return {
+            'guias': len(guides),
+            'sessoes': int(sessions),
+            'sessoes_hd': int(sessions_hd),
+            'sessoes_hdf': int(sessions_hdf),
+            'valor': float(value),
+        }
 
-        programa_str = df['programa_tratamento'].astype(str).str.upper()
-        qtd_hd = df[programa_str.str.contains("HEMODIÁLISE", na=False)]['quant'].sum()
-        qtd_hdf = df[programa_str.str.contains("HEMODIAFILTRA", na=False)]['quant'].sum()
+    @perf_log.timed_call()
+    def calculate_convenio_summary(self):
+        totals = self.get_convenio_totals()
+        if not totals:
+            return {}
 
         return {
-            "Quantidade de Guias": int(qtd_guias),
-            "Quantidade Total de Sessões": int(total_sessoes),
-            "Quantidade de Sessões HD": int(qtd_hd),
-            "Quantidade de Sessões HDF": int(qtd_hdf),
-            "Valor Total": f"R$ {valor_total:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+            "Quantidade de Guias": totals['guias'],
+            "Quantidade Total de Sessões": totals['sessoes'],
+            "Quantidade de Sessões HD": totals['sessoes_hd'],
+            "Quantidade de Sessões HDF": totals['sessoes_hdf'],
+            "Valor Total": format_brl(totals['valor'])
         }
\ No newline at end of file
@@ -0,0 +1,138 @@
+# core/diagnostics.py
+"""
+Dados da página de diagnóstico (Configurações): resumo das importações e
+exportações registradas no log de desempenho, estatísticas do banco e
+tarefas de manutenção, executados fora da thread da interface.
+"""
+
+import os
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, Signal, Slot
+
+from core import perf_log
+from core.render_cache import RenderCache, cache_dir_for
+
+# Operações do log resumidas na página: operação -> (tipo exibido, campo com o nome).
+RUN_OPERATIONS = {
+    'importacao': ('Importação', 'tabela'),
+    'relatorio.export': ('Exportação', 'relatorio'),
+    'fechamento': ('Fechamento', 'clinica'),
+}
+
+MAINTENANCE_ACTIONS = ('analyze', 'vacuum', 'checkpoint', 'integrity_check', 'clear_render_cache')
+
+def summarize_runs(records: list, recent: int = 10) -> list:
+    """
+    Agrupa os registros de importação (por tabela) e de exportação (por
+    relatório, formato e clínica). Para cada grupo retorna a última execução,
+    a média das `recent` últimas e a vazão em linhas por segundo. Execuções
+    com erro ou servidas pelo cache de relatórios ficam de fora.
+    Ordenado da execução mais recente para a mais antiga.
+    """
+    groups = {}
+    for record in records:
+        kind = RUN_OPERATIONS.get(record.get('operacao'))
+        if kind is None or record.get('erro') or record.get('cache'):
+            continue
+        label, name_field = kind
+        key = (label, record.get(name_field) or '', record.get('formato') or '', record.get('clinica') or '')
+        groups.setdefault(key, []).append(record)
+
+    runs = []
+    for (label, name, file_format, clinic), items in groups.items():
+        last = items[-1]
+        durations = [item.get('duracao_ms') or 0 for item in items[-recent:]]
+        rows = last.get('linhas') or 0
+        duration_ms = last.get('duracao_ms') or 0
+        runs.append({
+            'kind': label,
+            'name': name,
+            'format': file_format,
+            'clinic': clinic,
+            'last_run': last.get('inicio', ''),
+            'duration_ms': duration_ms,
+            'average_ms': sum(durations) / len(durations),
+            'runs': len(items),
+            'rows': rows,
+            'rows_per_second': rows / (duration_ms / 1000) if duration_ms > 0 and rows else None,
+            'peak_mb': last.get('memoria_pico_mb'),
+        })
+    runs.sort(key=lambda run: run['last_run'], reverse=True)
+    return runs
+
+class DiagnosticsSignals(QObject):
+    finished = Signal(object, str)
+
+class DiagnosticsJob(QRunnable):
+    """
+    Lê o log de desempenho e as estatísticas do banco. finished(resultado,
+    erro) entrega um dicionário com 'runs' (summarize_runs), 'storage'
+    (Database.get_storage_stats), 'render_cache_size' e 'log_records'.
+    Sem banco (None), 'storage' é None e o cache conta como vazio.
+    """
+    def __init__(self, db):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.db = db
+        self.signals = DiagnosticsSignals()
+        self._done_event = threading.Event()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._done_event.wait(timeout)
+
+    @Slot()
+    def run(self):
+        try:
+            from core.reports import REPORT_REGISTRY
+            report_names = {report_class.__name__: name for name, report_class in REPORT_REGISTRY.items()}
+            records = perf_log.read_records()
+            runs = summarize_runs(records)
+            for run in runs:
+                if run['kind'] == 'Exportação':
+                    run['name'] = report_names.get(run['name'], run['name'])
+            cache_dir = cache_dir_for(self.db.db_name) if self.db is not None else None
+            result = {
+                'runs': runs,
+                'storage': self.db.get_storage_stats() if self.db is not None else None,
+                'render_cache_size': RenderCache(cache_dir).size() if cache_dir and os.path.isdir(cache_dir) else 0,
+                'log_records': len(records),
+            }
+            self.signals.finished.emit(result, "")
+        except Exception as e:
+            self.signals.finished.emit(None, str(e))
+        finally:
+            self._done_event.set()
+
+class MaintenanceJob(QRunnable):
+    """
+    Executa uma das MAINTENANCE_ACTIONS. finished(mensagem, erro) entrega a
+    mensagem de Database.run_maintenance (ou da limpeza do cache).
+    """
+    def __init__(self, db, action: str):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.db = db
+        self.action = action
+        self.signals = DiagnosticsSignals()
+        self._done_event = threading.Event()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._done_event.wait(timeout)
+
+    @Slot()
+    def run(self):
+        try:
+            if self.action == 'clear_render_cache':
+                cache = RenderCache(cache_dir_for(self.db.db_name))
+                freed = cache.size()
+                cache.clear()
+                message = f"Cache de relatórios limpo ({freed / 1024 / 1024:.1f} MB liberados)."
+            else:
+                with perf_log.timed(f"manutencao.{self.action}"):
+                    message = self.db.run_maintenance(self.action)
+            self.signals.finished.emit(message, "")
+        except Exception as e:
+            self.signals.finished.emit(None, str(e))
+        finally:
+            self._done_event.set()
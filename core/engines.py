@@ -0,0 +1,476 @@
+# core/engines.py
+"""
+Motores de consulta alternativos para os dados dos relatórios.
+
+Um motor recebe o Database e expõe os mesmos métodos de consulta
+(ENGINE_METHODS). Os métodos que ele não implementa são delegados ao
+Database, então um motor pode ser passado no lugar do banco para qualquer
+relatório de REPORT_REGISTRY. O motor 'referencia' é o próprio Database;
+os demais só devem ser usados depois de conferidos com
+benchmarks/equivalence.py, que compara as saídas célula a célula.
+
+O motor usado pelos relatórios vem de QUERY_ENGINE (config.py); ver
+engine_for.
+"""
+
+import os
+from importlib.util import find_spec
+
+import numpy as np
+import pandas as pd
+
+from config import QUERY_ENGINE
+from core import perf_log
+from core.database import Database
+from core.utils import format_brl
+
+# Opcional: o motor 'duckdb' só fica disponível com o pacote duckdb.
+DUCKDB_AVAILABLE = find_spec('duckdb') is not None
+
+# Consultas que os motores podem substituir: nome -> argumentos extras (mês, ano).
+ENGINE_METHODS = {
+    'generate_geral_report_data': False,
+    'generate_fistulas_report_data': False,
+    'generate_continuidade_report_data': True,
+    'generate_convenio_geral_data': False,
+    'calculate_convenio_summary': False,
+}
+
+SAIDA_ABBREVIATIONS = {"Transferência de centro": "Transf.", "Transplante": "Transp."}
+
+class QueryEngine:
+    """ Motor de referência: todas as consultas vêm do Database. """
+    name = 'referencia'
+
+    def __init__(self, db):
+        self.db = db
+
+    def __getattr__(self, attribute):
+        return getattr(self.db, attribute)
+
+def _contains(series: pd.Series, text: str) -> pd.Series:
+    return series.str.contains(text, case=False, regex=False, na=False)
+
+def _empty_text(index) -> pd.Series:
+    """ Textos vazios com o tipo que DataFrame.apply dá na referência (object quando não há linhas). """
+    return pd.Series('', index=index, dtype=object if len(index) == 0 else None)
+
+class VectorizedEngine(QueryEngine):
+    """
+    Mesmas regras do Database, lendo só as colunas usadas e trocando os
+    apply(axis=1) (sorologia, saída, classificação dos procedimentos) por
+    operações vetorizadas.
+    """
+    name = 'vetorizado'
+
+    @perf_log.timed_call()
+    def generate_geral_report_data(self):
+        try:
+            conn = self.db._read_conn()
+            df_apac = pd.read_sql_query("SELECT nome, tratamento_procedimento, situacao, data_saida, n_apac FROM laudos_apac", conn, parse_dates=['data_saida'])
+            df_estatistica = pd.read_sql_query("SELECT nome, dt_entr, hep_c, hbsag, hiv FROM estatistica_mensal", conn, parse_dates=['dt_entr'])
+            df_cateter = pd.read_sql_query("SELECT nome, evento, tipo, convenio, nao_cobra FROM eventos_cateter", conn)
+            df_faturamento = pd.read_sql_query("SELECT convenio, nome, numero_guia, servico_material, grupo, quant FROM faturamento_geral", conn)
+        except pd.io.sql.DatabaseError as e:
+            raise ValueError(f"Erro ao ler tabelas do banco de dados: {e}. Verifique se todas as fontes de dados foram importadas.")
+
+        df_faturamento_sus = df_faturamento[df_faturamento['convenio'].str.upper() == 'SUS']
+        df_faturamento_unique = df_faturamento_sus.drop_duplicates(subset=['nome', 'numero_guia', 'servico_material'], keep='first')
+        df_hemodialise = df_faturamento_unique[_contains(df_faturamento_unique['grupo'], 'Hemodiálise')]
+        is_hd = _contains(df_hemodialise['servico_material'], 'HEMODIÁLISE')
+        is_extra = _contains(df_hemodialise['servico_material'], 'EXTRA')
+        sessoes_normais = df_hemodialise[is_hd & ~is_extra].groupby(['nome', 'numero_guia'])['quant'].sum().reset_index().rename(columns={'quant': 'hd_normais'})
+        sessoes_extras = df_hemodialise[is_hd & is_extra].groupby(['nome', 'numero_guia'])['quant'].sum().reset_index().rename(columns={'quant': 'hd_extras'})
+        df_sessoes_calculado = pd.merge(sessoes_normais, sessoes_extras, on=['nome', 'numero_guia'], how='outer').fillna(0)
+        df_base = df_apac[_contains(df_apac['tratamento_procedimento'], 'Hemodiálise')].copy()
+
+        cdl_mask = (
+            (df_cateter['evento'].str.lower() == 'colocação') & (df_cateter['tipo'].str.lower() == 'duplo lumen hd')
+            & (df_cateter['convenio'].str.lower() == 'sus') & (pd.isna(df_cateter['nao_cobra']) | (df_cateter['nao_cobra'] == ''))
+        )
+        df_cdl = df_cateter.loc[cdl_mask, ['nome']].drop_duplicates(subset=['nome'])
+        df_cdl['CDL'] = 'CDL'
+
+        sorologia = _empty_text(df_estatistica.index)
+        for column, label in (('hbsag', 'HBV'), ('hep_c', 'HCV'), ('hiv', 'HIV')):
+            reagent = df_estatistica[column].astype(object).map(str).str.lower().str.contains('reag', regex=False)
+            sorologia = sorologia.where(~reagent, sorologia.where(sorologia == '', sorologia + ', ') + label)
+        df_estatistica['Sorologia'] = sorologia
+        df_estatistica_final = df_estatistica[['nome', 'dt_entr', 'Sorologia']].sort_values('dt_entr').drop_duplicates(subset=['nome'], keep='last')
+
+        df_base['n_apac'] = df_base['n_apac'].astype(str)
+        df_sessoes_calculado['numero_guia'] = df_sessoes_calculado['numero_guia'].astype(str)
+        df_final = pd.merge(df_base[['nome', 'n_apac', 'situacao', 'data_saida']], df_sessoes_calculado, left_on=['nome', 'n_apac'], right_on=['nome', 'numero_guia'], how='left')
+        df_final = pd.merge(df_final, df_estatistica_final, on='nome', how='left')
+        df_final = pd.merge(df_final, df_cdl, on='nome', how='left')
+
+        saida = _empty_text(df_final.index)
+        has_saida = df_final['data_saida'].notna()
+        if has_saida.any():
+            situacao = df_final.loc[has_saida, 'situacao'].astype(object).map(lambda value: SAIDA_ABBREVIATIONS.get(str(value), str(value)))
+            saida[has_saida] = situacao + ' ' + df_final.loc[has_saida, 'data_saida'].dt.strftime('%d/%m/%Y')
+        df_final['Saída'] = saida
+        df_final['Entrada'] = df_final['dt_entr']
+        df_final.rename(columns={'nome': 'Nome', 'n_apac': 'Nº APAC', 'hd_normais': 'HD', 'hd_extras': 'Extras'}, inplace=True)
+        df_final = df_final[['Nome', 'Nº APAC', 'HD', 'Extras', 'CDL', 'Sorologia', 'Entrada', 'Saída']]
+        for col in ['HD', 'Extras']:
+            df_final[col] = pd.to_numeric(df_final[col], errors='coerce').fillna(0).astype(int)
+        for col in ['CDL', 'Sorologia', 'Saída']:
+            df_final[col] = df_final[col].fillna('')
+        return df_final
+
+    @perf_log.timed_call()
+    def generate_fistulas_report_data(self):
+        try:
+            conn = self.db._read_conn()
+            df_eventos = pd.read_sql_query("SELECT nome, evento, tipo, acesso, convenio, nao_cobra FROM eventos_cateter", conn)
+            df_apac = pd.read_sql_query("SELECT nome, n_apac FROM laudos_apac", conn)
+        except pd.io.sql.DatabaseError as e:
+            raise ValueError(f"Erro ao ler as tabelas 'eventos_cateter' ou 'laudos_apac': {e}.")
+
+        df_apac_unique = df_apac.drop_duplicates(subset=['nome'], keep='last')
+
+        evento = df_eventos['evento'].str.lower()
+        tipo = df_eventos['tipo'].str.lower()
+        acesso = df_eventos['acesso'].str.lower()
+        billable = (df_eventos['convenio'].str.lower() == 'sus') & (pd.isna(df_eventos['nao_cobra']) | (df_eventos['nao_cobra'] == ''))
+        has = lambda series, text: series.str.contains(text, regex=False, na=False)
+        # Mesma ordem de prioridade de Database.generate_fistulas_report_data.
+        classification = np.select([
+            billable & has(evento, 'colocação') & has(tipo, 'longa perm. hd'),
+            billable & has(evento, 'fechamento') & has(tipo, 'autógena'),
+            billable & has(evento, 'retirada') & has(acesso, 'cateter') & has(tipo, 'longa perm. hd'),
+            billable & has(evento, 'confecção') & has(tipo, 'autógena'),
+            billable & has(evento, 'confecção') & has(tipo, 'heteróloga'),
+            billable & has(evento, 'intervenção'),
+        ], ['Permcath', 'Fechamento', 'Retirada', 'Fístula', 'Prótese', 'Intervenção'], default='Outro')
+
+        df_eventos['Fístula'] = classification
+        df_eventos_filtrado = df_eventos.loc[classification != 'Outro', ['nome', 'Fístula']]
+        df_merged = pd.merge(df_eventos_filtrado, df_apac_unique, on='nome', how='left')
+        df_merged.rename(columns={'nome': 'Nome', 'n_apac': 'Nº APAC'}, inplace=True)
+        df_final = df_merged[['Nome', 'Nº APAC', 'Fístula']]
+        return df_final.sort_values(by=['Fístula', 'Nome'], ascending=True).reset_index(drop=True)
+
+    @perf_log.timed_call()
+    def generate_continuidade_report_data(self, month, year):
+        try:
+            df_apac = pd.read_sql_query("SELECT nome, n_apac, tratamento_procedimento, final FROM laudos_apac", self.db._read_conn(), parse_dates=['final'])
+        except pd.io.sql.DatabaseError as e:
+            raise ValueError(f"Erro ao ler a tabela 'laudos_apac': {e}.")
+
+        end_of_month = pd.Timestamp(year=year, month=month, day=1).to_period('M').to_timestamp('M').normalize()
+        mask = _contains(df_apac['tratamento_procedimento'], 'Hemodiálise') & (df_apac['final'] > end_of_month)
+        df_final = df_apac.loc[mask, ['nome', 'n_apac', 'final']].rename(columns={'nome': 'Nome', 'n_apac': 'Nº APAC', 'final': 'Final'})
+        return df_final.sort_values(by='Nome', ascending=True).reset_index(drop=True)
+
+    def _read_convenio(self, columns: list) -> pd.DataFrame:
+        try:
+            df = pd.read_sql_query(f"SELECT {', '.join(columns)} FROM faturamento_convenio", self.db._read_conn())
+        except pd.io.sql.DatabaseError as e:
+            raise ValueError(f"Erro ao ler a tabela 'faturamento_convenio': {e}. Verifique se a fonte de dados foi importada.")
+        if 'data' in df:
+            df['data'] = pd.to_datetime(df['data'], errors='coerce')
+        df['quant'] = pd.to_numeric(df['quant'], errors='coerce').fillna(0)
+        df['total'] = pd.to_numeric(df['total'], errors='coerce').fillna(0)
+        return df
+
+    @perf_log.timed_call()
+    def generate_convenio_geral_data(self):
+        df = self._read_convenio(['numero_guia', 'nome', 'matricula', 'lote', 'programa_tratamento', 'plano', 'quant', 'total', 'data'])
+        if df.empty:
+            return pd.DataFrame()
+
+        agg_df = df.groupby('numero_guia').agg(
+            nome=('nome', 'first'),
+            matricula=('matricula', 'first'),
+            lote=('lote', 'first'),
+            programa_tratamento=('programa_tratamento', 'first'),
+            plano=('plano', 'first'),
+            quant=('quant', 'sum'),
+            total=('total', 'sum'),
+            data_inicio=('data', 'min'),
+            data_final=('data', 'max')
+        ).reset_index()
+        agg_df.rename(columns={
+            'nome': 'Nome', 'numero_guia': 'Número da Guia', 'matricula': 'Matrícula', 'lote': 'Lote',
+            'programa_tratamento': 'Programa Tratamento', 'plano': 'Plano', 'quant': 'Quant.', 'total': 'Total',
+            'data_inicio': 'Data Início', 'data_final': 'Data Final'
+        }, inplace=True)
+        agg_df = agg_df.sort_values(by='Nome', ascending=True).reset_index(drop=True)
+        agg_df['Total'] = agg_df['Total'].round(2)
+        return agg_df[['Nome', 'Matrícula', 'Número da Guia', 'Lote', 'Quant.', 'Programa Tratamento', 'Plano', 'Total', 'Data Início', 'Data Final']]
+
+    @perf_log.timed_call()
+    def calculate_convenio_summary(self):
+        df = self._read_convenio(['numero_guia', 'programa_tratamento', 'quant', 'total'])
+        if df.empty:
+            return {}
+
+        programa_str = df['programa_tratamento'].astype(str).str.upper()
+        return {
+            "Quantidade de Guias": int(df['numero_guia'].nunique()),
+            "Quantidade Total de Sessões": int(df['quant'].sum()),
+            "Quantidade de Sessões HD": int(df.loc[programa_str.str.contains("HEMODIÁLISE", na=False), 'quant'].sum()),
+            "Quantidade de Sessões HDF": int(df.loc[programa_str.str.contains("HEMODIAFILTRA", na=False), 'quant'].sum()),
+            "Valor Total": format_brl(df['total'].sum())
+        }
+
+# Colunas numéricas lidas pelo DuckDBEngine (as demais são texto).
+NUMERIC_COLUMNS = ('quant', 'total')
+
+class DuckDBEngine(QueryEngine):
+    """
+    Mesmas regras do Database escritas em SQL e executadas no DuckDB, um
+    banco colunar embutido. Uma competência arquivada (core.archive) é lida
+    direto dos arquivos Parquet. Do SQLite, as colunas usadas são lidas e
+    entregues ao DuckDB como DataFrames: a extensão que lê o SQLite é
+    baixada pelo DuckDB na primeira vez, o que não serve para o executável
+    instalado sem internet.
+
+    As linhas saem do SQL na ordem em que o pandas as teria antes da
+    ordenação final, que é feita com o mesmo sort_values do Database, para
+    que os empates fiquem na mesma ordem.
+    """
+    name = 'duckdb'
+
+    def __init__(self, db):
+        if not DUCKDB_AVAILABLE:
+            raise ValueError("O motor de consulta 'duckdb' precisa do pacote 'duckdb'.")
+        super().__init__(db)
+
+    def _connect(self, tables: dict):
+        """
+        Conexão do DuckDB com uma view por tabela de tables ({tabela:
+        colunas}), mais a coluna _row com a ordem das linhas no banco.
+        """
+        import duckdb
+
+        conn = duckdb.connect()
+        try:
+            archive_dir = getattr(self.db, 'archive_dir', None)
+            for table_name, columns in tables.items():
+                if archive_dir:
+                    path = os.path.join(archive_dir, f"{table_name}.parquet").replace("'", "''")
+                    source, row = f"read_parquet('{path}', file_row_number = true)", 'file_row_number'
+                else:
+                    df = pd.read_sql_query(f"SELECT rowid AS _row, {', '.join(columns)} FROM {table_name}", self.db._read_conn())
+                    for column in NUMERIC_COLUMNS:
+                        if column in df:
+                            df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0)
+                    conn.register(f"_{table_name}", df)
+                    source, row = f"_{table_name}", '_row'
+                selected = [
+                    f"COALESCE({column}, 0) AS {column}" if column in NUMERIC_COLUMNS else f"CAST({column} AS VARCHAR) AS {column}"
+                    for column in columns
+                ]
+                conn.execute(f"CREATE VIEW {table_name} AS SELECT {row} AS _row, {', '.join(selected)} FROM {source}")
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def _query(self, sql: str, tables: dict, error: str, params: list = None, typed_from: str = None) -> pd.DataFrame:
+        """
+        Executa sql sobre as tabelas de tables. Com typed_from, as colunas
+        de NUMERIC_COLUMNS que são inteiras nessa tabela também voltam
+        inteiras no resultado, como no pandas (a soma do DuckDB não mantém o
+        tipo).
+        """
+        import duckdb
+
+        conn = None
+        try:
+            conn = self._connect(tables)
+            df = conn.execute(sql, params or []).df()
+            if typed_from:
+                dtypes = conn.execute(f"SELECT * FROM {typed_from} LIMIT 0").df().dtypes
+                for column in NUMERIC_COLUMNS:
+                    if column in df and pd.api.types.is_integer_dtype(dtypes[column]):
+                        df[column] = df[column].astype('int64')
+            return df
+        except (pd.io.sql.DatabaseError, duckdb.Error) as e:
+            raise ValueError(error.format(e=e))
+        finally:
+            if conn is not None:
+                conn.close()
+
+    @perf_log.timed_call()
+    def generate_geral_report_data(self):
+        df = self._query("""
+            WITH faturamento AS (
+                SELECT nome, numero_guia, servico_material, grupo, quant,
+                       ROW_NUMBER() OVER (PARTITION BY nome, numero_guia, servico_material ORDER BY _row) AS ordem
+                FROM faturamento_geral
+                WHERE upper(convenio) = 'SUS'
+            ), sessoes AS (
+                SELECT nome, numero_guia,
+                       COALESCE(SUM(quant) FILTER (WHERE NOT contains(lower(servico_material), 'extra')), 0) AS hd_normais,
+                       COALESCE(SUM(quant) FILTER (WHERE contains(lower(servico_material), 'extra')), 0) AS hd_extras
+                FROM faturamento
+                WHERE ordem = 1 AND contains(lower(grupo), 'hemodiálise') AND contains(lower(servico_material), 'hemodiálise')
+                      AND nome IS NOT NULL AND numero_guia IS NOT NULL
+                GROUP BY nome, numero_guia
+            ), estatistica AS (
+                SELECT nome, dt_entr, sorologia FROM (
+                    SELECT nome, TRY_CAST(dt_entr AS TIMESTAMP) AS dt_entr,
+                           concat_ws(', ',
+                               CASE WHEN contains(lower(hbsag), 'reag') THEN 'HBV' END,
+                               CASE WHEN contains(lower(hep_c), 'reag') THEN 'HCV' END,
+                               CASE WHEN contains(lower(hiv), 'reag') THEN 'HIV' END) AS sorologia,
+                           ROW_NUMBER() OVER (PARTITION BY nome ORDER BY TRY_CAST(dt_entr AS TIMESTAMP) DESC NULLS FIRST, _row DESC) AS ordem
+                    FROM estatistica_mensal
+                ) WHERE ordem = 1
+            ), cdl AS (
+                SELECT DISTINCT nome, 'CDL' AS cdl
+                FROM eventos_cateter
+                WHERE lower(evento) = 'colocação' AND lower(tipo) = 'duplo lumen hd' AND lower(convenio) = 'sus'
+                      AND (nao_cobra IS NULL OR nao_cobra = '')
+            ), apac AS (
+                SELECT _row, nome, n_apac, situacao, TRY_CAST(data_saida AS TIMESTAMP) AS data_saida
+                FROM laudos_apac
+                WHERE contains(lower(tratamento_procedimento), 'hemodiálise')
+            )
+            SELECT apac.nome AS "Nome", apac.n_apac AS "Nº APAC", sessoes.hd_normais AS "HD", sessoes.hd_extras AS "Extras",
+                   cdl.cdl AS "CDL", estatistica.sorologia AS "Sorologia", estatistica.dt_entr AS "Entrada",
+                   CASE WHEN apac.data_saida IS NULL THEN ''
+                        ELSE CASE apac.situacao WHEN 'Transferência de centro' THEN 'Transf.' WHEN 'Transplante' THEN 'Transp.' ELSE COALESCE(apac.situacao, 'None') END
+                             || ' ' || strftime(apac.data_saida, '%d/%m/%Y')
+                   END AS "Saída"
+            FROM apac
+            LEFT JOIN sessoes ON sessoes.nome = apac.nome AND sessoes.numero_guia = apac.n_apac
+            LEFT JOIN estatistica ON estatistica.nome = apac.nome
+            LEFT JOIN cdl ON cdl.nome = apac.nome
+            ORDER BY apac._row
+        """, {
+            'laudos_apac': ['nome', 'tratamento_procedimento', 'situacao', 'data_saida', 'n_apac'],
+            'estatistica_mensal': ['nome', 'dt_entr', 'hep_c', 'hbsag', 'hiv'],
+            'eventos_cateter': ['nome', 'evento', 'tipo', 'convenio', 'nao_cobra'],
+            'faturamento_geral': ['convenio', 'nome', 'numero_guia', 'servico_material', 'grupo', 'quant'],
+        }, "Erro ao ler tabelas do banco de dados: {e}. Verifique se todas as fontes de dados foram importadas.")
+
+        df['Nº APAC'] = df['Nº APAC'].astype(str)
+        for col in ['HD', 'Extras']:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
+        for col in ['CDL', 'Sorologia', 'Saída']:
+            df[col] = df[col].fillna('')
+        return df
+
+    @perf_log.timed_call()
+    def generate_fistulas_report_data(self):
+        df = self._query("""
+            WITH eventos AS (
+                SELECT _row, nome, lower(evento) AS evento, lower(tipo) AS tipo, lower(acesso) AS acesso,
+                       lower(convenio) = 'sus' AND (nao_cobra IS NULL OR nao_cobra = '') AS billable
+                FROM eventos_cateter
+            ), classificados AS (
+                SELECT _row, nome,
+                       CASE WHEN billable IS NOT TRUE THEN 'Outro'
+                            WHEN contains(evento, 'colocação') AND contains(tipo, 'longa perm. hd') THEN 'Permcath'
+                            WHEN contains(evento, 'fechamento') AND contains(tipo, 'autógena') THEN 'Fechamento'
+                            WHEN contains(evento, 'retirada') AND contains(acesso, 'cateter') AND contains(tipo, 'longa perm. hd') THEN 'Retirada'
+                            WHEN contains(evento, 'confecção') AND contains(tipo, 'autógena') THEN 'Fístula'
+                            WHEN contains(evento, 'confecção') AND contains(tipo, 'heteróloga') THEN 'Prótese'
+                            WHEN contains(evento, 'intervenção') THEN 'Intervenção'
+                            ELSE 'Outro'
+                       END AS fistula
+                FROM eventos
+            ), apac AS (
+                SELECT nome, n_apac FROM (
+                    SELECT nome, n_apac, ROW_NUMBER() OVER (PARTITION BY nome ORDER BY _row DESC) AS ordem FROM laudos_apac
+                ) WHERE ordem = 1
+            )
+            SELECT classificados.nome AS "Nome", apac.n_apac AS "Nº APAC", classificados.fistula AS "Fístula"
+            FROM classificados
+            LEFT JOIN apac ON apac.nome = classificados.nome
+            WHERE classificados.fistula <> 'Outro'
+            ORDER BY classificados._row
+        """, {
+            'eventos_cateter': ['nome', 'evento', 'tipo', 'acesso', 'convenio', 'nao_cobra'],
+            'laudos_apac': ['nome', 'n_apac'],
+        }, "Erro ao ler as tabelas 'eventos_cateter' ou 'laudos_apac': {e}.")
+        return df.sort_values(by=['Fístula', 'Nome'], ascending=True).reset_index(drop=True)
+
+    @perf_log.timed_call()
+    def generate_continuidade_report_data(self, month, year):
+        end_of_month = pd.Timestamp(year=year, month=month, day=1).to_period('M').to_timestamp('M').normalize()
+        df = self._query("""
+            SELECT nome AS "Nome", n_apac AS "Nº APAC", TRY_CAST(final AS TIMESTAMP) AS "Final"
+            FROM laudos_apac
+            WHERE contains(lower(tratamento_procedimento), 'hemodiálise') AND TRY_CAST(final AS TIMESTAMP) > ?
+            ORDER BY _row
+        """, {'laudos_apac': ['nome', 'n_apac', 'tratamento_procedimento', 'final']},
+            "Erro ao ler a tabela 'laudos_apac': {e}.", [end_of_month.to_pydatetime()])
+        return df.sort_values(by='Nome', ascending=True).reset_index(drop=True)
+
+    @perf_log.timed_call()
+    def generate_convenio_geral_data(self):
+        # O 'first' do pandas ignora os nulos: o primeiro valor preenchido de cada guia.
+        first = lambda column: f"arg_min({column}, _row) FILTER (WHERE {column} IS NOT NULL) AS {column}"
+        columns = ['numero_guia', 'nome', 'matricula', 'lote', 'programa_tratamento', 'plano', 'quant', 'total', 'data']
+        error = "Erro ao ler a tabela 'faturamento_convenio': {e}. Verifique se a fonte de dados foi importada."
+        df = self._query(f"""
+            SELECT numero_guia, {first('nome')}, {first('matricula')}, {first('lote')}, {first('programa_tratamento')}, {first('plano')},
+                   SUM(quant) AS quant, SUM(total) AS total,
+                   MIN(TRY_CAST(data AS TIMESTAMP)) AS data_inicio, MAX(TRY_CAST(data AS TIMESTAMP)) AS data_final
+            FROM faturamento_convenio
+            WHERE numero_guia IS NOT NULL
+            GROUP BY numero_guia
+            ORDER BY numero_guia
+        """, {'faturamento_convenio': columns}, error, typed_from='faturamento_convenio')
+        if df.empty and not self._query("SELECT COUNT(*) AS linhas FROM faturamento_convenio", {'faturamento_convenio': columns}, error)['linhas'][0]:
+            return pd.DataFrame()
+
+        df = df.rename(columns={
+            'nome': 'Nome', 'numero_guia': 'Número da Guia', 'matricula': 'Matrícula', 'lote': 'Lote',
+            'programa_tratamento': 'Programa Tratamento', 'plano': 'Plano', 'quant': 'Quant.', 'total': 'Total',
+            'data_inicio': 'Data Início', 'data_final': 'Data Final'
+        })
+        df = df.sort_values(by='Nome', ascending=True).reset_index(drop=True)
+        df['Total'] = df['Total'].round(2)
+        return df[['Nome', 'Matrícula', 'Número da Guia', 'Lote', 'Quant.', 'Programa Tratamento', 'Plano', 'Total', 'Data Início', 'Data Final']]
+
+    @perf_log.timed_call()
+    def calculate_convenio_summary(self):
+        df = self._query("""
+            SELECT COUNT(*) AS linhas, COUNT(DISTINCT numero_guia) AS guias, COALESCE(SUM(quant), 0) AS sessoes,
+                   COALESCE(SUM(quant) FILTER (WHERE contains(upper(programa_tratamento), 'HEMODIÁLISE')), 0) AS sessoes_hd,
+                   COALESCE(SUM(quant) FILTER (WHERE contains(upper(programa_tratamento), 'HEMODIAFILTRA')), 0) AS sessoes_hdf,
+                   COALESCE(SUM(total), 0) AS valor
+            FROM faturamento_convenio
+        """, {'faturamento_convenio': ['numero_guia', 'programa_tratamento', 'quant', 'total']},
+            "Erro ao ler a tabela 'faturamento_convenio': {e}. Verifique se a fonte de dados foi importada.")
+        totals = df.iloc[0]
+        if not totals['linhas']:
+            return {}
+
+        return {
+            "Quantidade de Guias": int(totals['guias']),
+            "Quantidade Total de Sessões": int(totals['sessoes']),
+            "Quantidade de Sessões HD": int(totals['sessoes_hd']),
+            "Quantidade de Sessões HDF": int(totals['sessoes_hdf']),
+            "Valor Total": format_brl(float(totals['valor']))
+        }
+
+QUERY_ENGINES = {
+    QueryEngine.name: QueryEngine,
+    VectorizedEngine.name: VectorizedEngine,
+    DuckDBEngine.name: DuckDBEngine,
+}
+
+def get_engine(name: str, db):
+    """ Instancia o motor registrado em QUERY_ENGINES com esse nome. """
+    try:
+        return QUERY_ENGINES[name](db)
+    except KeyError:
+        raise ValueError(f"Motor de consulta desconhecido: '{name}'. Disponíveis: {', '.join(QUERY_ENGINES)}.")
+
+def engine_for(db):
+    """
+    O motor de QUERY_ENGINE sobre db, para os relatórios. Um motor já
+    escolhido (ex.: no benchmarks/equivalence.py) ou None passam sem
+    mudança.
+    """
+    if not isinstance(db, Database) or QUERY_ENGINE == QueryEngine.name:
+        return db
+    return get_engine(QUERY_ENGINE, db)
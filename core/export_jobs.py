@@ -0,0 +1,210 @@
+# core/export_jobs.py
+import threading
+from itertools import count
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+from core.reports import EmptyReportError
+
+# Percentual exibido na barra de progresso ao entrar em cada etapa do relatório.
+STAGE_PROGRESS = {'query': 10, 'transform': 35, 'render': 60, 'write': 90}
+STAGE_LABELS = {
+    'query': "Consultando dados",
+    'transform': "Processando dados",
+    'render': "Gerando arquivo",
+    'write': "Gravando arquivo",
+}
+
+class ExportCancelled(Exception):
+    pass
+
+class ExportJobSignals(QObject):
+    stage = Signal(int, str, int)
+    finished = Signal(int, str, str)
+    result = Signal(int, object)
+
+class ExportJob(QRunnable):
+    """
+    Executa report.export() fora da thread da interface. O status final é um
+    de 'ok', 'empty' (relatório sem dados, EmptyReportError), 'cancelled' ou
+    'error' (inclusive falhas de leitura do banco).
+    """
+    def __init__(self, job_id: int, report, file_path: str, file_format: str, cache=None):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.job_id = job_id
+        self.report = report
+        self.file_path = file_path
+        self.file_format = file_format
+        self.cache = cache
+        self.signals = ExportJobSignals()
+        self._cancel_event = threading.Event()
+
+    @property
+    def title(self) -> str:
+        return self.report.title
+
+    @property
+    def description(self) -> str:
+        return f"{self.title} ({self.file_format})"
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def _on_stage(self, stage: str):
+        if self._cancel_event.is_set():
+            raise ExportCancelled()
+        self.signals.stage.emit(self.job_id, stage, STAGE_PROGRESS.get(stage, 0))
+
+    def execute(self) -> str:
+        """ Executa a exportação e retorna a mensagem de sucesso. """
+        self.report.export(self.file_path, self.file_format, progress=self._on_stage, cache=self.cache)
+        return f"O relatório '{self.title}' foi salvo com sucesso."
+
+    @Slot()
+    def run(self):
+        try:
+            message = self.execute()
+            self.signals.finished.emit(self.job_id, 'ok', message)
+        except ExportCancelled:
+            self.signals.finished.emit(self.job_id, 'cancelled', f"A exportação de '{self.title}' foi cancelada.")
+        except EmptyReportError as ve:
+            self.signals.finished.emit(self.job_id, 'empty', str(ve))
+        except Exception as e:
+            self.signals.finished.emit(self.job_id, 'error', f"Ocorreu um erro ao gerar ou salvar o relatório:\n\n{str(e)}")
+
+class ExportAllJob(ExportJob):
+    """ Exporta vários relatórios de uma vez através de core.batch.export_all. """
+    def __init__(self, job_id: int, title: str, reports: list, output_dir: str, formats=('Excel', 'PDF'), zip_name: str = None):
+        super().__init__(job_id, None, output_dir, "/".join(formats))
+        self._title = title
+        self.reports = reports
+        self.formats = formats
+        self.zip_name = zip_name
+
+    @property
+    def title(self) -> str:
+        return self._title
+
+    def execute(self) -> str:
+        from core.batch import export_all
+        result = export_all(self.reports, self.file_path, formats=self.formats, zip_name=self.zip_name, progress=self._on_stage)
+        message = f"{len(result['files'])} arquivo(s) gerado(s) em:\n{self.file_path}"
+        if result['skipped']:
+            message += "\n\nRelatórios sem dados (ignorados):\n" + "\n".join(result['skipped'])
+        return message
+
+class ExportWorkbookJob(ExportAllJob):
+    """ Grava vários relatórios como abas de uma única pasta de trabalho Excel. """
+    def __init__(self, job_id: int, title: str, reports: list, file_path: str):
+        super().__init__(job_id, title, reports, file_path, formats=('Excel',))
+
+    def execute(self) -> str:
+        from core.batch import export_single_workbook
+        result = export_single_workbook(self.reports, self.file_path, progress=self._on_stage)
+        message = f"A planilha '{self.title}' foi salva com sucesso."
+        if result['skipped']:
+            message += "\n\nAbas sem dados (ignoradas):\n" + "\n".join(result['skipped'])
+        return message
+
+class ReportPreviewJob(ExportJob):
+    """
+    Executa só as etapas de consulta e transformação do relatório, para
+    visualização na tela. O resultado (df, resumo) é emitido em
+    signals.result antes de finished.
+    """
+    def __init__(self, job_id: int, report):
+        super().__init__(job_id, report, None, "Visualização")
+
+    @property
+    def description(self) -> str:
+        return f"{self.title} (visualização)"
+
+    def execute(self) -> str:
+        self._on_stage('query')
+        df_raw = self.report.get_data()
+        self._on_stage('transform')
+        df, summary = self.report.prepare(df_raw)
+        if self._cancel_event.is_set():
+            raise ExportCancelled()
+        self.signals.result.emit(self.job_id, (df, summary))
+        return f"O relatório '{self.title}' foi carregado."
+
+class ExportJobRunner(QObject):
+    """
+    Fila de exportações. Os trabalhos rodam um de cada vez em um QThreadPool
+    próprio, na ordem em que foram enviados.
+    """
+    job_started = Signal(int, str)
+    job_stage = Signal(int, str, int)
+    job_finished = Signal(int, str, str)
+    job_result = Signal(int, object)
+    queue_changed = Signal(int)
+
+    def __init__(self, parent: QObject = None, cache=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._ids = count(1)
+        self._jobs = {}
+        self._started = set()
+
+    def submit(self, report, file_path: str, file_format: str) -> int:
+        job = ExportJob(next(self._ids), report, file_path, file_format, cache=self.cache)
+        return self._enqueue(job)
+
+    def submit_all(self, title: str, reports: list, output_dir: str, formats=('Excel', 'PDF'), zip_name: str = None) -> int:
+        job = ExportAllJob(next(self._ids), title, reports, output_dir, formats, zip_name)
+        return self._enqueue(job)
+
+    def submit_workbook(self, title: str, reports: list, file_path: str) -> int:
+        job = ExportWorkbookJob(next(self._ids), title, reports, file_path)
+        return self._enqueue(job)
+
+    def submit_preview(self, report) -> int:
+        job = ReportPreviewJob(next(self._ids), report)
+        return self._enqueue(job)
+
+    def _enqueue(self, job) -> int:
+        job.signals.stage.connect(self._on_job_stage)
+        job.signals.result.connect(self.job_result)
+        job.signals.finished.connect(self._on_job_finished)
+        self._jobs[job.job_id] = job
+        self.pool.start(job)
+        self.queue_changed.emit(len(self._jobs))
+        return job.job_id
+
+    def cancel(self, job_id: int):
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        job.cancel()
+        if job_id not in self._started and self.pool.tryTake(job):
+            self._on_job_finished(job_id, 'cancelled', f"A exportação de '{job.title}' foi cancelada.")
+
+    def cancel_all(self):
+        for job_id in list(self._jobs):
+            self.cancel(job_id)
+
+    def pending_count(self) -> int:
+        return len(self._jobs)
+
+    def description(self, job_id: int) -> str:
+        job = self._jobs.get(job_id)
+        return job.description if job else ""
+
+    @Slot(int, str, int)
+    def _on_job_stage(self, job_id: int, stage: str, percent: int):
+        if job_id not in self._started:
+            self._started.add(job_id)
+            self.job_started.emit(job_id, self.description(job_id))
+        self.job_stage.emit(job_id, stage, percent)
+
+    @Slot(int, str, str)
+    def _on_job_finished(self, job_id: int, status: str, message: str):
+        if self._jobs.pop(job_id, None) is None:
+            return
+        self._started.discard(job_id)
+        self.job_finished.emit(job_id, status, message)
+        self.queue_changed.emit(len(self._jobs))
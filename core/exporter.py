@@ -1,14 +1,23 @@
 import pandas as pd
 import os
-from datetime import datetime
+import numbers
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, date
+
+from core.utils import format_brl
+from core import perf_log
 
 # Garante que as bibliotecas de exportação estão disponíveis
 try:
     import openpyxl
     from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.chart import LineChart, Reference
     from reportlab.lib import colors
     from reportlab.lib.pagesizes import letter, landscape
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak
+    from reportlab.lib.utils import simpleSplit
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.enums import TA_CENTER, TA_LEFT
     from reportlab.lib.units import inch
@@ -16,60 +25,156 @@ try:
 except ImportError:
     LIBS_AVAILABLE = False
 
+# Opcional: usado apenas para unir as partes da renderização paralela de PDF.
+try:
+    from pypdf import PdfWriter
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+# Colunas com formatação especial. Os valores chegam aos exportadores como
+# números e datas nativos; a apresentação é feita aqui (formato de número no
+# Excel, texto formatado no PDF).
+CURRENCY_COLUMNS = {'Total', 'Valor Convênio'}
+BLANK_ZERO_COLUMNS = {'HD', 'Extras'}
+
+EXCEL_DATE_FORMAT = 'DD/MM/YYYY'
+EXCEL_CURRENCY_FORMAT = '"R$" #,##0.00'
+EXCEL_BLANK_ZERO_FORMAT = '0;-0;;@'
+
+def format_cell_text(col_name, value) -> str:
+    """
+    Converte o valor de uma célula no texto exibido no PDF e nas
+    visualizações: datas em dd/mm/aaaa, moeda em pt-BR e zeros em branco nas
+    colunas de sessões.
+    """
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.strftime('%d/%m/%Y')
+    if col_name in CURRENCY_COLUMNS and isinstance(value, numbers.Number):
+        return format_brl(value)
+    if col_name in BLANK_ZERO_COLUMNS and isinstance(value, numbers.Number) and value == 0:
+        return ""
+    return str(value)
+
+def _frame_rows(df, *args, **kwargs) -> int:
+    return len(df)
+
+def _sheet_rows(sheets, *args, **kwargs) -> int:
+    return sum(len(sheet[1]) for sheet in sheets)
+
+def _cell_display_length(cell) -> int:
+    value = cell.value
+    if isinstance(value, (datetime, date)):
+        return len(EXCEL_DATE_FORMAT)
+    if cell.number_format == EXCEL_CURRENCY_FORMAT and isinstance(value, numbers.Number):
+        return len(format_brl(value))
+    return len(str(value))
+
+class _ExcelStyles:
+    """
+    Objetos de estilo do openpyxl compartilhados por todas as abas de uma
+    mesma pasta de trabalho.
+    """
+    def __init__(self):
+        self.header_font = Font(bold=True, color="FFFFFF")
+        self.header_fill = PatternFill(start_color="6a2e4d", end_color="6a2e4d", fill_type="solid")
+        self.header_alignment = Alignment(horizontal='center', vertical='center')
+        self.bold_font = Font(bold=True)
+
+def _apply_number_formats(ws, df: pd.DataFrame):
+    for col_idx, col_name in enumerate(df.columns, 1):
+        if pd.api.types.is_datetime64_any_dtype(df[col_name]):
+            number_format = EXCEL_DATE_FORMAT
+        elif col_name in CURRENCY_COLUMNS:
+            number_format = EXCEL_CURRENCY_FORMAT
+        elif col_name in BLANK_ZERO_COLUMNS:
+            number_format = EXCEL_BLANK_ZERO_FORMAT
+        else:
+            continue
+        for row in ws.iter_rows(min_row=2, max_row=len(df) + 1, min_col=col_idx, max_col=col_idx):
+            row[0].number_format = number_format
+
+def _format_excel_sheet(ws, styles: _ExcelStyles, totals: dict = None, totals_title: str = "RESUMO GERAL"):
+    """
+    Aplica a formatação padrão de cabeçalho e largura de colunas a uma aba e,
+    se houver, adiciona a seção de resumo no final.
+    """
+    for cell in ws[1]:
+        cell.font = styles.header_font
+        cell.fill = styles.header_fill
+        cell.alignment = styles.header_alignment
+    for col_idx, column in enumerate(ws.columns, 1):
+        max_length = len(str(ws.cell(row=1, column=col_idx).value or ""))
+        for cell in column:
+            try:
+                if _cell_display_length(cell) > max_length: max_length = _cell_display_length(cell)
+            except: pass
+        ws.column_dimensions[openpyxl.utils.get_column_letter(col_idx)].width = (max_length + 2)
+    if totals:
+        totals_row_idx = ws.max_row + 2
+        ws.cell(row=totals_row_idx, column=1, value=totals_title).font = styles.bold_font
+        for i, (key, val) in enumerate(totals.items(), 1):
+            ws.cell(row=totals_row_idx + i, column=1, value=f"{key}:").font = styles.bold_font
+            ws.cell(row=totals_row_idx + i, column=2, value=val)
+
+@perf_log.timed_call(rows=_sheet_rows)
+def export_workbook(sheets: list, path: str):
+    """
+    Grava várias abas em uma única pasta de trabalho, em uma só sessão do
+    ExcelWriter. Cada item de sheets é uma tupla
+    (nome_da_aba, df, resumo, título_do_resumo); resumo pode ser None.
+    """
+    styles = _ExcelStyles()
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        for sheet_name, df, totals, totals_title in sheets:
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+            ws = writer.sheets[sheet_name]
+            _apply_number_formats(ws, df)
+            _format_excel_sheet(ws, styles, totals, totals_title)
+
+@perf_log.timed_call(rows=_frame_rows)
+def export_trend_workbook(df: pd.DataFrame, path: str, sheet_name: str, totals: dict, category_column: str, chart_columns: list):
+    """
+    Grava a aba como export_workbook e acrescenta, à direita da tabela, um
+    gráfico de linhas para cada coluna de chart_columns, com category_column
+    no eixo horizontal.
+    """
+    export_workbook([(sheet_name, df, totals, "RESUMO")], path)
+    wb = openpyxl.load_workbook(path)
+    ws = wb[sheet_name]
+    categories = Reference(ws, min_col=df.columns.get_loc(category_column) + 1, min_row=2, max_row=len(df) + 1)
+    anchor_column = openpyxl.utils.get_column_letter(len(df.columns) + 2)
+    for index, column in enumerate(chart_columns):
+        col_idx = df.columns.get_loc(column) + 1
+        chart = LineChart()
+        chart.title = column
+        chart.legend = None
+        chart.height = 7
+        chart.width = 16
+        chart.add_data(Reference(ws, min_col=col_idx, min_row=1, max_row=len(df) + 1), titles_from_data=True)
+        chart.set_categories(categories)
+        ws.add_chart(chart, f"{anchor_column}{1 + index * 15}")
+    wb.save(path)
+
 def export_simple_excel(df: pd.DataFrame, path: str, sheet_name: str = 'Relatório'):
     """
     Exporta um DataFrame para um arquivo Excel simples com formatação de cabeçalho.
     """
-    with pd.ExcelWriter(path, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name=sheet_name, index=False)
-        ws = writer.sheets[sheet_name]
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="6a2e4d", end_color="6a2e4d", fill_type="solid")
-        for cell in ws[1]:
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-        for col_idx, column in enumerate(ws.columns, 1):
-            max_length = len(str(ws.cell(row=1, column=col_idx).value or ""))
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = (max_length + 2)
-            ws.column_dimensions[openpyxl.utils.get_column_letter(col_idx)].width = adjusted_width
+    export_workbook([(sheet_name, df, None, None)], path)
 
 def export_to_excel(df: pd.DataFrame, path: str, sheet_name: str, totals: dict):
     """
     Exporta um DataFrame para Excel, adicionando uma seção de resumo no final.
     """
-    with pd.ExcelWriter(path, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name=sheet_name, index=False)
-        ws = writer.sheets[sheet_name]
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="6a2e4d", end_color="6a2e4d", fill_type="solid")
-        for cell in ws[1]:
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-        for col_idx, column in enumerate(ws.columns, 1):
-            max_length = len(str(ws.cell(row=1, column=col_idx).value or ""))
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length: max_length = len(str(cell.value))
-                except: pass
-            ws.column_dimensions[openpyxl.utils.get_column_letter(col_idx)].width = (max_length + 2)
-        if totals:
-            totals_row_idx = ws.max_row + 2
-            ws.cell(row=totals_row_idx, column=1, value="RESUMO GERAL").font = Font(bold=True)
-            for i, (key, val) in enumerate(totals.items(), 1):
-                ws.cell(row=totals_row_idx + i, column=1, value=f"{key}:").font = Font(bold=True)
-                ws.cell(row=totals_row_idx + i, column=2, value=val)
+    export_workbook([(sheet_name, df, totals, "RESUMO GERAL")], path)
 
-def _pdf_header_footer(canvas, doc, logo_path, title):
+def _pdf_header_footer(canvas, doc, logo_path, title, page_offset=0, issued_at=None):
     """
     Cria um cabeçalho e rodapé modernos para o relatório em PDF.
+    page_offset e issued_at permitem que partes de um mesmo relatório,
+    renderizadas separadamente, mantenham a numeração e a data de emissão.
     """
     canvas.saveState()
     page_width, page_height = doc.pagesize
@@ -87,54 +192,51 @@ def _pdf_header_footer(canvas, doc, logo_path, title):
     # --- Rodapé ---
     canvas.setFillColor(colors.black)
     canvas.setFont('Helvetica', 9)
-    canvas.drawRightString(page_width - doc.rightMargin, 0.5 * inch, f"Emitido em: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-    canvas.drawCentredString(page_width / 2.0, 0.5 * inch, f"Página {doc.page}")
+    canvas.drawRightString(page_width - doc.rightMargin, 0.5 * inch, f"Emitido em: {issued_at or datetime.now().strftime('%d/%m/%Y %H:%M')}")
+    canvas.drawCentredString(page_width / 2.0, 0.5 * inch, f"Página {doc.page + page_offset}")
 
     canvas.restoreState()
 
-def export_to_pdf(df: pd.DataFrame, path: str, logo_path: str, title: str, totals: dict, pagesize=letter, col_widths=None):
-    """
-    Exporta o DataFrame para um PDF com layout modernizado e alinhado à esquerda.
-    """
-    doc = SimpleDocTemplate(path, pagesize=pagesize, topMargin=1.2*inch, bottomMargin=0.8*inch, leftMargin=0.5*inch, rightMargin=0.5*inch)
-    elements = []
-    styles = getSampleStyleSheet()
+PDF_CENTER_COLUMNS = ['Nº APAC', 'HD', 'Extras', 'CDL', 'Observação', 'Número da Guia', 'Matrícula', 'Lote', 'Quant.', 'Total', 'Data Início', 'Data Final',
+                      'Pacientes', 'Sessões HD', 'Sessões Extras', 'HBV', 'HCV', 'HIV', 'Guias Convênio', 'Sessões Convênio', 'Valor Convênio',
+                      'Competência', 'Clínicas', 'Sessões Totais', 'Var. Sessões (%)', 'Var. Valor (%)']
 
-    # --- Seção de Logo e Resumo ---
-    if totals:
-        summary_style = ParagraphStyle(name='Summary', fontSize=10, leading=14)
-        summary_items = [Paragraph(f"<b>{key}:</b> {value}", summary_style) for key, value in totals.items()]
+def _pdf_margins():
+    return dict(topMargin=1.2*inch, bottomMargin=0.8*inch, leftMargin=0.5*inch, rightMargin=0.5*inch)
 
-        max_rows_per_col = 5
-        num_cols = (len(summary_items) + max_rows_per_col - 1) // max_rows_per_col
-        
-        table_data = [[''] * num_cols for _ in range(max_rows_per_col)]
-        for i, item in enumerate(summary_items):
-            table_data[i % max_rows_per_col][i // max_rows_per_col] = item
+def _pdf_summary_section(totals: dict, logo_path: str):
+    """ Tabela com o logo e o resumo em colunas, exibida no topo da primeira página. """
+    summary_style = ParagraphStyle(name='Summary', fontSize=10, leading=14)
+    summary_items = [Paragraph(f"<b>{key}:</b> {value}", summary_style) for key, value in totals.items()]
 
-        col_widths_summary = [2.8 * inch] * num_cols
-        summary_table = Table(table_data, colWidths=col_widths_summary)
-        summary_table.setStyle(TableStyle([('VALIGN', (0, 0), (-1, -1), 'TOP'), ('LEFTPADDING', (0, 0), (-1, -1), 0)]))
-        
-        logo_image = Image(logo_path, width=1.8*inch, height=1.8*inch, kind='bound', hAlign='CENTER') if os.path.exists(logo_path) else Spacer(0, 0)
+    max_rows_per_col = 5
+    num_cols = (len(summary_items) + max_rows_per_col - 1) // max_rows_per_col
 
-        # CORREÇÃO: Adicionado hAlign='LEFT' para forçar o alinhamento
-        layout_table = Table([[logo_image, summary_table]], colWidths=[2.2*inch, sum(col_widths_summary) + 0.1*inch], hAlign='LEFT')
-        layout_table.setStyle(TableStyle([('VALIGN', (0, 0), (-1, -1), 'TOP')]))
-        elements.append(layout_table)
+    table_data = [[''] * num_cols for _ in range(max_rows_per_col)]
+    for i, item in enumerate(summary_items):
+        table_data[i % max_rows_per_col][i // max_rows_per_col] = item
 
-    elements.append(Spacer(1, 0.3*inch))
-    
-    # --- Tabela Principal de Dados ---
+    col_widths_summary = [2.8 * inch] * num_cols
+    summary_table = Table(table_data, colWidths=col_widths_summary)
+    summary_table.setStyle(TableStyle([('VALIGN', (0, 0), (-1, -1), 'TOP'), ('LEFTPADDING', (0, 0), (-1, -1), 0)]))
+
+    logo_image = Image(logo_path, width=1.8*inch, height=1.8*inch, kind='bound', hAlign='CENTER') if os.path.exists(logo_path) else Spacer(0, 0)
+
+    # CORREÇÃO: Adicionado hAlign='LEFT' para forçar o alinhamento
+    layout_table = Table([[logo_image, summary_table]], colWidths=[2.2*inch, sum(col_widths_summary) + 0.1*inch], hAlign='LEFT')
+    layout_table.setStyle(TableStyle([('VALIGN', (0, 0), (-1, -1), 'TOP')]))
+    return layout_table
+
+def _pdf_data_table(columns, rows, col_widths=None):
+    """ Monta a tabela principal a partir das linhas já convertidas em texto. """
     header_style = ParagraphStyle(name='HeaderStyle', fontName='Helvetica-Bold', fontSize=9, textColor=colors.white, alignment=TA_CENTER)
     body_style_center = ParagraphStyle(name='BodyStyleCenter', fontSize=8, alignment=TA_CENTER, leading=10)
     body_style_left = ParagraphStyle(name='BodyStyleLeft', fontSize=8, alignment=TA_LEFT, leading=10)
-    styled_data = [[Paragraph(col, header_style) for col in df.columns]]
+    col_styles = [body_style_center if col_name in PDF_CENTER_COLUMNS else body_style_left for col_name in columns]
 
-    center_cols = ['Nº APAC', 'HD', 'Extras', 'CDL', 'Observação', 'Número da Guia', 'Matrícula', 'Lote', 'Quant.', 'Total', 'Data Início', 'Data Final']
-    for _, row in df.iterrows():
-        row_data = [Paragraph(str(item), body_style_center if col_name in center_cols else body_style_left) for col_name, item in row.items()]
-        styled_data.append(row_data)
+    styled_data = [[Paragraph(col, header_style) for col in columns]]
+    for row in rows:
+        styled_data.append([Paragraph(text, style) for text, style in zip(row, col_styles)])
 
     table = Table(styled_data, repeatRows=1, colWidths=col_widths)
     table.setStyle(TableStyle([
@@ -143,39 +245,175 @@ def export_to_pdf(df: pd.DataFrame, path: str, logo_path: str, title: str, total
         ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
         ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
     ]))
-    elements.append(table)
-    
+    return table
+
+def _pdf_text_rows(df: pd.DataFrame) -> list:
+    columns = list(df.columns)
+    return [[format_cell_text(col_name, item) for col_name, item in zip(columns, record)] for record in df.itertuples(index=False, name=None)]
+
+@perf_log.timed_call(rows=_frame_rows)
+def export_to_pdf(df: pd.DataFrame, path: str, logo_path: str, title: str, totals: dict, pagesize=letter, col_widths=None, parallel=None):
+    """
+    Exporta o DataFrame para um PDF com layout modernizado e alinhado à esquerda.
+
+    Com parallel=True a tabela é dividida em páginas e renderizada em partes
+    por export_to_pdf_chunked. Com parallel=None (padrão) esse modo é usado
+    automaticamente para tabelas com PARALLEL_PDF_MIN_ROWS linhas ou mais.
+    """
+    if parallel is None:
+        parallel = len(df) >= PARALLEL_PDF_MIN_ROWS and PYPDF_AVAILABLE and multiprocessing.parent_process() is None
+    if parallel:
+        # Sem o timed_call de export_to_pdf_chunked: esta exportação já tem o seu registro.
+        _render_pdf_chunked(df, path, logo_path, title, totals, pagesize=pagesize, col_widths=col_widths)
+        return
+
+    doc = SimpleDocTemplate(path, pagesize=pagesize, **_pdf_margins())
+    elements = []
+
+    # --- Seção de Logo e Resumo ---
+    if totals:
+        elements.append(_pdf_summary_section(totals, logo_path))
+
+    elements.append(Spacer(1, 0.3*inch))
+
+    # --- Tabela Principal de Dados ---
+    elements.append(_pdf_data_table(list(df.columns), _pdf_text_rows(df), col_widths))
+
     header_footer_with_args = lambda canvas, doc: _pdf_header_footer(canvas, doc, logo_path, title)
     doc.build(elements, onFirstPage=header_footer_with_args, onLaterPages=header_footer_with_args)
 
+# --- Renderização de PDF em partes paralelas ---
+# A tabela é paginada de antemão (altura de cada linha estimada pela quebra de
+# texto), as páginas são agrupadas em partes renderizadas em um pool de
+# processos e os arquivos resultantes são concatenados com o pypdf.
+
+PARALLEL_PDF_MIN_ROWS = 3000
+_CELL_VERTICAL_PADDING = 6
+_CELL_HORIZONTAL_PADDING = 12
+_FRAME_PADDING = 12
+
+def _resolve_col_widths(col_widths, num_cols: int, avail_width: float) -> list:
+    if col_widths is None:
+        return [avail_width / num_cols] * num_cols
+    resolved = []
+    for width in col_widths:
+        if isinstance(width, str) and width.endswith('%'):
+            resolved.append(avail_width * float(width[:-1]) / 100.0)
+        else:
+            resolved.append(float(width))
+    return resolved
+
+def _paginate_rows(rows: list, widths: list, first_page_height: float, page_height: float) -> list:
+    """
+    Distribui as linhas em páginas. Retorna a lista de (início, fim) de cada
+    página. A altura de cada linha é calculada com a mesma quebra de texto
+    usada pelos parágrafos do corpo da tabela (Helvetica 8, entrelinha 10).
+    """
+    text_widths = [width - _CELL_HORIZONTAL_PADDING for width in widths]
+    pages = []
+    start = 0
+    used = 0.0
+    capacity = first_page_height
+    for i, row in enumerate(rows):
+        lines = max((len(simpleSplit(text, 'Helvetica', 8, width)) for text, width in zip(row, text_widths) if text), default=0)
+        row_height = lines * 10 + _CELL_VERTICAL_PADDING
+        if used + row_height > capacity and i > start:
+            pages.append((start, i))
+            start = i
+            used = 0.0
+            capacity = page_height
+        used += row_height
+    pages.append((start, len(rows)))
+    return pages
+
+def _render_pdf_chunk(path, columns, page_rows, widths, pagesize, logo_path, title, totals, page_offset, issued_at, first_chunk):
+    """ Renderiza um grupo de páginas em um PDF separado. Retorna o número de páginas geradas. """
+    doc = SimpleDocTemplate(path, pagesize=pagesize, **_pdf_margins())
+    elements = []
+    if first_chunk:
+        if totals:
+            elements.append(_pdf_summary_section(totals, logo_path))
+        elements.append(Spacer(1, 0.3*inch))
+    for i, rows in enumerate(page_rows):
+        if i:
+            elements.append(PageBreak())
+        elements.append(_pdf_data_table(columns, rows, widths))
+
+    header_footer_with_args = lambda canvas, doc: _pdf_header_footer(canvas, doc, logo_path, title, page_offset, issued_at)
+    doc.build(elements, onFirstPage=header_footer_with_args, onLaterPages=header_footer_with_args)
+    return doc.page
+
+@perf_log.timed_call(rows=_frame_rows)
+def export_to_pdf_chunked(df: pd.DataFrame, path: str, logo_path: str, title: str, totals: dict, pagesize=letter, col_widths=None, max_workers=None, pages_per_chunk=None):
+    """
+    Gera o mesmo PDF de export_to_pdf dividindo a tabela em páginas e
+    renderizando grupos de páginas em paralelo, com o mesmo cabeçalho/rodapé
+    e numeração "Página N" contínua. Requer o pacote pypdf para unir as partes.
+    Com max_workers=1 as partes são renderizadas no processo atual.
+    """
+    _render_pdf_chunked(df, path, logo_path, title, totals, pagesize, col_widths, max_workers, pages_per_chunk)
+
+def _render_pdf_chunked(df: pd.DataFrame, path: str, logo_path: str, title: str, totals: dict, pagesize=letter, col_widths=None, max_workers=None, pages_per_chunk=None):
+    if not PYPDF_AVAILABLE:
+        raise RuntimeError("O pacote 'pypdf' é necessário para a renderização de PDF em partes.")
+
+    columns = list(df.columns)
+    rows = _pdf_text_rows(df)
+    margins = _pdf_margins()
+    page_width, page_height = pagesize
+    frame_width = page_width - margins['leftMargin'] - margins['rightMargin'] - _FRAME_PADDING
+    frame_height = page_height - margins['topMargin'] - margins['bottomMargin'] - _FRAME_PADDING
+    widths = _resolve_col_widths(col_widths, len(columns), frame_width)
+
+    header_height = _pdf_data_table(columns, [], widths).wrap(frame_width, frame_height)[1]
+    first_page_height = frame_height - 0.3*inch
+    if totals:
+        first_page_height -= _pdf_summary_section(totals, logo_path).wrap(frame_width, frame_height)[1]
+    pages = _paginate_rows(rows, widths, first_page_height - header_height, frame_height - header_height)
+
+    workers = max_workers or os.cpu_count() or 1
+    if pages_per_chunk is None:
+        pages_per_chunk = max(1, -(-len(pages) // (workers * 2)))
+    page_groups = [pages[i:i + pages_per_chunk] for i in range(0, len(pages), pages_per_chunk)]
+    issued_at = datetime.now().strftime('%d/%m/%Y %H:%M')
+
+    with tempfile.TemporaryDirectory(prefix='.sissup_pdf_', dir=os.path.dirname(os.path.abspath(path))) as tmp_dir:
+        tasks = []
+        offset = 0
+        for index, group in enumerate(page_groups):
+            chunk_path = os.path.join(tmp_dir, f"parte_{index:05d}.pdf")
+            page_rows = [rows[start:end] for start, end in group]
+            tasks.append([chunk_path, columns, page_rows, widths, pagesize, logo_path, title, totals, offset, issued_at, index == 0])
+            offset += len(group)
+
+        if workers <= 1 or len(tasks) == 1:
+            page_counts = [_render_pdf_chunk(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                page_counts = list(executor.map(_render_pdf_chunk, *zip(*tasks)))
+
+        # Se alguma parte gerou mais páginas que o previsto (linha mais alta que
+        # a estimativa), as partes seguintes são refeitas com a numeração correta.
+        offset = 0
+        for task, pages_rendered in zip(tasks, page_counts):
+            if task[8] != offset:
+                task[8] = offset
+                pages_rendered = _render_pdf_chunk(*task)
+            offset += pages_rendered
+
+        writer = PdfWriter()
+        for task in tasks:
+            writer.append(task[0])
+        with open(path, 'wb') as output:
+            writer.write(output)
+
 def export_fistulas_to_excel(df: pd.DataFrame, path: str, totals: dict):
     """
     Exporta o relatório de fístulas para Excel com uma seção de resumo.
     """
-    sheet_name = "Procedimentos FAV"
-    with pd.ExcelWriter(path, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name=sheet_name, index=False)
-        ws = writer.sheets[sheet_name]
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="6a2e4d", end_color="6a2e4d", fill_type="solid")
-        for cell in ws[1]:
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-        for col_idx, column in enumerate(ws.columns, 1):
-            max_length = len(str(ws.cell(row=1, column=col_idx).value or ""))
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length: max_length = len(str(cell.value))
-                except: pass
-            ws.column_dimensions[openpyxl.utils.get_column_letter(col_idx)].width = (max_length + 2)
-        if totals:
-            totals_row_idx = ws.max_row + 2
-            ws.cell(row=totals_row_idx, column=1, value="RESUMO DE PROCEDIMENTOS").font = Font(bold=True)
-            for i, (key, val) in enumerate(totals.items(), 1):
-                ws.cell(row=totals_row_idx + i, column=1, value=f"{key}:").font = Font(bold=True)
-                ws.cell(row=totals_row_idx + i, column=2, value=val)
+    export_workbook([("Procedimentos FAV", df, totals, "RESUMO DE PROCEDIMENTOS")], path)
 
+@perf_log.timed_call(rows=_frame_rows)
 def export_fistulas_to_pdf(df: pd.DataFrame, path: str, logo_path: str, totals: dict):
     """
     Exporta o relatório de fístulas para PDF com layout modernizado e alinhado à esquerda.
@@ -217,7 +455,7 @@ def export_fistulas_to_pdf(df: pd.DataFrame, path: str, logo_path: str, totals:
     styled_data = [[Paragraph(col, header_style) for col in df.columns]]
     
     for _, row in df.iterrows():
-        row_data = [Paragraph(str(item), body_style_left if col_name == 'Nome' else body_style_center) for col_name, item in row.items()]
+        row_data = [Paragraph(format_cell_text(col_name, item), body_style_left if col_name == 'Nome' else body_style_center) for col_name, item in row.items()]
         styled_data.append(row_data)
         
     table = Table(styled_data, repeatRows=1)
@@ -232,6 +470,7 @@ def export_fistulas_to_pdf(df: pd.DataFrame, path: str, logo_path: str, totals:
     header_footer_with_args = lambda canvas, doc: _pdf_header_footer(canvas, doc, logo_path, title)
     doc.build(elements, onFirstPage=header_footer_with_args, onLaterPages=header_footer_with_args)
 
+@perf_log.timed_call(rows=_frame_rows)
 def export_continuidade_to_pdf(df: pd.DataFrame, path: str, logo_path: str, title: str):
     """
     Exporta o relatório de continuidade para PDF com layout modernizado e alinhado à esquerda.
@@ -261,7 +500,7 @@ def export_continuidade_to_pdf(df: pd.DataFrame, path: str, logo_path: str, titl
     styled_data = [[Paragraph(col, header_style) for col in df.columns]]
     
     for _, row in df.iterrows():
-        row_data = [Paragraph(str(item), body_style_left if col_name == 'Nome' else body_style_center) for col_name, item in row.items()]
+        row_data = [Paragraph(format_cell_text(col_name, item), body_style_left if col_name == 'Nome' else body_style_center) for col_name, item in row.items()]
         styled_data.append(row_data)
         
     table = Table(styled_data, repeatRows=1)
@@ -6,19 +6,27 @@ class ImportWorker(QObject):
     finished = Signal(bool, str)
     progress = Signal(int)
     
-    def __init__(self, db: Database, file_path: str, table_name: str):
+    def __init__(self, db: Database, file_path: str, table_name: str, after_import=None):
         super().__init__()
         self.db = db
         self.file_path = file_path
         self.table_name = table_name
+        # Chamado na mesma thread depois de uma importação bem-sucedida (ex.: atualizar os indicadores mensais).
+        self.after_import = after_import
         
     @Slot()
     def run(self):
         try:
             self.progress.emit(10)
             result = self.db.import_from_csv(self.file_path, self.table_name)
-            self.progress.emit(100)
             msg = "Importação concluída com sucesso." if result else "Arquivo processado, mas não continha linhas válidas."
+            if result and self.after_import:
+                self.progress.emit(90)
+                try:
+                    self.after_import()
+                except Exception as e:
+                    msg += f"\n\nAviso: o histórico de indicadores não foi atualizado: {e}"
+            self.progress.emit(100)
             self.finished.emit(result, msg)
         except Exception as e:
             self.finished.emit(False, str(e))
\ No newline at end of file
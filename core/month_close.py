@@ -0,0 +1,135 @@
+# core/month_close.py
+"""
+Fechamento do mês sem interface: gera, para uma ou várias clínicas, os
+mesmos arquivos que a tela de relatórios (exportações de cada item de
+REPORT_DEFINITIONS e a planilha única, quando houver).
+
+Cada clínica roda em um processo próprio, sobre o banco da sua partição
+(core/partitions.py), arquivada ou não (core/archive.py), ou um banco
+informado; dentro do processo a renderização é sequencial, para não
+multiplicar processos.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from config import REPORT_DEFINITIONS, DATA_SOURCE_TITLES
+from core import perf_log
+from core.archive import open_database
+from core.batch import export_all, export_single_workbook
+from core.reports import REPORT_REGISTRY, EmptyReportError
+from core.utils import resource_path, safe_filename
+
+CLOSE_FORMATS = ('Excel', 'PDF')
+
+def database_for(db_pattern: str, clinic: str) -> str:
+    """ Caminho do banco da clínica: db_pattern pode conter {clinica}. """
+    return db_pattern.replace('{clinica}', safe_filename(clinic))
+
+def close_month(db_path: str, clinic: str, month: int, year: int, output_dir: str, zip_files: bool = False, logo_path: str = None) -> dict:
+    """
+    Gera os relatórios do mês de uma clínica em output_dir. Grupos de
+    REPORT_DEFINITIONS com fontes não importadas são pulados e descritos em
+    'skipped'. Retorna {'clinic', 'files', 'skipped'}.
+    """
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Banco de dados não encontrado: {db_path}")
+    logo_path = logo_path or resource_path('assets/logo.png')
+    params = {'clinic': clinic, 'month': month, 'year': year}
+    files = []
+    skipped = []
+    db = open_database(db_path)
+    try:
+        with perf_log.timed('fechamento', clinica=clinic, competencia=f"{month:02d}/{year}") as record:
+            for definition_name, definition in REPORT_DEFINITIONS.items():
+                title = f"{definition_name} - {clinic} - {month:02d}.{year}"
+                statuses = db.get_import_statuses(definition.get('imports', []))['tables']
+                missing = [DATA_SOURCE_TITLES.get(table, table) for table, status in statuses.items() if status is None]
+                if missing:
+                    skipped.append(f"{title}: fontes não importadas ({', '.join(missing)}).")
+                    continue
+
+                export_classes = [REPORT_REGISTRY[name] for name in definition.get('exports', []) if name in REPORT_REGISTRY]
+                if export_classes:
+                    reports = [report_class(db, logo_path, **params) for report_class in export_classes]
+                    try:
+                        result = export_all(reports, output_dir, CLOSE_FORMATS, zip_name=f"{safe_filename(title)}.zip" if zip_files else None, max_workers=1)
+                        files += result['files']
+                        skipped += result['skipped']
+                    except EmptyReportError as e:
+                        skipped.append(f"{title}: {e}")
+
+                workbook_classes = [REPORT_REGISTRY[name] for name in definition.get('workbook', []) if name in REPORT_REGISTRY]
+                if workbook_classes:
+                    reports = [report_class(db, logo_path, **params) for report_class in workbook_classes]
+                    try:
+                        result = export_single_workbook(reports, os.path.join(output_dir, f"{safe_filename(title)}.xlsx"))
+                        files += result['files']
+                        skipped += result['skipped']
+                    except EmptyReportError as e:
+                        skipped.append(f"{title} (planilha única): {e}")
+            record['linhas'] = len(files)
+    finally:
+        db.close()
+    return {'clinic': clinic, 'files': files, 'skipped': skipped}
+
+def _captured(function, *args):
+    """ Executado no processo filho. Devolve também os registros de desempenho. """
+    with perf_log.capture() as records:
+        result = function(*args)
+    result['perf_records'] = records
+    return result
+
+def run_per_clinic(function, tasks: dict, max_workers: int = None, progress=None) -> dict:
+    """
+    Executa function(*argumentos) para cada clínica de tasks ({clínica:
+    argumentos}), uma por processo. function deve ser de nível de módulo e
+    devolver um dicionário. progress(resultado) é chamado a cada clínica
+    concluída; uma clínica com erro recebe {'clinic', 'error'} sem
+    interromper as demais. Retorna {clínica: resultado}.
+    """
+    notify = progress or (lambda result: None)
+    results = {}
+    workers = max_workers or min(len(tasks), os.cpu_count() or 1)
+    if workers <= 1:
+        for clinic, args in tasks.items():
+            try:
+                results[clinic] = function(*args)
+            except Exception as e:
+                results[clinic] = {'clinic': clinic, 'error': f"{type(e).__name__}: {e}"}
+            notify(results[clinic])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_captured, function, *args): clinic for clinic, args in tasks.items()}
+            for future in as_completed(futures):
+                clinic = futures[future]
+                try:
+                    result = future.result()
+                    perf_log.write_records(result.pop('perf_records'))
+                except Exception as e:
+                    result = {'clinic': clinic, 'error': f"{type(e).__name__}: {e}"}
+                results[clinic] = result
+                notify(result)
+    return results
+
+def close_all(databases: dict, month: int, year: int, output_dir: str, zip_files: bool = False, max_workers: int = None, progress=None) -> list:
+    """
+    Fecha o mês de todas as clínicas de databases ({clínica: caminho do
+    banco}) em paralelo, uma por processo, cada uma em output_dir/<clínica>.
+    progress(resultado) é chamado a cada clínica concluída. Uma clínica com
+    erro não interrompe as demais: o resultado dela traz 'error'. Retorna os
+    resultados na ordem de databases.
+    """
+    tasks = {
+        clinic: (db_path, clinic, month, year, os.path.join(output_dir, safe_filename(clinic)), zip_files)
+        for clinic, db_path in databases.items()
+    }
+
+    def complete(result):
+        result.setdefault('files', [])
+        result.setdefault('skipped', [])
+        if progress:
+            progress(result)
+
+    results = run_per_clinic(close_month, tasks, max_workers, complete)
+    return [results[clinic] for clinic in databases]
@@ -0,0 +1,241 @@
+# core/partitions.py
+"""
+Armazenamento particionado por clínica e competência: cada par tem o seu
+próprio arquivo SQLite (PARTITIONS_DIR/<clínica>/<aaaa-mm>.db) com as
+mesmas tabelas de Database. Uma importação substitui só os dados daquela
+clínica e mês, e os relatórios leem apenas o arquivo da partição. O arquivo
+só é criado na primeira importação.
+
+Atualização de uma versão anterior: o banco único antigo (LEGACY_DATABASE)
+deixa de ser lido. Enquanto não houver partições, a janela principal oferece
+copiá-lo para a partição de uma clínica e competência; pela linha de comando,
+use "python cli.py particionar --clinica ... --mes ... --ano ...".
+"""
+
+import os
+import re
+import sqlite3
+import threading
+
+from config import get_table_configs, CLINICS, LEGACY_DATABASE, PARTITIONS_DIR
+from core.connections import ConnectionManager
+from core.database import Database, create_schema
+from core.utils import safe_filename
+
+_PARTITION_FILE = re.compile(r'^(\d{4})-(\d{2})\.db$')
+
+def partition_path(clinic: str, month: int, year: int, base_dir: str = PARTITIONS_DIR) -> str:
+    """ Caminho do banco de uma clínica e competência. """
+    if not 1 <= int(month) <= 12:
+        raise ValueError(f"Mês inválido: {month}.")
+    return os.path.join(base_dir, safe_filename(clinic), f"{int(year):04d}-{int(month):02d}.db")
+
+def has_imports(path: str) -> bool:
+    """ Se o banco em path existe e tem ao menos uma importação registrada em import_log. """
+    if not os.path.isfile(path):
+        return False
+    try:
+        conn = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+        try:
+            return conn.execute("SELECT 1 FROM import_log LIMIT 1").fetchone() is not None
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+
+def list_partitions(base_dir: str = PARTITIONS_DIR) -> list:
+    """
+    Partições com dados importados, como dicionários {'clinic', 'month',
+    'year', 'path'}, ordenadas por clínica (na ordem de CLINICS) e
+    competência. Pastas que não correspondem a uma clínica de CLINICS e bancos
+    sem nenhuma importação (ver has_imports) ficam de fora.
+    """
+    partitions = []
+    for clinic in CLINICS:
+        clinic_dir = os.path.join(base_dir, safe_filename(clinic))
+        if not os.path.isdir(clinic_dir):
+            continue
+        for filename in sorted(os.listdir(clinic_dir)):
+            match = _PARTITION_FILE.match(filename)
+            if match and has_imports(os.path.join(clinic_dir, filename)):
+                partitions.append({'clinic': clinic, 'month': int(match.group(2)), 'year': int(match.group(1)), 'path': os.path.join(clinic_dir, filename)})
+    return partitions
+
+class EmptyPartition(Database):
+    """
+    Partição sem banco: lida como um banco vazio, somente leitura, sem criar
+    o arquivo. A primeira importação cria o banco em db_name e passa a usá-lo
+    como um Database comum.
+    """
+    def __init__(self, db_name: str):
+        self.db_name = db_name
+        self.connections = None
+        self._create_lock = threading.Lock()
+        self._empty = sqlite3.connect(':memory:', check_same_thread=False)
+        create_schema(self._empty)
+
+    def _create(self):
+        with self._create_lock:
+            if self.connections is None:
+                os.makedirs(os.path.dirname(self.db_name) or '.', exist_ok=True)
+                connections = ConnectionManager(self.db_name)
+                with connections.writer() as conn:
+                    create_schema(conn)
+                self.connections = connections
+
+    def close(self):
+        if self.connections is not None:
+            super().close()
+        self._empty.close()
+
+    def _read_conn(self):
+        if self.connections is None:
+            return self._empty
+        return super()._read_conn()
+
+    def import_from_csv(self, file_path, table_name):
+        self._create()
+        return super().import_from_csv(file_path, table_name)
+
+    def get_storage_stats(self):
+        if self.connections is not None:
+            return super().get_storage_stats()
+        return {
+            'file_size': 0,
+            'wal_size': 0,
+            'journal_mode': 'sem arquivo',
+            'tables': [
+                {'name': table_name, 'rows': 0, 'indexes': [], 'status_query_plan': '', 'status_query_uses_index': False}
+                for (table_name,) in self._empty.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")
+            ],
+        }
+
+    def run_maintenance(self, action):
+        if self.connections is None:
+            raise ValueError("A partição ainda não tem dados importados: não há manutenção do banco a fazer.")
+        return super().run_maintenance(action)
+
+class PartitionedStorage:
+    """
+    Abre e mantém abertos os bancos das partições usadas, um Database por
+    clínica e competência. Uma partição sem banco é aberta como
+    EmptyPartition, que só cria o arquivo na primeira importação; uma
+    competência arquivada (core.archive) é aberta somente para leitura.
+    update_aggregates() atualiza o histórico de indicadores (core.aggregates)
+    depois de uma importação.
+    """
+    def __init__(self, base_dir: str = PARTITIONS_DIR):
+        self.base_dir = base_dir
+        self._databases = {}
+        self._aggregates = None
+        self._lock = threading.Lock()
+
+    def path(self, clinic: str, month: int, year: int) -> str:
+        return partition_path(clinic, month, year, self.base_dir)
+
+    def exists(self, clinic: str, month: int, year: int) -> bool:
+        return os.path.exists(self.path(clinic, month, year))
+
+    def database(self, clinic: str, month: int, year: int) -> Database:
+        path = self.path(clinic, month, year)
+        with self._lock:
+            db = self._databases.get(path)
+            if db is None:
+                from core.archive import ArchivedDatabase, archive_path, is_archived
+                if not os.path.exists(path) and is_archived(clinic, month, year, self.base_dir):
+                    db = ArchivedDatabase(archive_path(clinic, month, year, self.base_dir))
+                elif os.path.exists(path):
+                    db = Database(path)
+                else:
+                    db = EmptyPartition(path)
+                self._databases[path] = db
+            return db
+
+    def partitions(self) -> list:
+        return list_partitions(self.base_dir)
+
+    @property
+    def aggregates(self):
+        """ Banco dos indicadores mensais, aberto no primeiro uso. """
+        with self._lock:
+            if self._aggregates is None:
+                from core.aggregates import AggregatesStore, aggregates_path
+                self._aggregates = AggregatesStore(aggregates_path(self.base_dir))
+            return self._aggregates
+
+    def import_legacy(self, clinic: str, month: int, year: int, legacy_path: str = LEGACY_DATABASE) -> str:
+        """ import_legacy_database na pasta desta instância; a partição é reaberta no próximo database(). """
+        path = self.path(clinic, month, year)
+        with self._lock:
+            db = self._databases.pop(path, None)
+        if db is not None:
+            db.close()
+        return import_legacy_database(legacy_path, clinic, month, year, self.base_dir)
+
+    def update_aggregates(self, clinic: str, month: int, year: int, tables: list = None) -> dict:
+        """ Recalcula os indicadores da partição que dependem de tables (todos, se None). """
+        from core.aggregates import update_partition
+        return update_partition(self.aggregates, self.database(clinic, month, year), clinic, month, year, tables)
+
+    def close(self):
+        with self._lock:
+            for db in self._databases.values():
+                db.close()
+            self._databases.clear()
+            if self._aggregates is not None:
+                self._aggregates.close()
+                self._aggregates = None
+
+def legacy_has_data(legacy_path: str = LEGACY_DATABASE) -> bool:
+    """ Se o banco único antigo existe e alguma tabela de dados tem linhas (bancos antigos não têm import_log). """
+    if not os.path.isfile(legacy_path):
+        return False
+    try:
+        conn = sqlite3.connect(f"file:{os.path.abspath(legacy_path)}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return False
+    try:
+        for table_name in get_table_configs():
+            try:
+                if conn.execute(f"SELECT 1 FROM {table_name} LIMIT 1").fetchone() is not None:
+                    return True
+            except sqlite3.Error:
+                continue
+        return False
+    finally:
+        conn.close()
+
+def import_legacy_database(legacy_path: str, clinic: str, month: int, year: int, base_dir: str = PARTITIONS_DIR) -> str:
+    """
+    Copia um banco único antigo (database.db) para a partição da clínica e
+    competência informadas. Não sobrescreve uma partição com dados. As tabelas
+    copiadas que não constam de import_log (bancos anteriores a ele) ganham
+    um registro com a data da importação e o número de linhas.
+    Retorna o caminho da partição.
+    """
+    if not os.path.exists(legacy_path):
+        raise FileNotFoundError(f"Banco de dados não encontrado: {legacy_path}")
+    path = partition_path(clinic, month, year, base_dir)
+    if has_imports(path):
+        raise FileExistsError(f"A partição {clinic} {month:02d}/{year} já existe: {path}")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    source = sqlite3.connect(f"file:{os.path.abspath(legacy_path)}?mode=ro", uri=True)
+    target = sqlite3.connect(path)
+    try:
+        source.backup(target)
+        create_schema(target)
+        logged = {row[0] for row in target.execute("SELECT DISTINCT table_name FROM import_log")}
+        for table_name in get_table_configs():
+            if table_name in logged:
+                continue
+            try:
+                data_importacao, rows = target.execute(f"SELECT MAX(data_importacao), COUNT(*) FROM {table_name}").fetchone()
+            except sqlite3.Error:
+                continue
+            if rows:
+                target.execute("INSERT INTO import_log (table_name, data_importacao, linhas) VALUES (?, ?, ?)", (table_name, data_importacao, rows))
+        target.commit()
+    finally:
+        target.close()
+        source.close()
+    return path
@@ -0,0 +1,261 @@
+# core/perf_log.py
+"""
+Registro de desempenho: mede a duração, o número de linhas e o pico de
+memória das etapas de importação, consulta e exportação e grava um registro
+JSON por linha em um arquivo de log rotativo.
+
+Desligado por padrão. É ligado pela variável de ambiente SISSUP_PERF_LOG=1
+ou pela página de Configurações (set_enabled). Desligado, timed() e
+timed_call() custam apenas uma verificação de flag.
+
+O pico de memória vem da memória residente do processo, amostrada por uma
+thread enquanto há alguma operação em andamento (tracemalloc tornaria as
+exportações várias vezes mais lentas).
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from config import PERF_LOG_FILE, PERF_LOG_MAX_BYTES, PERF_LOG_BACKUPS
+
+PERF_LOG_ENV = "SISSUP_PERF_LOG"
+
+_env_value = os.environ.get(PERF_LOG_ENV)
+_enabled = (_env_value or "").strip().lower() in ("1", "true", "sim")
+_log_path = None
+_logger = logging.getLogger("sissup.desempenho")
+_logger.propagate = False
+_handler_lock = threading.Lock()
+_local = threading.local()
+
+# Intervalo de amostragem da memória residente, em segundos.
+MEMORY_SAMPLE_INTERVAL = 0.02
+_active_frames = []
+_frames_lock = threading.Lock()
+_sampler = None
+
+class _MemoryFrame:
+    """ Memória residente no início de uma operação e o maior valor amostrado. """
+    __slots__ = ('start', 'peak')
+
+    def __init__(self, resident: int):
+        self.start = resident
+        self.peak = resident
+
+def _resident_memory() -> int:
+    """ Memória residente atual do processo, em bytes (0 se não disponível). """
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [
+                    ('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                    ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                    ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                    ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t),
+                ]
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+            return 0
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError, IndexError):
+        return 0
+
+def _sample_memory():
+    while True:
+        time.sleep(MEMORY_SAMPLE_INTERVAL)
+        with _frames_lock:
+            if not _active_frames:
+                continue
+        resident = _resident_memory()
+        with _frames_lock:
+            for frame in _active_frames:
+                frame.peak = max(frame.peak, resident)
+
+def _ensure_sampler():
+    global _sampler
+    with _frames_lock:
+        if _sampler is None:
+            _sampler = threading.Thread(target=_sample_memory, name="perf_log_memoria", daemon=True)
+            _sampler.start()
+
+def is_enabled() -> bool:
+    return _enabled
+
+def is_set_by_environment() -> bool:
+    """ Indica se a variável de ambiente já estava definida ao iniciar o processo. """
+    return _env_value is not None
+
+def set_enabled(enabled: bool):
+    """
+    Liga ou desliga o registro. O valor também é gravado na variável de
+    ambiente, para valer nos processos filhos da exportação em lote.
+    """
+    global _enabled
+    _enabled = bool(enabled)
+    os.environ[PERF_LOG_ENV] = "1" if _enabled else "0"
+
+def log_path() -> str:
+    """ Arquivo de log atual (por padrão, PERF_LOG_FILE na pasta de trabalho, ao lado do banco). """
+    return _log_path or os.path.abspath(PERF_LOG_FILE)
+
+def configure(path: str):
+    """ Troca o arquivo de log. """
+    global _log_path
+    with _handler_lock:
+        _log_path = os.path.abspath(path)
+        for handler in list(_logger.handlers):
+            _logger.removeHandler(handler)
+            handler.close()
+
+def _write(record: dict):
+    captured = getattr(_local, 'captured', None)
+    if captured is not None:
+        captured.append(record)
+        return
+    with _handler_lock:
+        if not _logger.handlers:
+            handler = RotatingFileHandler(log_path(), maxBytes=PERF_LOG_MAX_BYTES, backupCount=PERF_LOG_BACKUPS, encoding='utf-8')
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _logger.addHandler(handler)
+            _logger.setLevel(logging.INFO)
+    _logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+def write_records(records: list):
+    """ Grava registros coletados em outro processo (ver capture). """
+    for record in records:
+        _write(record)
+
+def _log_files() -> list:
+    """ Arquivo de log atual e os rotacionados, do mais antigo para o mais novo. """
+    path = log_path()
+    return [f"{path}.{index}" for index in range(PERF_LOG_BACKUPS, 0, -1)] + [path]
+
+def read_records(max_records: int = 5000) -> list:
+    """ Últimos registros gravados (incluindo os arquivos rotacionados), em ordem cronológica. """
+    records = []
+    with _handler_lock:
+        for handler in _logger.handlers:
+            handler.flush()
+    for path in _log_files():
+        try:
+            with open(path, encoding='utf-8') as log_file:
+                for line in log_file:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            continue
+    return records[-max_records:]
+
+def clear_log():
+    """ Apaga o log atual e os rotacionados. """
+    with _handler_lock:
+        for handler in list(_logger.handlers):
+            _logger.removeHandler(handler)
+            handler.close()
+        for path in _log_files():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+@contextmanager
+def capture():
+    """
+    Guarda os registros da thread atual em uma lista em vez de gravá-los.
+    Usado nos processos filhos, que devolvem os registros ao processo
+    principal: só ele escreve no arquivo, evitando rotações concorrentes.
+    """
+    previous = getattr(_local, 'captured', None)
+    _local.captured = []
+    try:
+        yield _local.captured
+    finally:
+        _local.captured = previous
+
+@contextmanager
+def timed(operation: str, **fields):
+    """
+    Mede o bloco e grava um registro com operacao, linhas, duracao_ms e
+    memoria_pico_mb (quanto a memória residente do processo subiu acima do
+    valor do início; inclui outras threads que rodem ao mesmo tempo).
+
+    O bloco recebe o dicionário do registro e pode preencher 'linhas' ou
+    outros campos. Uma exceção é registrada em 'erro' e propagada.
+    """
+    record = {'operacao': operation, 'linhas': None, **fields}
+    if not _enabled:
+        yield record
+        return
+
+    _ensure_sampler()
+    frame = _MemoryFrame(_resident_memory())
+    with _frames_lock:
+        _active_frames.append(frame)
+
+    started_at = datetime.now()
+    start = time.perf_counter()
+    try:
+        yield record
+    except BaseException as e:
+        record['erro'] = type(e).__name__
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        resident = _resident_memory()
+        with _frames_lock:
+            _active_frames.remove(frame)
+        peak = max(frame.peak, resident)
+        record = {
+            'inicio': started_at.isoformat(timespec='milliseconds'),
+            **record,
+            'duracao_ms': round(duration * 1000, 1),
+            'memoria_pico_mb': round((peak - frame.start) / (1024 * 1024), 2),
+        }
+        _write(record)
+
+def _count_rows(result):
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+def timed_call(operation: str = None, rows=None):
+    """
+    Decorador equivalente a timed() para uma função inteira. A operação
+    padrão é o nome qualificado da função. rows(*args, **kwargs) informa o
+    número de linhas a partir dos argumentos; sem ele, usa len(resultado).
+    """
+    def decorator(func):
+        name = operation or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with timed(name) as record:
+                if rows is not None:
+                    record['linhas'] = rows(*args, **kwargs)
+                result = func(*args, **kwargs)
+                if rows is None:
+                    record['linhas'] = _count_rows(result)
+                return result
+        return wrapper
+    return decorator
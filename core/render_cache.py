@@ -0,0 +1,111 @@
+# core/render_cache.py
+"""
+Cache em disco dos arquivos de relatório já renderizados. Uma exportação
+repetida com as mesmas entradas vira uma simples cópia de arquivo.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+
+from config import RENDER_CACHE_DIR
+
+# Incrementar quando a renderização mudar, para invalidar arquivos antigos.
+CACHE_FORMAT_VERSION = 1
+
+def cache_dir_for(db_name: str) -> str:
+    """ Pasta do cache de um banco de dados (RENDER_CACHE_DIR, ao lado do arquivo do banco). """
+    return os.path.join(os.path.dirname(os.path.abspath(db_name)), RENDER_CACHE_DIR)
+
+class RenderCache:
+    """
+    Guarda os bytes renderizados indexados por (classe do relatório,
+    parâmetros, versões de importação das tabelas de origem, formato).
+
+    O tamanho total é limitado a max_bytes; ao ultrapassar, os arquivos
+    usados há mais tempo são removidos (LRU pela data de modificação, que é
+    atualizada a cada acerto).
+
+    Observação: o arquivo copiado do cache mantém o "Emitido em" do PDF da
+    primeira geração.
+    """
+    def __init__(self, cache_dir: str, max_bytes: int = 200 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key_for(self, report, file_format: str) -> str:
+        report_class = type(report)
+        payload = {
+            'cache_version': CACHE_FORMAT_VERSION,
+            'report': f"{report_class.__module__}.{report_class.__qualname__}",
+            'params': report.params,
+            'database': os.path.abspath(report.db.db_name),
+            'imports': report.db.get_import_versions(report.source_tables),
+            'format': file_format.lower(),
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.bin")
+
+    def fetch(self, key: str, dest_path: str) -> bool:
+        """ Copia a entrada para dest_path. Retorna False se não estiver no cache. """
+        entry = self._entry_path(key)
+        if not os.path.exists(entry):
+            return False
+        directory, filename = os.path.split(os.path.abspath(dest_path))
+        tmp_path = os.path.join(directory, f".{filename}.{uuid.uuid4().hex[:8]}")
+        try:
+            shutil.copyfile(entry, tmp_path)
+            os.replace(tmp_path, dest_path)
+        except FileNotFoundError:
+            # A entrada foi removida por outra instância entre a verificação e a cópia.
+            return False
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        os.utime(entry)
+        return True
+
+    def store(self, key: str, src_path: str):
+        entry = self._entry_path(key)
+        tmp_path = f"{entry}.{uuid.uuid4().hex[:8]}.tmp"
+        shutil.copyfile(src_path, tmp_path)
+        os.replace(tmp_path, entry)
+        self._evict()
+
+    def size(self) -> int:
+        return sum(size for _, _, size in self._entries())
+
+    def clear(self):
+        for path, _, _ in self._entries():
+            os.remove(path)
+
+    def _entries(self):
+        entries = []
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith('.bin'):
+                continue
+            path = os.path.join(self.cache_dir, filename)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -1,17 +1,40 @@
+import os
+import uuid
 import pandas as pd
 from abc import ABC, abstractmethod
 from core.database import Database
+from core.engines import engine_for
 from core.utils import resource_path
+from core import perf_log
 from reportlab.lib.pagesizes import letter, landscape
 from core.exporter import (
-    export_to_excel, export_simple_excel, export_fistulas_to_excel,
-    export_to_pdf, export_fistulas_to_pdf, export_continuidade_to_pdf
+    export_workbook, export_to_pdf, export_fistulas_to_pdf, export_continuidade_to_pdf
 )
 
+# Etapas reportadas por BaseReport.export, na ordem em que acontecem.
+REPORT_STAGES = ('query', 'transform', 'render', 'write')
+
+CLINIC_LOGOS = {
+    "Renal Clínica": "logo_renal_clinica.png",
+    "Instituto do Rim": "logo_instituto_rim.png",
+    "Nefron Clínica": "logo_nefron_clinica.png",
+    "CNN": "logo_cnn.png",
+    "Pronto Rim": "logo_pronto_rim.png",
+    "Clínica do Rim": "logo_clinica_do_rim.png",
+    "Hospital do Rim": "logo_hospital_do_rim.png",
+}
+
+class EmptyReportError(ValueError):
+    """ Levantada por prepare() quando o relatório não tem linhas a exportar. """
+
 class BaseReport(ABC):
 
+    # Tabelas lidas por get_data; usadas para identificar a versão das entradas no cache.
+    source_tables = []
+
     def __init__(self, db: Database, logo_path: str, **kwargs):
-        self.db = db
+        # As consultas passam pelo motor de QUERY_ENGINE (core.engines).
+        self.db = engine_for(db)
         self.default_logo_path = logo_path
         self.params = kwargs
 
@@ -35,33 +58,28 @@ class BaseReport(ABC):
     def filter_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         return df
 
-    def export(self, file_path: str, file_format: str):
-        df_raw = self.get_data()
-        df_final = self.filter_dataframe(df_raw)
+    def get_logo_path(self) -> str:
+        logo_filename = CLINIC_LOGOS.get(self.params.get('clinic', ''), 'logo.png')
+        return resource_path(f'assets/{logo_filename}')
 
+    def prepare(self, df_raw: pd.DataFrame):
+        """
+        Aplica o filtro do relatório sobre os dados brutos e calcula o resumo.
+        Retorna a tupla (DataFrame final, resumo).
+        """
+        df_final = self.filter_dataframe(df_raw)
         if df_final.empty:
-            raise ValueError(f"Não foram encontrados dados para o relatório '{self.title}'.")
-
-        summary = self.get_summary(df_final)
-
-        for col in ['HD', 'Extras']:
-            if col in df_final.columns:
-                df_final[col] = df_final[col].astype(object)
-                df_final.loc[df_final[col] == 0, col] = ''
-
-        clinic_name = self.params.get('clinic', '')
-        logo_file_map = {
-            "Renal Clínica": "logo_renal_clinica.png",
-            "Instituto do Rim": "logo_instituto_rim.png",
-            "Nefron Clínica": "logo_nefron_clinica.png",
-            "CNN": "logo_cnn.png",
-            "Pronto Rim": "logo_pronto_rim.png",
-            "Clínica do Rim": "logo_clinica_do_rim.png",
-            "Hospital do Rim": "logo_hospital_do_rim.png",
-        }
-        logo_filename = logo_file_map.get(clinic_name, 'logo.png')
-        logo_to_use = resource_path(f'assets/{logo_filename}')
+            raise EmptyReportError(f"Não foram encontrados dados para o relatório '{self.title}'.")
+        return df_final, self.get_summary(df_final)
+
+    def excel_sheet(self, df: pd.DataFrame, summary: dict) -> tuple:
+        """
+        Descreve a aba deste relatório para exporter.export_workbook:
+        (nome_da_aba, df, resumo, título_do_resumo).
+        """
+        return (self.sheet_name, df, summary, "RESUMO GERAL")
 
+    def render(self, df: pd.DataFrame, summary: dict, file_path: str, file_format: str):
         col_widths = None
         if isinstance(self, EntradaReport):
             col_widths = ['28%', '15%', '7%', '9%', '9%', '10%', '22%']
@@ -71,12 +89,58 @@ class BaseReport(ABC):
             col_widths = ['30%', '20%', '7%', '10%', '7%', '26%']
 
         if file_format.lower() == 'excel':
-            export_to_excel(df_final, file_path, self.sheet_name, summary)
+            export_workbook([self.excel_sheet(df, summary)], file_path)
         elif file_format.lower() == 'pdf':
-            export_to_pdf(df_final, file_path, logo_to_use, self.title, summary, pagesize=letter, col_widths=col_widths)
+            export_to_pdf(df, file_path, self.get_logo_path(), self.title, summary, pagesize=letter, col_widths=col_widths)
         else:
             raise NotImplementedError(f"Formato de arquivo '{file_format}' não suportado.")
 
+    def export(self, file_path: str, file_format: str, progress=None, cache=None):
+        """
+        Gera o relatório e grava em file_path. Se informado, progress(etapa) é
+        chamado no início de cada etapa de REPORT_STAGES; o callback pode lançar
+        uma exceção para interromper a exportação entre etapas.
+
+        A renderização é feita em um arquivo temporário na mesma pasta, que só
+        substitui o destino ao final, para não deixar arquivos pela metade.
+        Com um RenderCache, uma exportação com as mesmas entradas é copiada do
+        cache sem consultar nem renderizar novamente.
+        """
+        notify = progress or (lambda stage: None)
+        fields = {'relatorio': type(self).__name__, 'formato': file_format, 'clinica': self.params.get('clinic')}
+
+        with perf_log.timed('relatorio.export', **fields) as total:
+            notify('query')
+            with perf_log.timed('relatorio.query', **fields) as record:
+                cache_key = cache.key_for(self, file_format) if cache is not None else None
+                if cache_key and cache.fetch(cache_key, file_path):
+                    record['cache'] = total['cache'] = True
+                    notify('write')
+                    return
+                df_raw = self.get_data()
+                record['linhas'] = len(df_raw)
+
+            notify('transform')
+            with perf_log.timed('relatorio.transform', **fields) as record:
+                df_final, summary = self.prepare(df_raw)
+                record['linhas'] = total['linhas'] = len(df_final)
+
+            notify('render')
+            directory, filename = os.path.split(os.path.abspath(file_path))
+            stem, extension = os.path.splitext(filename)
+            tmp_path = os.path.join(directory, f".{stem}.{uuid.uuid4().hex[:8]}{extension}")
+            try:
+                with perf_log.timed('relatorio.render', linhas=len(df_final), **fields):
+                    self.render(df_final, summary, tmp_path, file_format)
+                notify('write')
+                with perf_log.timed('relatorio.write', linhas=len(df_final), **fields):
+                    if cache_key:
+                        cache.store(cache_key, tmp_path)
+                    os.replace(tmp_path, file_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
 class GeralReport(BaseReport):
     @property
     def title(self) -> str:
@@ -86,6 +150,7 @@ class GeralReport(BaseReport):
         return f"Geral - {clinic} - {month:02d}.{year}"
 
     sheet_name = "Geral"
+    source_tables = ['laudos_apac', 'estatistica_mensal', 'eventos_cateter', 'faturamento_geral']
 
     def get_data(self) -> pd.DataFrame:
         return self.db.generate_geral_report_data()
@@ -94,13 +159,12 @@ class GeralReport(BaseReport):
         month = self.params.get('month')
         year = self.params.get('year')
 
-        df_filtered = df[df['Saída'].str.strip() == ''].copy()
-        df_filtered['Entrada_dt'] = pd.to_datetime(df_filtered['Entrada'], format='%d/%m/%Y', errors='coerce')
+        df_filtered = df[df['Saída'].str.strip() == '']
 
         df_row_filtered = df_filtered[
             ~(
-                (df_filtered['Entrada_dt'].dt.month == month) &
-                (df_filtered['Entrada_dt'].dt.year == year)
+                (df_filtered['Entrada'].dt.month == month) &
+                (df_filtered['Entrada'].dt.year == year)
             )
         ].copy()
 
@@ -161,10 +225,9 @@ class EntradaReport(GeralReport):
         month = self.params.get('month')
         year = self.params.get('year')
 
-        df['Entrada_dt'] = pd.to_datetime(df['Entrada'], format='%d/%m/%Y', errors='coerce')
         df_filtered = df[
-            (df['Entrada_dt'].dt.month == month) &
-            (df['Entrada_dt'].dt.year == year) &
+            (df['Entrada'].dt.month == month) &
+            (df['Entrada'].dt.year == year) &
             (df['Saída'].str.strip() == '')
         ].copy()
 
@@ -201,6 +264,7 @@ class FistulasReport(BaseReport):
         return f"Fístulas - {clinic}"
 
     sheet_name = "Procedimentos FAV"
+    source_tables = ['eventos_cateter', 'laudos_apac']
 
     def get_data(self) -> pd.DataFrame:
         return self.db.generate_fistulas_report_data()
@@ -214,29 +278,16 @@ class FistulasReport(BaseReport):
             summary[f"Total de {procedure}"] = count
         return summary
 
-    def export(self, file_path: str, file_format: str):
-        df = self.get_data()
-        if df.empty:
-            raise ValueError(f"Não foram encontrados dados para o relatório '{self.title}'.")
-        summary = self.get_summary(df)
-
-        clinic_name = self.params.get('clinic', '')
-        logo_file_map = {
-            "Renal Clínica": "logo_renal_clinica.png",
-            "Instituto do Rim": "logo_instituto_rim.png",
-            "Nefron Clínica": "logo_nefron_clinica.png",
-            "CNN": "logo_cnn.png",
-            "Pronto Rim": "logo_pronto_rim.png",
-            "Clínica do Rim": "logo_clinica_do_rim.png",
-            "Hospital do Rim": "logo_hospital_do_rim.png",
-        }
-        logo_filename = logo_file_map.get(clinic_name, 'logo.png')
-        logo_to_use = resource_path(f'assets/{logo_filename}')
+    def excel_sheet(self, df: pd.DataFrame, summary: dict) -> tuple:
+        return (self.sheet_name, df, summary, "RESUMO DE PROCEDIMENTOS")
 
+    def render(self, df: pd.DataFrame, summary: dict, file_path: str, file_format: str):
         if file_format.lower() == 'excel':
-            export_fistulas_to_excel(df, file_path, totals=summary)
+            export_workbook([self.excel_sheet(df, summary)], file_path)
         elif file_format.lower() == 'pdf':
-            export_fistulas_to_pdf(df, file_path, logo_to_use, totals=summary)
+            export_fistulas_to_pdf(df, file_path, self.get_logo_path(), totals=summary)
+        else:
+            raise NotImplementedError(f"Formato de arquivo '{file_format}' não suportado.")
 
 class ContinuidadeReport(BaseReport):
     @property
@@ -247,38 +298,28 @@ class ContinuidadeReport(BaseReport):
         return f"Continuidade - {clinic} - {month:02d}.{year}"
 
     sheet_name = "Continuidade"
+    source_tables = ['laudos_apac']
 
     def get_data(self) -> pd.DataFrame:
         month = self.params.get('month')
         year = self.params.get('year')
         return self.db.generate_continuidade_report_data(month, year)
 
-    def export(self, file_path: str, file_format: str):
-        df = self.get_data()
-        if df.empty:
-            raise ValueError(f"Não foram encontrados dados para o relatório '{self.title}'.")
-
-        clinic_name = self.params.get('clinic', '')
-        logo_file_map = {
-            "Renal Clínica": "logo_renal_clinica.png",
-            "Instituto do Rim": "logo_instituto_rim.png",
-            "Nefron Clínica": "logo_nefron_clinica.png",
-            "CNN": "logo_cnn.png",
-            "Pronto Rim": "logo_pronto_rim.png",
-            "Clínica do Rim": "logo_clinica_do_rim.png",
-            "Hospital do Rim": "logo_hospital_do_rim.png",
-        }
-        logo_filename = logo_file_map.get(clinic_name, 'logo.png')
-        logo_to_use = resource_path(f'assets/{logo_filename}')
+    def excel_sheet(self, df: pd.DataFrame, summary: dict) -> tuple:
+        return (self.sheet_name, df, None, None)
 
+    def render(self, df: pd.DataFrame, summary: dict, file_path: str, file_format: str):
         if file_format.lower() == 'excel':
-            export_simple_excel(df, file_path, sheet_name=self.sheet_name)
+            export_workbook([self.excel_sheet(df, summary)], file_path)
         elif file_format.lower() == 'pdf':
-            export_continuidade_to_pdf(df, file_path, logo_to_use, self.title)
+            export_continuidade_to_pdf(df, file_path, self.get_logo_path(), self.title)
+        else:
+            raise NotImplementedError(f"Formato de arquivo '{file_format}' não suportado.")
 
 class ConvenioGeralReport(BaseReport):
     title = "Relatório Geral de Faturamento Convênio"
     sheet_name = "Geral Convenio"
+    source_tables = ['faturamento_convenio']
 
     def get_data(self) -> pd.DataFrame:
         return self.db.generate_convenio_geral_data()
@@ -286,15 +327,34 @@ class ConvenioGeralReport(BaseReport):
     def get_summary(self, df: pd.DataFrame) -> dict:
         return self.db.calculate_convenio_summary()
 
-    def export(self, file_path: str, file_format: str):
-        df_display = self.get_data()
-        if df_display.empty:
-            raise ValueError(f"Não foram encontrados dados para o relatório '{self.title}'.")
-        summary = self.get_summary(df_display)
+    def render(self, df: pd.DataFrame, summary: dict, file_path: str, file_format: str):
         if file_format.lower() == 'excel':
-            export_to_excel(df_display, file_path, self.sheet_name, totals=summary)
+            export_workbook([self.excel_sheet(df, summary)], file_path)
         elif file_format.lower() == 'pdf':
-            export_to_pdf(df_display, file_path, self.default_logo_path, self.title, summary, pagesize=landscape(letter))
+            export_to_pdf(df, file_path, self.default_logo_path, self.title, summary, pagesize=landscape(letter))
+        else:
+            raise NotImplementedError(f"Formato de arquivo '{file_format}' não suportado.")
+
+class RemarcacoesReport(BaseReport):
+    @property
+    def title(self) -> str:
+        month = self.params.get('month', 0)
+        year = self.params.get('year', 0)
+        clinic = self.params.get('clinic', 'Clínica')
+        return f"Remarcações - {clinic} - {month:02d}.{year}"
+
+    sheet_name = "Remarcações"
+    source_tables = ['sessoes_hd']
+
+    def get_data(self) -> pd.DataFrame:
+        return self.db.get_remarcacoes_data()
+
+    def excel_sheet(self, df: pd.DataFrame, summary: dict) -> tuple:
+        return (self.sheet_name, df, None, None)
+
+    def render(self, df: pd.DataFrame, summary: dict, file_path: str, file_format: str):
+        if file_format.lower() == 'excel':
+            export_workbook([self.excel_sheet(df, summary)], file_path)
         else:
             raise NotImplementedError(f"Formato de arquivo '{file_format}' não suportado.")
 
@@ -305,4 +365,5 @@ REPORT_REGISTRY = {
     "Fístulas": FistulasReport,
     "Continuidade": ContinuidadeReport,
     "Geral Convênio": ConvenioGeralReport,
+    "Remarcações": RemarcacoesReport,
 }
\ No newline at end of file
@@ -0,0 +1,107 @@
+# core/status_service.py
+"""
+Busca a situação das importações (cartões de importação e de correções) fora
+da thread da interface, em uma única consulta por atualização.
+"""
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+class ImportStatusSignals(QObject):
+    finished = Signal(object)
+
+class ImportStatusJob(QRunnable):
+    def __init__(self, db, table_names: list, include_remarcacoes: bool):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.db = db
+        self.table_names = table_names
+        self.include_remarcacoes = include_remarcacoes
+        self.signals = ImportStatusSignals()
+
+    @Slot()
+    def run(self):
+        try:
+            result = self.db.get_import_statuses(self.table_names, self.include_remarcacoes)
+        except Exception as e:
+            print(f"Aviso: não foi possível consultar a situação das importações: {e}")
+            result = {'tables': {}}
+        self.signals.finished.emit(result)
+
+class ImportStatusService(QObject):
+    """
+    statuses_ready(resultado) entrega o dicionário de
+    Database.get_import_statuses. Pedidos feitos enquanto uma consulta está
+    em andamento são agrupados em uma única consulta seguinte.
+
+    O último resultado de cada tabela fica em cache (cached_status), para a
+    tela mostrar algo imediatamente enquanto a consulta não volta.
+    """
+    statuses_ready = Signal(object)
+
+    def __init__(self, db, parent: QObject = None):
+        super().__init__(parent)
+        self.db = db
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._job = None
+        self._pending_tables = []
+        self._pending_remarcacoes = False
+        self._cache = {}
+        self._remarcacoes_count = None
+
+    def prime(self, result: dict):
+        """ Preenche o cache com um resultado obtido por outro caminho (ex.: aquecimento inicial). """
+        self._store(result)
+
+    def set_database(self, db):
+        """
+        Troca o banco consultado (ex.: outra clínica ou competência) e limpa o
+        cache. Sem banco (None), refresh não faz nada.
+        """
+        self.db = db
+        self._cache = {}
+        self._remarcacoes_count = None
+        self._pending_tables = []
+        self._pending_remarcacoes = False
+
+    def cached_status(self, table_name: str):
+        """ Retorna (conhecido, info). info é None quando a tabela está vazia. """
+        return (table_name in self._cache, self._cache.get(table_name))
+
+    def cached_remarcacoes_count(self):
+        return self._remarcacoes_count
+
+    def refresh(self, table_names, include_remarcacoes: bool = False):
+        self._pending_tables.extend(t for t in table_names if t not in self._pending_tables)
+        self._pending_remarcacoes = self._pending_remarcacoes or include_remarcacoes
+        if self._job is None:
+            self._start_next()
+
+    def _start_next(self):
+        if self.db is None or (not self._pending_tables and not self._pending_remarcacoes):
+            return
+        self._job = ImportStatusJob(self.db, self._pending_tables, self._pending_remarcacoes)
+        self._pending_tables = []
+        self._pending_remarcacoes = False
+        self._job.signals.finished.connect(self._on_job_finished)
+        self.pool.start(self._job)
+
+    def _store(self, result: dict):
+        self._cache.update(result.get('tables', {}))
+        if 'remarcacoes_count' in result:
+            self._remarcacoes_count = result['remarcacoes_count']
+
+    @Slot(object)
+    def _on_job_finished(self, result: dict):
+        job, self._job = self._job, None
+        if job is not None and job.db is not self.db:
+            # Resultado de um banco que já foi trocado: descartado.
+            self._start_next()
+            return
+        self._store(result)
+        self.statuses_ready.emit(result)
+        self._start_next()
+
+    def wait(self):
+        """ Aguarda a consulta em andamento (usado ao encerrar). """
+        self.pool.waitForDone()
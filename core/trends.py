@@ -0,0 +1,116 @@
+# core/trends.py
+"""
+Relatório de tendência: a evolução mês a mês dos indicadores de uma
+clínica (ou da rede toda) nas últimas competências, lida só do histórico
+de indicadores (core/aggregates.py), sem consultar as linhas brutas.
+"""
+
+import os
+
+import pandas as pd
+from reportlab.lib.pagesizes import letter, landscape
+
+from config import PARTITIONS_DIR
+from core.aggregates import AggregatesStore, KPI_LABELS, aggregates_path
+from core.exporter import export_trend_workbook, export_to_pdf
+from core.reports import BaseReport, EmptyReportError
+from core.utils import format_brl
+
+# Indicadores mostrados na tendência, na ordem das colunas.
+TREND_KPIS = ['pacientes', 'sessoes_totais', 'sessoes_hd', 'sessoes_extras', 'cdl', 'guias_convenio', 'sessoes_convenio', 'valor_convenio']
+TREND_CHARTS = ['Sessões Totais', 'Pacientes', 'CDL', 'Valor Convênio']
+
+def competencias(month: int, year: int, months: int) -> list:
+    """ As months competências terminadas em month/year, da mais antiga à mais recente, como (ano, mês). """
+    index = year * 12 + (month - 1)
+    return [(i // 12, i % 12 + 1) for i in range(index - months + 1, index + 1)]
+
+def _variation(current, previous):
+    if pd.isna(current) or pd.isna(previous) or not previous:
+        return pd.NA
+    return round((current - previous) / previous * 100, 1)
+
+def _format_variation(value) -> str:
+    if pd.isna(value):
+        return "-"
+    return f"{value:+.1f}%".replace('.', ',')
+
+class TrendReport(BaseReport):
+    """
+    Tendência dos últimos months meses (padrão 12) até month/year, para a
+    clínica de clinic ou, sem ela, para a soma de todas as clínicas. db é
+    ignorado (pode ser None): o histórico vem de base_dir (padrão
+    PARTITIONS_DIR). Meses sem indicadores aparecem em branco.
+    """
+    sheet_name = "Tendência"
+
+    @property
+    def title(self) -> str:
+        month = self.params.get('month', 0)
+        year = self.params.get('year', 0)
+        clinic = self.params.get('clinic') or 'Rede'
+        return f"Tendência - {clinic} - {self.params.get('months', 12)} meses até {month:02d}.{year}"
+
+    def get_data(self) -> pd.DataFrame:
+        path = aggregates_path(self.params.get('base_dir', PARTITIONS_DIR))
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        periods = competencias(self.params.get('month'), self.params.get('year'), self.params.get('months', 12))
+        clinic = self.params.get('clinic')
+        store = AggregatesStore(path)
+        try:
+            history = store.history(periods[0], periods[-1], [clinic] if clinic else None)
+        finally:
+            store.close()
+        if history.empty:
+            return pd.DataFrame()
+
+        index = pd.MultiIndex.from_tuples(periods, names=['ano', 'mes'])
+        df = history.pivot_table(index=['ano', 'mes'], columns='indicador', values='valor', aggfunc='sum')
+        df = df.reindex(index=index, columns=TREND_KPIS)
+        clinics = history.drop_duplicates(['ano', 'mes', 'clinica']).groupby(['ano', 'mes']).size().reindex(index)
+
+        df.columns = [KPI_LABELS[kpi] for kpi in TREND_KPIS]
+        for column in df.columns:
+            df[column] = df[column].astype('Float64').round(2) if column == 'Valor Convênio' else df[column].round().astype('Int64')
+        df.insert(0, 'Competência', [f"{month:02d}/{year}" for year, month in periods])
+        if not clinic:
+            df.insert(1, 'Clínicas', clinics.fillna(0).astype(int).to_numpy())
+        df = df.reset_index(drop=True)
+        df['Var. Sessões (%)'] = [pd.NA] + [_variation(c, p) for p, c in zip(df['Sessões Totais'], df['Sessões Totais'][1:])]
+        df['Var. Valor (%)'] = [pd.NA] + [_variation(c, p) for p, c in zip(df['Valor Convênio'], df['Valor Convênio'][1:])]
+        df['Var. Sessões (%)'] = df['Var. Sessões (%)'].astype('Float64')
+        df['Var. Valor (%)'] = df['Var. Valor (%)'].astype('Float64')
+        return df
+
+    def prepare(self, df_raw: pd.DataFrame):
+        if df_raw.empty:
+            raise EmptyReportError(f"Não há histórico de indicadores para '{self.title}'. Importe os dados ou recalcule os indicadores.")
+        return df_raw, self.get_summary(df_raw)
+
+    def get_summary(self, df: pd.DataFrame) -> dict:
+        with_data = df[df['Sessões Totais'].notna() | df['Valor Convênio'].notna()]
+        last = with_data.iloc[-1]
+        sessions = df['Sessões Totais'].dropna()
+        values = df['Valor Convênio'].dropna()
+        return {
+            "Última Competência": last['Competência'],
+            "Sessões Totais": int(last['Sessões Totais']) if pd.notna(last['Sessões Totais']) else "-",
+            "Variação de Sessões": _format_variation(last['Var. Sessões (%)']),
+            "Média Mensal de Sessões": int(round(sessions.mean())) if len(sessions) else "-",
+            "Valor Convênio": format_brl(float(last['Valor Convênio'])) if pd.notna(last['Valor Convênio']) else "-",
+            "Variação do Valor": _format_variation(last['Var. Valor (%)']),
+            "Média Mensal do Valor": format_brl(float(values.mean())) if len(values) else "-",
+            "Meses com Dados": f"{len(with_data)} de {len(df)}",
+        }
+
+    def excel_sheet(self, df: pd.DataFrame, summary: dict) -> tuple:
+        return (self.sheet_name, df, summary, "RESUMO")
+
+    def render(self, df: pd.DataFrame, summary: dict, file_path: str, file_format: str):
+        if file_format.lower() == 'excel':
+            export_trend_workbook(df, file_path, self.sheet_name, summary, 'Competência', TREND_CHARTS)
+        elif file_format.lower() == 'pdf':
+            export_to_pdf(df, file_path, self.get_logo_path(), self.title, summary, pagesize=landscape(letter))
+        else:
+            raise NotImplementedError(f"Formato de arquivo '{file_format}' não suportado.")
@@ -11,4 +11,12 @@ def resource_path(relative_path):
         # Se não estiver empacotado, o caminho base é o diretório do projeto
         base_path = os.path.abspath(".")
 
-    return os.path.join(base_path, relative_path)
\ No newline at end of file
+    return os.path.join(base_path, relative_path)
+
+def safe_filename(title):
+    """ Converte o título de um relatório em um nome de arquivo estável. """
+    return title.replace('/', '-').replace('\\', '-').replace(' ', '_')
+
+def format_brl(value):
+    """ Formata um número como moeda brasileira (ex.: R$ 1.234,56). """
+    return f"R$ {value:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
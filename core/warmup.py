@@ -0,0 +1,86 @@
+# core/warmup.py
+"""
+Aquecimento em segundo plano logo após a janela aparecer: importa as
+bibliotecas de dados, prepara o armazenamento particionado, abre a partição
+alterada mais recentemente e busca a situação das importações dos módulos do
+menu nela, para que a primeira ação do usuário não pague esses custos. As
+demais partições só são abertas quando o período é escolhido.
+"""
+
+import importlib
+import os
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, Signal, Slot
+
+from config import SIDEBAR_CONFIG, REPORT_DEFINITIONS
+
+# Ordem das importações: do mais usado (abrir um módulo) ao menos usado (exportar).
+WARMUP_MODULES = (
+    'pandas',
+    'core.database',
+    'core.partitions',
+    'ui.relatorio_widget',
+    'core.reports',
+    'core.exporter',
+    'core.batch',
+)
+
+def sidebar_import_tables() -> list:
+    """ Tabelas de importação de todos os módulos de relatório do menu lateral. """
+    tables = []
+    for item in SIDEBAR_CONFIG:
+        for module in item.get("modules", [item]):
+            definition = REPORT_DEFINITIONS.get(module.get("report_name"), {})
+            tables.extend(t for t in definition.get("imports", []) if t not in tables)
+    return tables
+
+class WarmupSignals(QObject):
+    step = Signal(str)
+    finished = Signal(object, str)
+
+class WarmupJob(QRunnable):
+    """
+    Executa o aquecimento. finished(resultado, erro) entrega um dicionário com
+    'storage' (PartitionedStorage pronto para uso), 'db' (a partição alterada
+    mais recentemente, já aberta em storage, ou None se não houver partições)
+    e 'import_status' (Database.get_import_statuses de db, incluindo o total
+    de remarcações).
+    """
+    def __init__(self, base_dir: str = None):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.base_dir = base_dir
+        self.signals = WarmupSignals()
+        self._done_event = threading.Event()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._done_event.wait(timeout)
+
+    @Slot()
+    def run(self):
+        try:
+            self.signals.step.emit("Carregando bibliotecas")
+            for module_name in WARMUP_MODULES[:3]:
+                importlib.import_module(module_name)
+
+            from core.partitions import PartitionedStorage
+            storage = PartitionedStorage(self.base_dir) if self.base_dir else PartitionedStorage()
+            result = {'storage': storage, 'db': None, 'import_status': None}
+
+            self.signals.step.emit("Abrindo banco de dados")
+            partitions = storage.partitions()
+            if partitions:
+                latest = max(partitions, key=lambda partition: os.path.getmtime(partition['path']))
+                db = storage.database(latest['clinic'], latest['month'], latest['year'])
+                result['db'] = db
+                result['import_status'] = db.get_import_statuses(sidebar_import_tables(), include_remarcacoes=True)
+
+            self.signals.step.emit("Preparando relatórios")
+            for module_name in WARMUP_MODULES[3:]:
+                importlib.import_module(module_name)
+            self.signals.finished.emit(result, "")
+        except Exception as e:
+            self.signals.finished.emit(None, str(e))
+        finally:
+            self._done_event.set()
@@ -43,6 +43,20 @@ QPushButton, #menuTree::item, #lobbyCard {{
     font-size: 12pt;
     font-weight: 600;
 }}
+#warmupLabel {{
+    color: {COLORS['dark-text']};
+    font-size: 9pt;
+    font-weight: normal;
+}}
+#warmupProgress {{
+    background-color: {COLORS['dark-secondary']};
+    border: none;
+    border-radius: 3px;
+}}
+#warmupProgress::chunk {{
+    background-color: {COLORS['primary']};
+    border-radius: 3px;
+}}
 #menuToggleButton {{
     color: {COLORS['dark-text']};
     background-color: {COLORS['dark-secondary']};
@@ -176,7 +190,16 @@ QFrame#card {{
     min-width: 280px;
     max-width: 310px;
 }}
-#card QPushButton {{
+QFrame#settingsPanel {{
+    background-color: #ffffff;
+    border: 1px solid {COLORS['border']};
+    border-radius: 8px;
+}}
+QCheckBox {{
+    font-size: 10pt;
+    color: {COLORS['text']};
+}}
+#card QPushButton, #settingsPanel QPushButton {{
     font-size: 10pt;
     font-weight: 600;
     padding: 10px 12px;
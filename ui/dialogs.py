@@ -4,42 +4,73 @@ Contém todas as classes de diálogo personalizadas para a aplicação,
 como a visualização de dados e a seleção de datas.
 """
 
-import pandas as pd
 import qtawesome as qta
 from datetime import datetime
+from functools import partial
 
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QTableView, QHBoxLayout, QPushButton,
-    QDialogButtonBox, QComboBox, QLabel
+    QDialogButtonBox, QComboBox, QLabel, QHeaderView, QMessageBox, QLineEdit,
+    QFrame, QGridLayout
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QAbstractItemModel, QThreadPool, QTimer
 
-from ui.models import DataFrameTableModel
+from core.csv_preview import CsvFrameJob
+from ui.models import DataFrameTableModel, CsvPagedTableModel
 
 
 class PreviewDialog(QDialog):
     """
-    Um diálogo que exibe um DataFrame do pandas em uma QTableView
-    para permitir a visualização de dados de um arquivo CSV.
+    Um diálogo que exibe dados tabulares em uma QTableView para permitir a
+    visualização de um arquivo CSV. Aceita um DataFrame do pandas ou um
+    modelo já pronto (ex.: CsvPagedTableModel, que lê o arquivo aos poucos).
+
+    Clicar no cabeçalho ordena pela coluna; a barra superior filtra por texto
+    em uma coluna ou em todas. Com um CsvPagedTableModel, o arquivo é
+    carregado por completo (em segundo plano) na primeira ordenação ou filtro.
     """
-    def __init__(self, df: pd.DataFrame, file_name: str, parent=None):
+    FILTER_DELAY_MS = 250
+    ALL_COLUMNS = "Todas as colunas"
+
+    def __init__(self, source, file_name: str, parent=None):
         super().__init__(parent)
         self.setWindowTitle(f"Visualização de Dados - {file_name}")
         self.setWindowIcon(qta.icon('fa5s.table', color='#6a2e4d'))
         self.setObjectName("previewDialog")
         self.resize(900, 600)
+        self._pending_actions = []
+        self._frame_job = None
 
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(15, 15, 15, 15)
         main_layout.setSpacing(10)
 
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Filtrar:"))
+        self.filter_column_combo = QComboBox()
+        self.filter_column_combo.setCursor(Qt.PointingHandCursor)
+        filter_layout.addWidget(self.filter_column_combo)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Digite para filtrar...")
+        self.filter_edit.setClearButtonEnabled(True)
+        filter_layout.addWidget(self.filter_edit, 1)
+        main_layout.addLayout(filter_layout)
+
         self.table_view = QTableView()
         self.table_view.setAlternatingRowColors(True)
         self.table_view.setWordWrap(False)
-        self.table_view.setModel(DataFrameTableModel(df))
+        # Altura de linha fixa: a view não precisa medir cada linha ao rolar.
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table_view.verticalHeader().setDefaultSectionSize(24)
+        header = self.table_view.horizontalHeader()
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(False)
+        header.sectionClicked.connect(self._on_header_clicked)
         main_layout.addWidget(self.table_view)
 
         button_layout = QHBoxLayout()
+        self.row_count_label = QLabel()
+        button_layout.addWidget(self.row_count_label)
         button_layout.addStretch()
         close_button = QPushButton("Fechar")
         close_button.setObjectName("dialogButton")
@@ -49,6 +80,142 @@ class PreviewDialog(QDialog):
         button_layout.addWidget(close_button)
         main_layout.addLayout(button_layout)
 
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(self.FILTER_DELAY_MS)
+        self._filter_timer.timeout.connect(self._apply_filter)
+        self.filter_edit.textChanged.connect(self._filter_timer.start)
+        self.filter_column_combo.currentIndexChanged.connect(self._on_filter_column_changed)
+
+        self._set_model(source if isinstance(source, QAbstractItemModel) else DataFrameTableModel(source, self))
+        self.filter_column_combo.addItems([self.ALL_COLUMNS] + [
+            str(self.model.headerData(i, Qt.Horizontal)) for i in range(self.model.columnCount())
+        ])
+
+    def _set_model(self, model):
+        self.model = model
+        self.table_view.setModel(model)
+        model.rowsInserted.connect(self._update_row_count_label)
+        model.modelReset.connect(self._update_row_count_label)
+        if isinstance(model, CsvPagedTableModel):
+            model.loading_finished.connect(self._on_loading_finished)
+        self._update_row_count_label()
+
+    def _selected_filter_column(self):
+        index = self.filter_column_combo.currentIndex()
+        return None if index <= 0 else index - 1
+
+    def _with_dataframe_model(self, action):
+        """ Executa action(modelo) assim que houver um DataFrameTableModel com todas as linhas. """
+        if isinstance(self.model, DataFrameTableModel):
+            action(self.model)
+            return
+        self._pending_actions.append(action)
+        if self._frame_job is not None:
+            return
+        self._frame_job = CsvFrameJob(self.model.file_path, self.model.headers())
+        self._frame_job.signals.finished.connect(self._on_frame_loaded)
+        QThreadPool.globalInstance().start(self._frame_job)
+        self._update_row_count_label()
+
+    def _on_frame_loaded(self, df, error: str):
+        self._frame_job = None
+        if error:
+            self._pending_actions = []
+            self._update_row_count_label()
+            QMessageBox.warning(self, "Erro ao Ler CSV", f"Não foi possível carregar o arquivo para ordenar ou filtrar:\n\n{error}")
+            return
+        self._set_model(DataFrameTableModel(df, self))
+        actions, self._pending_actions = self._pending_actions, []
+        for action in actions:
+            action(self.model)
+
+    def _on_header_clicked(self, section: int):
+        header = self.table_view.horizontalHeader()
+        if header.isSortIndicatorShown() and header.sortIndicatorSection() == section:
+            order = Qt.DescendingOrder if header.sortIndicatorOrder() == Qt.AscendingOrder else Qt.AscendingOrder
+        else:
+            order = Qt.AscendingOrder
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(section, order)
+        self._with_dataframe_model(lambda model: model.sort(section, order))
+
+    def _on_filter_column_changed(self, *args):
+        self._filter_timer.stop()
+        column = self._selected_filter_column()
+        current = self.model.filter_text(column) if isinstance(self.model, DataFrameTableModel) else ""
+        self.filter_edit.blockSignals(True)
+        self.filter_edit.setText(current)
+        self.filter_edit.blockSignals(False)
+
+    def _apply_filter(self):
+        column = self._selected_filter_column()
+        text = self.filter_edit.text()
+        if not text.strip() and not isinstance(self.model, DataFrameTableModel):
+            return
+        self._with_dataframe_model(lambda model: model.set_filter(column, text))
+
+    def _update_row_count_label(self, *args):
+        visible = self.model.total_row_count()
+        total = self.model.source_row_count()
+        text = f"{visible:,} linhas".replace(",", ".")
+        if visible != total:
+            text = f"{visible:,} de {total:,} linhas".replace(",", ".")
+        if self.model.is_loading() or self._frame_job is not None:
+            text += " (lendo arquivo...)"
+        self.row_count_label.setText(text)
+
+    def _on_loading_finished(self, error: str):
+        self._update_row_count_label()
+        if error:
+            QMessageBox.warning(self, "Erro ao Ler CSV", f"O arquivo não pôde ser lido por completo:\n\n{error}")
+
+    def done(self, result):
+        # A leitura do CSV não pode ser interrompida: o trabalho termina sozinho em segundo plano, sem avisar o diálogo.
+        if self._frame_job is not None:
+            self._pending_actions = []
+            self._frame_job.signals.finished.disconnect(self._on_frame_loaded)
+            self._frame_job.detach()
+            self._frame_job = None
+        super().done(result)
+
+
+class ReportPreviewDialog(PreviewDialog):
+    """
+    Visualização de um relatório já processado (resultado de
+    BaseReport.prepare), com os valores formatados como no arquivo exportado
+    e o painel de resumo acima da tabela.
+    """
+    SUMMARY_COLUMNS = 3
+
+    def __init__(self, df, summary: dict, title: str, parent=None):
+        from core.exporter import format_cell_text
+
+        formatters = {col: partial(format_cell_text, col) for col in df.columns}
+        super().__init__(DataFrameTableModel(df, formatters=formatters), title, parent)
+        self.model.setParent(self)
+        self.setWindowTitle(f"Visualização do Relatório - {title}")
+        self.setWindowIcon(qta.icon('fa5s.file-alt', color='#6a2e4d'))
+        self.resize(1000, 700)
+        if summary:
+            self.layout().insertWidget(0, self._create_summary_panel(summary))
+
+    def _create_summary_panel(self, summary: dict) -> QFrame:
+        panel = QFrame()
+        panel.setObjectName("card")
+        layout = QVBoxLayout(panel)
+        layout.setContentsMargins(15, 10, 15, 10)
+        title = QLabel("Resumo")
+        title.setObjectName("cardTitle")
+        layout.addWidget(title)
+        grid = QGridLayout()
+        grid.setHorizontalSpacing(25)
+        for i, (label, value) in enumerate(summary.items()):
+            row, column = divmod(i, self.SUMMARY_COLUMNS)
+            grid.addWidget(QLabel(f"<b>{label}:</b> {value}"), row, column)
+        layout.addLayout(grid)
+        return panel
+
 
 class MonthYearDialog(QDialog):
     """
@@ -127,4 +294,39 @@ class MonthYearDialog(QDialog):
         selected_month = self.month_map[month_name]
         selected_year = int(year_str)
         
-        return selected_month, selected_year
\ No newline at end of file
+        return selected_month, selected_year
+
+
+class LegacyDatabaseDialog(MonthYearDialog):
+    """
+    Pergunta a clínica e a competência dos dados do banco único de uma versão
+    anterior, para copiá-lo para a partição correspondente.
+    """
+    def __init__(self, legacy_path: str, clinics: list, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Dados da Versão Anterior")
+        self.setMinimumWidth(420)
+
+        intro = QLabel(
+            f"Foi encontrado o banco de dados de uma versão anterior ({legacy_path}). "
+            "Os dados agora ficam separados por clínica e competência; informe a "
+            "que clínica e competência esses dados pertencem para copiá-los."
+        )
+        intro.setWordWrap(True)
+        self.clinic_combo = QComboBox()
+        self.clinic_combo.setCursor(Qt.PointingHandCursor)
+        self.clinic_combo.addItems(clinics)
+        clinic_layout = QHBoxLayout()
+        clinic_layout.addWidget(QLabel("Clínica:"))
+        clinic_layout.addWidget(self.clinic_combo, 1)
+
+        layout = self.layout()
+        layout.insertWidget(0, intro)
+        layout.insertLayout(1, clinic_layout)
+        self.button_box.button(QDialogButtonBox.StandardButton.Ok).setText("Copiar")
+        self.button_box.button(QDialogButtonBox.StandardButton.Cancel).setText("Agora não")
+
+    def get_selection(self):
+        """ Retorna (clínica, mês, ano). """
+        month, year = self.get_selected_date()
+        return self.clinic_combo.currentText(), month, year
@@ -5,25 +5,27 @@ import os
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QStackedWidget, QFrame, QTreeWidget, QTreeWidgetItemIterator,
-    QGraphicsColorizeEffect
+    QGraphicsColorizeEffect, QProgressBar, QApplication, QMessageBox
 )
 from PySide6.QtSvgWidgets import QSvgWidget
 from PySide6.QtGui import QIcon, QCursor, QPixmap, QResizeEvent, QColor
-from PySide6.QtCore import Qt, Slot, QSize, QPropertyAnimation, QEasingCurve, QRect, QEvent, QTimer
+from PySide6.QtCore import Qt, Slot, QSize, QPropertyAnimation, QEasingCurve, QRect, QEvent, QTimer, QThreadPool
 
 import qtawesome as qta
 
-from core.database import Database
-from ui.relatorio_widget import RelatorioWidget
+from core.warmup import WarmupJob
 from ui.sidebar_manager import SidebarManager
-from config import SIDEBAR_CONFIG
+from config import CLINICS, LEGACY_DATABASE, SIDEBAR_CONFIG
 from core.utils import resource_path
 from styles import COLORS
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, warmup: bool = True):
         super().__init__()
-        self.db = Database()
+        self._storage = None
+        self._prefetched_status = None
+        self._warmup_enabled = warmup
+        self._warmup_job = None
         self.logo_path = resource_path('assets/logo.png')
         self.setWindowTitle("Grupo Nefron - Sistema de Análise")
         app_icon_path = resource_path('assets/logo.ico')
@@ -37,8 +39,129 @@ class MainWindow(QMainWindow):
         self._setup_sidebar_manager()
         self._setup_sidebar_animation()
         self._connect_signals()
+        QApplication.instance().aboutToQuit.connect(self._wait_for_warmup)
         self.sidebar_manager.select_initial_item()
         self.showMaximized()
+        if os.path.isfile(LEGACY_DATABASE):
+            QTimer.singleShot(0, self._offer_legacy_import)
+
+    @property
+    def storage(self):
+        """ Bancos por clínica e competência, preparados no primeiro uso (core.database importa o pandas). """
+        if self._storage is None:
+            from core.partitions import PartitionedStorage
+            self._storage = PartitionedStorage()
+        return self._storage
+
+    @Slot()
+    def _offer_legacy_import(self):
+        """
+        Na primeira abertura depois da atualização para as partições, oferece
+        copiar o banco único antigo (que não é mais lido) para a partição de
+        uma clínica e competência. A pergunta se repete enquanto não houver
+        partições; a cópia também pode ser feita com "cli.py particionar".
+        """
+        from core.partitions import legacy_has_data, list_partitions
+        from ui.dialogs import LegacyDatabaseDialog
+
+        if not legacy_has_data(LEGACY_DATABASE) or list_partitions():
+            return
+        dialog = LegacyDatabaseDialog(os.path.abspath(LEGACY_DATABASE), CLINICS, self)
+        if not dialog.exec():
+            return
+        clinic, month, year = dialog.get_selection()
+        try:
+            path = self.storage.import_legacy(clinic, month, year, LEGACY_DATABASE)
+        except Exception as e:
+            QMessageBox.warning(self, "Dados da Versão Anterior", f"Não foi possível copiar o banco de dados:\n\n{e}")
+            return
+        try:
+            self.storage.update_aggregates(clinic, month, year)
+        except Exception as e:
+            print(f"Aviso: o histórico de indicadores não foi atualizado: {e}")
+        QMessageBox.information(self, "Dados da Versão Anterior", f"Dados copiados para {clinic} {month:02d}/{year}:\n{os.path.abspath(path)}")
+
+    @property
+    def db(self):
+        """ Banco da clínica e competência escolhidas na tela de relatórios (None antes da escolha). """
+        page = self.widget_map.get("relatorio_page")
+        return page.db if page is not None else None
+
+    def _create_relatorio_page(self):
+        from ui.relatorio_widget import RelatorioWidget
+        page = RelatorioWidget(self.storage)
+        page.database_changed.connect(self._on_database_changed)
+        if self._prefetched_status is not None:
+            page.prime_import_status(*self._prefetched_status)
+            self._prefetched_status = None
+        return page
+
+    @Slot(object)
+    def _on_database_changed(self, db):
+        settings_page = self.widget_map.get("settings_page")
+        if settings_page is not None:
+            settings_page.set_database(db)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._warmup_enabled and self._warmup_job is None:
+            # Só depois da primeira pintura, para não atrasar a abertura da janela.
+            QTimer.singleShot(0, self._start_warmup)
+
+    def _start_warmup(self):
+        if self._warmup_job is not None:
+            return
+        self._warmup_job = WarmupJob()
+        self._warmup_job.signals.step.connect(self._on_warmup_step)
+        self._warmup_job.signals.finished.connect(self._on_warmup_finished)
+        self.warmup_indicator.show()
+        QThreadPool.globalInstance().start(self._warmup_job)
+
+    @Slot()
+    def _wait_for_warmup(self):
+        # O trabalho não pode ser destruído enquanto ainda roda na outra thread.
+        if self._warmup_job is not None and not QThreadPool.globalInstance().tryTake(self._warmup_job):
+            self._warmup_job.wait()
+
+    @Slot(str)
+    def _on_warmup_step(self, step: str):
+        self.warmup_label.setText(f"{step}...")
+
+    @Slot(object, str)
+    def _on_warmup_finished(self, result, error: str):
+        self.warmup_indicator.hide()
+        if error or result is None:
+            print(f"Aviso: aquecimento inicial falhou: {error}")
+            return
+        storage = result['storage']
+        if self._storage is None:
+            self._storage = storage
+        elif storage is not self._storage:
+            # O armazenamento já foi criado antes do fim do aquecimento: o do aquecimento é descartado.
+            storage.close()
+        if result['db'] is None:
+            return
+        page = self.widget_map.get("relatorio_page")
+        if page is not None:
+            page.prime_import_status(result['db'].db_name, result['import_status'])
+        else:
+            self._prefetched_status = (result['db'].db_name, result['import_status'])
+
+    def _create_settings_page(self):
+        from ui.settings_page import SettingsPage
+        return SettingsPage(self.db)
+
+    def get_page(self, widget_name: str):
+        """ Retorna a página do widget_map, construindo-a na primeira navegação. """
+        page = self.widget_map.get(widget_name)
+        if page is None:
+            factory = self.page_factories.get(widget_name)
+            if factory is None:
+                return None
+            page = factory()
+            self.widget_map[widget_name] = page
+            self.content_stack.addWidget(page)
+        return page
 
     def _create_report_lobby_card(self, title, description, icon_name, item_id):
         card = QFrame()
@@ -172,22 +295,34 @@ class MainWindow(QMainWindow):
         top_bar_layout.addWidget(self.module_icon_label)
         top_bar_layout.addWidget(self.module_title_label)
         top_bar_layout.addStretch()
+        self.warmup_indicator = QWidget()
+        warmup_layout = QHBoxLayout(self.warmup_indicator)
+        warmup_layout.setContentsMargins(0, 0, 0, 0)
+        warmup_layout.setSpacing(8)
+        self.warmup_label = QLabel("Preparando...")
+        self.warmup_label.setObjectName("warmupLabel")
+        warmup_progress = QProgressBar()
+        warmup_progress.setObjectName("warmupProgress")
+        warmup_progress.setRange(0, 0)
+        warmup_progress.setTextVisible(False)
+        warmup_progress.setFixedSize(80, 6)
+        warmup_layout.addWidget(self.warmup_label)
+        warmup_layout.addWidget(warmup_progress)
+        self.warmup_indicator.hide()
+        top_bar_layout.addWidget(self.warmup_indicator)
         self.main_layout.addWidget(self.top_bar)
         self.content_area = QWidget()
         self.content_area.setObjectName("mainContentArea")
         content_layout = QVBoxLayout(self.content_area)
         content_layout.setContentsMargins(0, 0, 0, 0)
         self.content_stack = QStackedWidget()
-        self.home_page = self._create_home_page()
-        self.relatorio_page = RelatorioWidget(self.db)
-        self.settings_page = self._create_placeholder_page("Configurações", "Página para futuras configurações.", icon='fa5s.cog')
-        self.widget_map = {
-            "home_page": self.home_page,
-            "relatorio_page": self.relatorio_page,
-            "settings_page": self.settings_page,
+        # As páginas são construídas na primeira navegação (ver get_page).
+        self.page_factories = {
+            "home_page": self._create_home_page,
+            "relatorio_page": self._create_relatorio_page,
+            "settings_page": self._create_settings_page,
         }
-        for widget in self.widget_map.values():
-            self.content_stack.addWidget(widget)
+        self.widget_map = {}
         content_layout.addWidget(self.content_stack)
         self.main_layout.addWidget(self.content_area, 1)
         self.content_overlay = QWidget(self)
@@ -257,7 +392,7 @@ class MainWindow(QMainWindow):
     @Slot(dict)
     def on_module_selected(self, module_data: dict):
         widget_name = module_data.get("widget_name")
-        widget_to_show = self.widget_map.get(widget_name)
+        widget_to_show = self.get_page(widget_name)
         if widget_to_show:
             self.content_stack.setCurrentWidget(widget_to_show)
             title = module_data.get("text", "Início")
@@ -278,7 +413,7 @@ class MainWindow(QMainWindow):
             else:
                 self.module_icon_label.hide()
             if widget_name == "relatorio_page" and module_data.get("report_name"):
-                self.relatorio_page.load_report_data(module_data.get("report_name"))
+                widget_to_show.load_report_data(module_data.get("report_name"))
             if self._sidebar_visible:
                 QTimer.singleShot(50, self._toggle_sidebar)
         else:
@@ -1,26 +1,301 @@
 # ui/models.py
+from collections import OrderedDict
+
+import numpy as np
 import pandas as pd
-from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QThreadPool, Qt, Signal
+
+from core.csv_preview import CsvLineIndex, CsvIndexJob
+
+def _default_formatter(series: pd.Series):
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return lambda value: value.strftime('%d/%m/%Y')
+    return str
+
+def _is_text(series: pd.Series) -> bool:
+    return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
 
 class DataFrameTableModel(QAbstractTableModel):
-    def __init__(self, df=pd.DataFrame(), parent=None):
+    """
+    Modelo somente leitura sobre um DataFrame, pensado para visualizações
+    grandes. Cada coluna fica em um array NumPy (sem cópia do DataFrame) com a
+    máscara de nulos calculada uma vez; o texto de uma célula só é gerado
+    quando ela é pintada e fica em um pequeno cache por coluna. As linhas são
+    entregues à view em lotes através de canFetchMore/fetchMore.
+
+    Ordenação (sort) e filtros de texto por coluna (set_filter) são calculados
+    de forma vetorizada sobre as colunas inteiras e resultam em um vetor de
+    posições; as linhas da view são mapeadas através dele, sem copiar dados.
+
+    formatters permite definir, por nome de coluna, a função que converte um
+    valor (não nulo) no texto exibido.
+    """
+    FETCH_BATCH_SIZE = 10000
+    FORMAT_CACHE_SIZE = 4096
+
+    def __init__(self, df=None, parent=None, formatters=None):
         super().__init__(parent)
-        self._df = df.reset_index(drop=True)
+        self._custom_formatters = formatters or {}
+        self._load(df if df is not None else pd.DataFrame())
+
+    def _load(self, df: pd.DataFrame):
+        self._source = df
+        self._row_map = None
+        self._sort_spec = None
+        self._filters = {}
+        self._sort_keys = {}
+        self._search_texts = {}
+        self._headers = [str(col) for col in df.columns]
+        self._columns = []
+        self._na_masks = []
+        self._formatters = []
+        for i, col_name in enumerate(df.columns):
+            series = df.iloc[:, i]
+            # Datas ficam no array do pandas, que devolve Timestamp (e não numpy.datetime64) por célula.
+            self._columns.append(series.array if pd.api.types.is_datetime64_any_dtype(series) else series.to_numpy())
+            self._na_masks.append(series.isna().to_numpy())
+            self._formatters.append(self._custom_formatters.get(col_name) or _default_formatter(series))
+        self._format_caches = [{} for _ in self._columns]
+        self._total_rows = len(df.index)
+        self._loaded_rows = min(self._total_rows, self.FETCH_BATCH_SIZE)
+
+    def _sort_key(self, column: int) -> pd.Series:
+        """ Chave de ordenação da coluna: numérica quando todo o texto é numérico, senão sem diferenciar maiúsculas. """
+        key = self._sort_keys.get(column)
+        if key is None:
+            series = self._source.iloc[:, column].reset_index(drop=True)
+            key = series
+            if _is_text(series):
+                numeric = pd.to_numeric(series, errors='coerce')
+                if series.notna().any() and numeric.notna().sum() == series.notna().sum():
+                    key = numeric
+                else:
+                    key = series.str.casefold()
+            self._sort_keys[column] = key
+        return key
+
+    def _search_text(self, column: int) -> pd.Series:
+        """ Texto usado no filtro da coluna, equivalente ao exibido na tabela. """
+        text = self._search_texts.get(column)
+        if text is None:
+            series = self._source.iloc[:, column].reset_index(drop=True)
+            custom = self._custom_formatters.get(self._source.columns[column])
+            if custom is not None and not _is_text(series):
+                text = series.map(custom, na_action='ignore')
+            elif pd.api.types.is_datetime64_any_dtype(series):
+                text = series.dt.strftime('%d/%m/%Y')
+            elif _is_text(series):
+                text = series
+            else:
+                text = series.astype(str).where(series.notna())
+            self._search_texts[column] = text
+        return text
+
+    def _filter_mask(self, column: int, text: str) -> np.ndarray:
+        return self._search_text(column).str.contains(text, case=False, regex=False, na=False).to_numpy(dtype=bool)
+
+    def _apply_view(self):
+        self.beginResetModel()
+        positions = None
+        if self._filters:
+            mask = np.ones(len(self._source.index), dtype=bool)
+            for column, text in self._filters.items():
+                if column is None:
+                    any_column = np.zeros_like(mask)
+                    for each in range(len(self._columns)):
+                        any_column |= self._filter_mask(each, text)
+                    mask &= any_column
+                else:
+                    mask &= self._filter_mask(column, text)
+            positions = np.flatnonzero(mask)
+        if self._sort_spec is not None:
+            column, ascending = self._sort_spec
+            key = self._sort_key(column)
+            if positions is not None:
+                key = key.take(positions)
+            positions = key.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+        self._row_map = positions
+        self._total_rows = len(self._source.index) if positions is None else len(positions)
+        self._loaded_rows = min(self._total_rows, self.FETCH_BATCH_SIZE)
+        self.endResetModel()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self._sort_spec = None if column < 0 else (column, order == Qt.AscendingOrder)
+        self._apply_view()
+
+    def set_filter(self, column, text: str):
+        """ Filtra as linhas cujo texto na coluna contém text (column=None: qualquer coluna). """
+        text = (text or "").strip()
+        if text == self._filters.get(column, ""):
+            return
+        if text:
+            self._filters[column] = text
+        else:
+            self._filters.pop(column, None)
+        self._apply_view()
+
+    def filter_text(self, column) -> str:
+        return self._filters.get(column, "")
+
+    def clear_filters(self):
+        if self._filters:
+            self._filters = {}
+            self._apply_view()
+
+    def source_row_count(self) -> int:
+        """ Número de linhas do DataFrame, sem considerar os filtros. """
+        return len(self._source.index)
 
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         if role != Qt.DisplayRole: return None
-        if orientation == Qt.Horizontal: return str(self._df.columns[section])
+        if orientation == Qt.Horizontal: return self._headers[section]
         return str(section + 1)
 
-    def rowCount(self, parent=QModelIndex()): return len(self._df.index)
-    def columnCount(self, parent=QModelIndex()): return len(self._df.columns)
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded_rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded_rows < self._total_rows
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        remaining = self._total_rows - self._loaded_rows
+        batch = min(remaining, self.FETCH_BATCH_SIZE)
+        if batch <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded_rows, self._loaded_rows + batch - 1)
+        self._loaded_rows += batch
+        self.endInsertRows()
 
     def data(self, index, role=Qt.DisplayRole):
         if not index.isValid() or role != Qt.DisplayRole: return None
-        val = self._df.iat[index.row(), index.column()]
-        return "" if pd.isna(val) else str(val)
+        col = index.column()
+        row = index.row() if self._row_map is None else self._row_map[index.row()]
+        cache = self._format_caches[col]
+        text = cache.get(row)
+        if text is None:
+            text = "" if self._na_masks[col][row] else self._formatters[col](self._columns[col][row])
+            if len(cache) >= self.FORMAT_CACHE_SIZE:
+                cache.clear()
+            cache[row] = text
+        return text
+
+    def total_row_count(self) -> int:
+        """ Número de linhas visíveis (após filtros), incluindo as ainda não entregues à view. """
+        return self._total_rows
+
+    def is_loading(self) -> bool:
+        return False
 
     def set_dataframe(self, df):
         self.beginResetModel()
-        self._df = df.reset_index(drop=True)
-        self.endResetModel()
\ No newline at end of file
+        self._load(df)
+        self.endResetModel()
+
+class CsvPagedTableModel(QAbstractTableModel):
+    """
+    Modelo somente leitura sobre um arquivo CSV que não é carregado inteiro:
+    as linhas são lidas do disco em páginas de PAGE_SIZE conforme a view
+    pede, e só as MAX_CACHED_PAGES páginas mais recentes ficam em memória.
+
+    O primeiro bloco do arquivo é indexado na criação do modelo; o restante é
+    indexado em segundo plano e as linhas aparecem na view à medida que ficam
+    disponíveis. loading_finished(mensagem de erro ou "") é emitido ao final.
+    """
+    PAGE_SIZE = 500
+    MAX_CACHED_PAGES = 16
+
+    loading_finished = Signal(str)
+
+    def __init__(self, file_path: str, headers: list, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self._headers = list(headers)
+        self._pages = OrderedDict()
+        self._index = CsvLineIndex(file_path)
+        self._index.index_next_chunk()
+        self._rows = self._index.rows_indexed()
+        self._job = None
+        if not self._index.is_complete():
+            self._job = CsvIndexJob(self._index)
+            self._job.signals.progress.connect(self._on_index_progress)
+            self._job.signals.finished.connect(self._on_index_finished)
+            QThreadPool.globalInstance().start(self._job)
+
+    def first_row(self) -> list:
+        """ Primeira linha de dados já interpretada (lista vazia se o arquivo não tiver dados). """
+        rows = self._index.read_rows(0, 1)
+        return rows[0] if rows else []
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole: return None
+        if orientation == Qt.Horizontal: return self._headers[section]
+        return str(section + 1)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole: return None
+        page_number, offset = divmod(index.row(), self.PAGE_SIZE)
+        page = self._page(page_number)
+        if offset >= len(page): return ""
+        values = page[offset]
+        return values[index.column()] if index.column() < len(values) else ""
+
+    def _page(self, page_number: int) -> list:
+        page = self._pages.get(page_number)
+        if page is not None:
+            self._pages.move_to_end(page_number)
+            return page
+        start = page_number * self.PAGE_SIZE
+        page = self._index.read_rows(start, min(start + self.PAGE_SIZE, self._rows))
+        self._pages[page_number] = page
+        if len(self._pages) > self.MAX_CACHED_PAGES:
+            self._pages.popitem(last=False)
+        return page
+
+    def total_row_count(self) -> int:
+        return self._rows
+
+    def is_loading(self) -> bool:
+        return self._job is not None
+
+    def source_row_count(self) -> int:
+        return self._rows
+
+    def headers(self) -> list:
+        return list(self._headers)
+
+    def _grow_to(self, rows: int):
+        if rows <= self._rows:
+            return
+        # A última página pode ter sido lida incompleta enquanto o índice crescia.
+        self._pages.pop(self._rows // self.PAGE_SIZE, None)
+        self.beginInsertRows(QModelIndex(), self._rows, rows - 1)
+        self._rows = rows
+        self.endInsertRows()
+
+    def _on_index_progress(self, rows: int):
+        self._grow_to(rows)
+
+    def _on_index_finished(self, rows: int, error: str):
+        self._job = None
+        self._grow_to(rows)
+        self.loading_finished.emit(error)
+
+    def close(self):
+        """ Interrompe a indexação em andamento e fecha o arquivo. """
+        if self._job is not None:
+            self._job.cancel()
+            if not QThreadPool.globalInstance().tryTake(self._job):
+                self._job.wait()
+            self._job = None
+        self._index.close()
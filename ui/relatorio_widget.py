@@ -1,6 +1,7 @@
 import sys
 import os
 from datetime import datetime
+from importlib.util import find_spec
 import pandas as pd
 
 from PySide6.QtWidgets import (
@@ -8,39 +9,61 @@ from PySide6.QtWidgets import (
     QMessageBox, QFrame, QProgressBar, QDialog, QScrollArea, QComboBox
 )
 from PySide6.QtGui import QCursor
-from PySide6.QtCore import Qt, QThread, QSize
+from PySide6.QtCore import Qt, QThread, QSize, Signal
 
 import qtawesome as qta
 
-from core.database import Database
 from core.importer import ImportWorker
+from core.export_jobs import ExportJobRunner, STAGE_LABELS
+from core.render_cache import RenderCache, cache_dir_for
+from core.status_service import ImportStatusService
+from core.partitions import PartitionedStorage
 
-from core.reports import REPORT_REGISTRY
-from core.exporter import export_simple_excel
-from config import get_clean_headers, REPORT_DEFINITIONS, DATA_SOURCE_TITLES
+from core.utils import safe_filename
+from config import get_clean_headers, REPORT_DEFINITIONS, DATA_SOURCE_TITLES, RENDER_CACHE_MAX_BYTES, CLINICS
 from styles import COLORS
-from ui.dialogs import PreviewDialog
+from ui.dialogs import PreviewDialog, ReportPreviewDialog
+from ui.models import CsvPagedTableModel
 from ui.flow_layout import FlowLayout
 
-try:
-    import openpyxl
-    import reportlab
-    LIBS_AVAILABLE = True
-except ImportError:
-    LIBS_AVAILABLE = False
+# Só verifica a presença das bibliotecas de exportação; a importação (pesada)
+# acontece no primeiro relatório gerado.
+LIBS_AVAILABLE = all(find_spec(name) is not None for name in ('openpyxl', 'reportlab'))
+
+def _report_registry() -> dict:
+    from core.reports import REPORT_REGISTRY
+    return REPORT_REGISTRY
 
 class RelatorioWidget(QWidget):
-    def __init__(self, db: Database):
+    # Emitido com o Database da clínica e competência aplicadas (None ao trocar de relatório).
+    database_changed = Signal(object)
+
+    def __init__(self, storage: PartitionedStorage):
         super().__init__()
-        self.db = db
+        self.storage = storage
+        self.db = None
         self.cards = {}
         self.selected_clinic = None
         self.selected_month = None
         self.selected_year = None
+        self.current_report_name = None
 
         self.logo_path = os.path.join(getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__))), '..', 'assets', 'logo.png')
         self.report_definitions = REPORT_DEFINITIONS
         self.data_source_titles = DATA_SOURCE_TITLES
+        self._current_export_job = None
+        self._preview_jobs = {}
+        self.remarcacoes_count_label = None
+        self._prefetched_status = None
+        self.status_service = ImportStatusService(self.db, self)
+        self.status_service.statuses_ready.connect(self.on_import_statuses_ready)
+        self._import_running = False
+        self.export_runner = ExportJobRunner(self)
+        self.export_runner.job_started.connect(self.on_export_job_started)
+        self.export_runner.job_stage.connect(self.on_export_job_stage)
+        self.export_runner.job_finished.connect(self.on_export_job_finished)
+        self.export_runner.job_result.connect(self.on_report_preview_ready)
+        self.export_runner.queue_changed.connect(self._update_status_bar)
         self._setup_ui()
         self._set_content_enabled(False) # Desabilita conteúdo na inicialização
 
@@ -79,7 +102,21 @@ class RelatorioWidget(QWidget):
         self.corrections_cards_layout.setSpacing(25)
         content_layout.addWidget(self.corrections_cards_container)
 
-        content_layout.addWidget(self._create_section_header("3. Relatórios Gerados (Exportação)", icon_name='fa5s.file-export'))
+        export_header = self._create_section_header("3. Relatórios Gerados (Exportação)", icon_name='fa5s.file-export')
+        self.export_all_button = QPushButton(qta.icon('fa5s.file-archive', color=COLORS['icon-color-light-bg']), " Exportar Todos")
+        self.export_all_button.setObjectName("exportButton")
+        self.export_all_button.setCursor(Qt.PointingHandCursor)
+        self.export_all_button.setToolTip("Gera todos os relatórios deste módulo em Excel e PDF de uma só vez.")
+        self.export_all_button.clicked.connect(self.on_export_all_clicked)
+        export_header.layout().addWidget(self.export_all_button)
+        self.export_workbook_button = QPushButton(qta.icon('fa5s.file-excel', color=COLORS['icon-color-light-bg']), " Planilha Única")
+        self.export_workbook_button.setObjectName("exportButton")
+        self.export_workbook_button.setCursor(Qt.PointingHandCursor)
+        self.export_workbook_button.setToolTip("Gera um único arquivo Excel com uma aba para cada relatório.")
+        self.export_workbook_button.clicked.connect(self.on_export_workbook_clicked)
+        self.export_workbook_button.setVisible(False)
+        export_header.layout().addWidget(self.export_workbook_button)
+        content_layout.addWidget(export_header)
         self.export_cards_container = QWidget()
         self.export_cards_layout = FlowLayout(self.export_cards_container)
         self.export_cards_layout.setContentsMargins(0, 0, 0, 0)
@@ -87,10 +124,24 @@ class RelatorioWidget(QWidget):
         content_layout.addWidget(self.export_cards_container)
         content_layout.addStretch(1)
 
+        self.status_frame = QFrame()
+        self.status_frame.setObjectName("statusFrame")
+        status_layout = QHBoxLayout(self.status_frame)
+        status_layout.setContentsMargins(30, 5, 30, 10)
+        status_layout.setSpacing(10)
+        self.status_label = QLabel()
+        self.status_label.setObjectName("infoLabel")
+        status_layout.addWidget(self.status_label)
         self.progress_bar = QProgressBar()
-        self.progress_bar.setVisible(False)
-        self.progress_bar.setContentsMargins(30, 5, 30, 10)
-        main_layout.addWidget(self.progress_bar)
+        status_layout.addWidget(self.progress_bar, 1)
+        self.cancel_export_button = QPushButton(qta.icon('fa5s.times', color=COLORS['icon-color-light-bg']), " Cancelar")
+        self.cancel_export_button.setObjectName("exportButton")
+        self.cancel_export_button.setCursor(Qt.PointingHandCursor)
+        self.cancel_export_button.setToolTip("Cancela a exportação em andamento.")
+        self.cancel_export_button.clicked.connect(self.on_cancel_export_clicked)
+        status_layout.addWidget(self.cancel_export_button)
+        self.status_frame.setVisible(False)
+        main_layout.addWidget(self.status_frame)
 
         self._clear_layout(self.import_cards_layout)
         self._clear_layout(self.corrections_cards_layout)
@@ -111,10 +162,7 @@ class RelatorioWidget(QWidget):
         form_layout.addWidget(QLabel("Clínica:"))
         self.clinic_combo = QComboBox()
         self.clinic_combo.setCursor(Qt.PointingHandCursor)
-        self.clinic_combo.addItems([
-            "Selecione uma clínica...", "Renal Clínica", "Instituto do Rim", "Nefron Clínica",
-            "CNN", "Pronto Rim", "Clínica do Rim", "Hospital do Rim"
-        ])
+        self.clinic_combo.addItems(["Selecione uma clínica..."] + CLINICS)
         form_layout.addWidget(self.clinic_combo, 2)
         form_layout.addSpacing(20)
 
@@ -154,6 +202,8 @@ class RelatorioWidget(QWidget):
         self.import_cards_container.setEnabled(enabled)
         self.corrections_cards_container.setEnabled(enabled)
         self.export_cards_container.setEnabled(enabled)
+        self.export_all_button.setEnabled(enabled)
+        self.export_workbook_button.setEnabled(enabled)
 
         opacity = 1.0 if enabled else 0.5
         style = f"QFrame#card {{ opacity: {opacity}; }}"
@@ -177,13 +227,41 @@ class RelatorioWidget(QWidget):
         }
         self.selected_month = month_map[month_name]
         self.selected_year = int(year_str)
+        self._set_database(self.storage.database(self.selected_clinic, self.selected_month, self.selected_year))
 
         QMessageBox.information(self, "Parâmetros Definidos", 
             f"Relatórios para:\n\nClínica: {self.selected_clinic}\nPeríodo: {self.selected_month:02d}/{self.selected_year}"
         )
         self._set_content_enabled(True)
 
+    def _set_database(self, db):
+        """
+        Passa a usar o banco da partição escolhida: situação das importações,
+        cache de relatórios renderizados e demais páginas (database_changed).
+        """
+        if db is self.db:
+            return
+        self.db = db
+        self.status_service.set_database(db)
+        if self._prefetched_status is not None and db is not None and self._prefetched_status[0] == db.db_name:
+            self.status_service.prime(self._prefetched_status[1])
+            self._prefetched_status = None
+        self.export_runner.cache = RenderCache(cache_dir_for(db.db_name), RENDER_CACHE_MAX_BYTES) if db is not None else None
+        self.database_changed.emit(db)
+        if db is not None and self.current_report_name:
+            report_config = self.report_definitions.get(self.current_report_name, {})
+            for table_name in self.cards:
+                known, info_data = self.status_service.cached_status(table_name)
+                if known:
+                    self._set_card_info(table_name, info_data)
+                else:
+                    self.cards[table_name]['info_label'].setText("Consultando...")
+            self._set_remarcacoes_count(self.status_service.cached_remarcacoes_count())
+            self.status_service.refresh(report_config.get("imports", []), include_remarcacoes=bool(report_config.get("corrections")))
+
     def load_report_data(self, report_name):
+        self.current_report_name = report_name
+        self._set_database(None)
         self.update_report_view(report_name)
         self.clinic_combo.setCurrentIndex(0)
         self._set_content_enabled(False)
@@ -194,16 +272,19 @@ class RelatorioWidget(QWidget):
     def update_report_view(self, report_name):
         report_config = self.report_definitions.get(report_name, {})
         self._clear_layout(self.import_cards_layout)
+        self.cards = {}
         for table_name in report_config.get("imports", []):
             title = self.data_source_titles.get(table_name, table_name)
             self._create_import_card(self.import_cards_layout, title, table_name)
         self._clear_layout(self.corrections_cards_layout)
+        self.remarcacoes_count_label = None
         for correction_name in report_config.get("corrections", []):
             self._create_correction_card(self.corrections_cards_layout, correction_name)
-        self.update_correction_cards()
+        self.status_service.refresh(report_config.get("imports", []), include_remarcacoes=bool(report_config.get("corrections")))
         self._clear_layout(self.export_cards_layout)
         for export_name in report_config.get("exports", []):
             self._create_export_card(self.export_cards_layout, export_name)
+        self.export_workbook_button.setVisible(bool(report_config.get("workbook")))
 
     def _create_import_card(self, p_layout, title_text, t_name):
         card = QFrame()
@@ -232,7 +313,11 @@ class RelatorioWidget(QWidget):
         layout.addLayout(btn_layout)
         p_layout.addWidget(card)
         self.cards[t_name] = {'info_label': info}
-        self.update_card_info(t_name)
+        known, info_data = self.status_service.cached_status(t_name)
+        if known:
+            self._set_card_info(t_name, info_data)
+        elif self.db is not None:
+            info.setText("Consultando...")
 
     def _create_correction_card(self, p_layout, title_text):
         card = QFrame()
@@ -259,6 +344,7 @@ class RelatorioWidget(QWidget):
         self.remarcacoes_export_button.clicked.connect(self.on_export_remarcacoes_clicked)
         layout.addWidget(self.remarcacoes_export_button)
         p_layout.addWidget(card)
+        self._set_remarcacoes_count(self.status_service.cached_remarcacoes_count())
 
     def _create_export_card(self, p_layout, title_text):
         card = QFrame()
@@ -271,6 +357,11 @@ class RelatorioWidget(QWidget):
         title.setAlignment(Qt.AlignCenter)
         layout.addWidget(title)
         layout.addStretch()
+        btn_view = QPushButton(qta.icon('fa5s.eye', color=COLORS['icon-color-light-bg']), " Visualizar relatório")
+        btn_view.setObjectName("previewButton")
+        btn_view.setCursor(Qt.PointingHandCursor)
+        btn_view.clicked.connect(lambda: self.on_preview_report_clicked(title_text))
+        layout.addWidget(btn_view)
         btn_layout = QHBoxLayout()
         btn_excel = QPushButton(qta.icon('fa5s.file-excel', color=COLORS['icon-color-light-bg']), " Excel")
         btn_excel.setObjectName("exportButton")
@@ -299,13 +390,17 @@ class RelatorioWidget(QWidget):
             return
         msg_box = QMessageBox(self)
         msg_box.setWindowTitle("Confirmar Importação")
-        msg_box.setText(f"<b>Arquivo:</b> {os.path.basename(file_path)}\n<b>Total de linhas:</b> {len(df_preview)}\n\nIsso substituirá todos os dados existentes. Deseja continuar?")
+        msg_box.setText(f"<b>Arquivo:</b> {os.path.basename(file_path)}\n<b>Total de linhas:</b> {len(df_preview)}\n\nIsso substituirá os dados desta tabela para {self.selected_clinic} em {self.selected_month:02d}/{self.selected_year}. Deseja continuar?")
         if msg_box.exec() != QMessageBox.StandardButton.Ok: return
         self._current_import_context = {"table_name": table_name}
-        self.progress_bar.setVisible(True)
+        self._import_running = True
+        self.status_label.setText(f"Importando {self.data_source_titles.get(table_name, table_name)}...")
+        self.cancel_export_button.setVisible(False)
+        self.status_frame.setVisible(True)
         self.progress_bar.setValue(0)
         self.thread = QThread()
-        self.worker = ImportWorker(self.db, file_path, table_name)
+        clinic, month, year = self.selected_clinic, self.selected_month, self.selected_year
+        self.worker = ImportWorker(self.db, file_path, table_name, after_import=lambda: self.storage.update_aggregates(clinic, month, year, [table_name]))
         self.worker.moveToThread(self.thread)
         self.thread.started.connect(self.worker.run)
         self.worker.progress.connect(self.progress_bar.setValue)
@@ -316,70 +411,166 @@ class RelatorioWidget(QWidget):
         self.thread.start()
 
     def on_import_finished(self, ok, message):
-        self.progress_bar.setVisible(False)
+        self._import_running = False
+        self._update_status_bar()
         if not hasattr(self, '_current_import_context') or not self._current_import_context: return
         if not ok:
             QMessageBox.critical(self, "Erro na Importação", message)
         else:
             QMessageBox.information(self, "Sucesso", message)
         table_name = self._current_import_context["table_name"]
-        self.update_card_info(table_name)
-        if table_name == 'sessoes_hd':
-            self.update_correction_cards()
+        self.status_service.refresh([table_name], include_remarcacoes=table_name == 'sessoes_hd')
         self._current_import_context = None
 
-    def on_export_clicked(self, report_name, file_format):
+    def _check_export_preconditions(self, report_classes: list) -> bool:
         if not all([self.selected_clinic, self.selected_month, self.selected_year]):
             QMessageBox.critical(self, "Parâmetros Ausentes", "Por favor, selecione a clínica e o período e clique em 'Aplicar Parâmetros' antes de exportar.")
-            return
+            return False
 
         if not LIBS_AVAILABLE:
             QMessageBox.critical(self, "Bibliotecas Ausentes", "As bibliotecas 'openpyxl' e 'reportlab' são necessárias para exportar.")
-            return
+            return False
+
+        required_tables = list(dict.fromkeys(t for report_class in report_classes for t in report_class.source_tables))
+        statuses = self.db.get_import_statuses(required_tables)['tables']
+        missing = [self.data_source_titles.get(tbl, tbl) for tbl in required_tables if statuses.get(tbl) is None]
+        if missing:
+            QMessageBox.critical(self, "Fontes de Dados Ausentes", f"Por favor, importe os dados para: {', '.join(missing)}")
+            return False
+        return True
+
+    def _report_params(self) -> dict:
+        return {
+            'clinic': self.selected_clinic,
+            'month': self.selected_month,
+            'year': self.selected_year
+        }
 
-        report_class = REPORT_REGISTRY.get(report_name)
+    def on_export_clicked(self, report_name, file_format):
+        report_class = _report_registry().get(report_name)
         if not report_class:
             QMessageBox.information(self, "Funcionalidade Futura", f"A exportação para '{report_name}' ainda não foi implementada.")
             return
 
-        required_tables = self.report_definitions["Relatório de Fechamento SUS"]["imports"]
-        if any(self.db.get_last_import_info(tbl) is None for tbl in required_tables):
-            missing = [self.data_source_titles[tbl] for tbl in required_tables if self.db.get_last_import_info(tbl) is None]
-            QMessageBox.critical(self, "Fontes de Dados Ausentes", f"Por favor, importe os dados para: {', '.join(missing)}")
+        if not self._check_export_preconditions([report_class]):
             return
 
-        try:
-            self.setCursor(QCursor(Qt.WaitCursor))
+        report_instance = report_class(self.db, self.logo_path, **self._report_params())
 
-            report_params = {
-                'clinic': self.selected_clinic,
-                'month': self.selected_month,
-                'year': self.selected_year
-            }
-            
-            report_instance = report_class(self.db, self.logo_path, **report_params)
-
-            file_filter = f"Arquivo {file_format} (*.{'xlsx' if file_format == 'Excel' else 'pdf'})"
-            
-            safe_title = report_instance.title.replace('/', '-').replace('\\', '-')
-            default_filename = f"{safe_title.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}"
-            
-            file_path, _ = QFileDialog.getSaveFileName(self, f"Salvar {report_instance.title}", default_filename, file_filter)
+        file_filter = f"Arquivo {file_format} (*.{'xlsx' if file_format == 'Excel' else 'pdf'})"
+        default_filename = f"{safe_filename(report_instance.title)}_{datetime.now().strftime('%Y%m%d')}"
 
-            if not file_path:
-                self.unsetCursor()
-                return
+        file_path, _ = QFileDialog.getSaveFileName(self, f"Salvar {report_instance.title}", default_filename, file_filter)
+        if not file_path:
+            return
 
-            report_instance.export(file_path, file_format)
+        self.export_runner.submit(report_instance, file_path, file_format)
 
-            QMessageBox.information(self, "Exportação Concluída", f"O relatório '{report_instance.title}' foi salvo com sucesso.")
+    def on_preview_report_clicked(self, report_name):
+        report_class = _report_registry().get(report_name)
+        if not report_class:
+            QMessageBox.information(self, "Funcionalidade Futura", f"A visualização de '{report_name}' ainda não foi implementada.")
+            return
 
-        except ValueError as ve:
-            QMessageBox.information(self, "Nenhum Resultado", str(ve))
-        except Exception as e:
-            QMessageBox.critical(self, "Erro na Exportação", f"Ocorreu um erro ao gerar ou salvar o relatório:\n\n{str(e)}")
-        finally:
-            self.unsetCursor()
+        if not self._check_export_preconditions([report_class]):
+            return
+
+        report_instance = report_class(self.db, self.logo_path, **self._report_params())
+        job_id = self.export_runner.submit_preview(report_instance)
+        self._preview_jobs[job_id] = report_instance.title
+
+    def on_report_preview_ready(self, job_id, result):
+        title = self._preview_jobs.get(job_id)
+        if title is None:
+            return
+        df, summary = result
+        dialog = ReportPreviewDialog(df, summary, title, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+
+    def on_export_all_clicked(self):
+        report_config = self.report_definitions.get(self.current_report_name, {})
+        registry = _report_registry()
+        report_classes = [registry[name] for name in report_config.get("exports", []) if name in registry]
+        if not report_classes or not self._check_export_preconditions(report_classes):
+            return
+
+        output_dir = QFileDialog.getExistingDirectory(self, "Selecionar pasta para os relatórios")
+        if not output_dir:
+            return
+
+        params = self._report_params()
+        batch_title = f"{self.current_report_name} - {self.selected_clinic} - {self.selected_month:02d}.{self.selected_year}"
+        zip_answer = QMessageBox.question(
+            self, "Exportar Todos",
+            "Deseja compactar todos os arquivos em um único arquivo ZIP?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No | QMessageBox.StandardButton.Cancel
+        )
+        if zip_answer == QMessageBox.StandardButton.Cancel:
+            return
+        zip_name = f"{safe_filename(batch_title)}.zip" if zip_answer == QMessageBox.StandardButton.Yes else None
+
+        reports = [report_class(self.db, self.logo_path, **params) for report_class in report_classes]
+        self.export_runner.submit_all(batch_title, reports, output_dir, zip_name=zip_name)
+
+    def on_export_workbook_clicked(self):
+        report_config = self.report_definitions.get(self.current_report_name, {})
+        registry = _report_registry()
+        report_classes = [registry[name] for name in report_config.get("workbook", []) if name in registry]
+        if not report_classes or not self._check_export_preconditions(report_classes):
+            return
+
+        params = self._report_params()
+        workbook_title = f"{self.current_report_name} - {self.selected_clinic} - {self.selected_month:02d}.{self.selected_year}"
+        file_path, _ = QFileDialog.getSaveFileName(self, "Salvar Planilha Única", safe_filename(workbook_title), "Arquivo Excel (*.xlsx)")
+        if not file_path:
+            return
+
+        reports = [report_class(self.db, self.logo_path, **params) for report_class in report_classes]
+        self.export_runner.submit_workbook(workbook_title, reports, file_path)
+
+    def on_export_job_started(self, job_id, description):
+        self._current_export_job = job_id
+        self.progress_bar.setValue(0)
+        self._update_status_bar()
+
+    def on_export_job_stage(self, job_id, stage, percent):
+        self.status_label.setText(f"{self.export_runner.description(job_id)}: {STAGE_LABELS.get(stage, stage)}...")
+        self.progress_bar.setValue(percent)
+
+    def on_export_job_finished(self, job_id, status, message):
+        if job_id == self._current_export_job:
+            self._current_export_job = None
+            self.progress_bar.setValue(100)
+        if self._preview_jobs.pop(job_id, None) is not None and status == 'ok':
+            return
+        if status == 'ok':
+            QMessageBox.information(self, "Exportação Concluída", message)
+        elif status == 'empty':
+            QMessageBox.information(self, "Nenhum Resultado", message)
+        elif status == 'error':
+            QMessageBox.critical(self, "Erro na Exportação", message)
+
+    def on_cancel_export_clicked(self):
+        if self._current_export_job is not None:
+            self.export_runner.cancel(self._current_export_job)
+            self.status_label.setText("Cancelando exportação...")
+
+    def _update_status_bar(self, *args):
+        pending = self.export_runner.pending_count()
+        if self._import_running:
+            return
+        if pending == 0:
+            self.status_frame.setVisible(False)
+            return
+        queued = pending - (1 if self._current_export_job is not None else 0)
+        self.cancel_export_button.setVisible(True)
+        self.cancel_export_button.setToolTip(
+            "Cancela a exportação em andamento." + (f" {queued} exportação(ões) aguardando na fila." if queued > 0 else "")
+        )
+        if self._current_export_job is None:
+            self.status_label.setText(f"{pending} exportação(ões) na fila...")
+        self.status_frame.setVisible(True)
 
     def _create_section_header(self, text, icon_name='fa5s.caret-right'):
         header_frame = QFrame()
@@ -404,15 +595,22 @@ class RelatorioWidget(QWidget):
                 item.widget().deleteLater()
 
     def update_correction_cards(self):
-        if hasattr(self, 'remarcacoes_count_label'):
-            remarcacoes_count = self.db.get_remarcacoes_count()
-            self.remarcacoes_count_label.setText(str(remarcacoes_count))
-            if remarcacoes_count > 0:
-                self.remarcacoes_export_button.setEnabled(True)
-                self.remarcacoes_export_button.setToolTip("Exportar a lista de pacientes com sessões remarcadas.")
-            else:
-                self.remarcacoes_export_button.setEnabled(False)
-                self.remarcacoes_export_button.setToolTip("Não há remarcações para exportar.")
+        self.status_service.refresh([], include_remarcacoes=True)
+
+    def _set_remarcacoes_count(self, remarcacoes_count):
+        if self.remarcacoes_count_label is None:
+            return
+        if remarcacoes_count is None:
+            self.remarcacoes_count_label.setText("...")
+            self.remarcacoes_export_button.setEnabled(False)
+            return
+        self.remarcacoes_count_label.setText(str(remarcacoes_count))
+        if remarcacoes_count > 0:
+            self.remarcacoes_export_button.setEnabled(True)
+            self.remarcacoes_export_button.setToolTip("Exportar a lista de pacientes com sessões remarcadas.")
+        else:
+            self.remarcacoes_export_button.setEnabled(False)
+            self.remarcacoes_export_button.setToolTip("Não há remarcações para exportar.")
 
     def on_export_remarcacoes_clicked(self):
         if not self.db.get_last_import_info('sessoes_hd'):
@@ -429,6 +627,7 @@ class RelatorioWidget(QWidget):
             if not file_path:
                 self.unsetCursor()
                 return
+            from core.exporter import export_simple_excel
             export_simple_excel(df_remarcacoes, file_path, sheet_name="Remarcações")
             QMessageBox.information(self, "Exportação Concluída", "O relatório de remarcações foi salvo com sucesso.")
         except Exception as e:
@@ -436,8 +635,25 @@ class RelatorioWidget(QWidget):
         finally:
             self.unsetCursor()
 
+    def prime_import_status(self, db_name: str, statuses: dict):
+        """ Situação das importações do banco db_name já buscada em segundo plano (aquecimento), usada quando ele for escolhido. """
+        if self.db is not None and self.db.db_name == db_name:
+            self.status_service.prime(statuses)
+            self.on_import_statuses_ready(statuses)
+        else:
+            self._prefetched_status = (db_name, statuses)
+
     def update_card_info(self, table_name):
-        info_data = self.db.get_last_import_info(table_name)
+        self.status_service.refresh([table_name])
+
+    def on_import_statuses_ready(self, result):
+        for table_name, info_data in result.get('tables', {}).items():
+            if table_name in self.cards:
+                self._set_card_info(table_name, info_data)
+        if 'remarcacoes_count' in result:
+            self._set_remarcacoes_count(result['remarcacoes_count'])
+
+    def _set_card_info(self, table_name, info_data):
         info_label = self.cards.get(table_name, {}).get('info_label')
         if info_label:
             if info_data:
@@ -450,12 +666,18 @@ class RelatorioWidget(QWidget):
         if not file_path: return
         try:
             clean_headers = get_clean_headers(table_name)
-            df = pd.read_csv(file_path, sep=';', encoding='latin-1', header=None, skiprows=1, dtype=str)
-            if len(df.columns) != len(clean_headers):
-                QMessageBox.warning(self, "Erro de Colunas", f"O arquivo possui {len(df.columns)} colunas, mas são esperadas {len(clean_headers)}.")
+            model = CsvPagedTableModel(file_path, clean_headers)
+        except Exception as e:
+            QMessageBox.critical(self, "Erro ao Ler CSV", str(e))
+            return
+        try:
+            first_row = model.first_row()
+            if first_row and len(first_row) != len(clean_headers):
+                QMessageBox.warning(self, "Erro de Colunas", f"O arquivo possui {len(first_row)} colunas, mas são esperadas {len(clean_headers)}.")
                 return
-            df.columns = clean_headers
-            dialog = PreviewDialog(df, os.path.basename(file_path), self)
+            dialog = PreviewDialog(model, os.path.basename(file_path), self)
             dialog.exec()
         except Exception as e:
-            QMessageBox.critical(self, "Erro ao Ler CSV", str(e))
\ No newline at end of file
+            QMessageBox.critical(self, "Erro ao Ler CSV", str(e))
+        finally:
+            model.close()
\ No newline at end of file
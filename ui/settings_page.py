@@ -0,0 +1,357 @@
+# ui/settings_page.py
+import os
+
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QFrame, QScrollArea,
+    QCheckBox, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
+    QAbstractItemView, QMessageBox
+)
+from PySide6.QtCore import Qt, QSettings, QSize, QThreadPool, Slot
+
+import qtawesome as qta
+
+from core import perf_log
+from core.diagnostics import DiagnosticsJob, MaintenanceJob
+from config import DATA_SOURCE_TITLES
+from styles import COLORS
+
+# Chave no QSettings do registro de desempenho.
+PERF_LOG_SETTING = "desempenho/registrar"
+
+# (ação, texto do botão, ícone, dica)
+MAINTENANCE_BUTTONS = [
+    ('analyze', " Atualizar Estatísticas", 'fa5s.chart-line', "Executa ANALYZE para o SQLite escolher melhor os planos de consulta."),
+    ('vacuum', " Compactar Banco", 'fa5s.compress-arrows-alt', "Executa VACUUM: reescreve o arquivo do banco, liberando o espaço de tabelas reimportadas."),
+    ('checkpoint', " Transferir WAL", 'fa5s.file-import', "Transfere o arquivo de WAL (-wal) para o arquivo principal do banco."),
+    ('integrity_check', " Verificar Integridade", 'fa5s.check-circle', "Verifica se o arquivo do banco está íntegro."),
+    ('clear_render_cache', " Limpar Cache de Relatórios", 'fa5s.broom', "Apaga os relatórios já renderizados guardados em cache."),
+]
+
+RUN_COLUMNS = ["Tipo", "Tabela / Relatório", "Formato", "Clínica", "Última Execução", "Duração", "Média", "Execuções", "Linhas", "Linhas/s", "Memória"]
+TABLE_COLUMNS = ["Tabela", "Linhas", "Índices", "Consulta da Situação"]
+
+def apply_saved_settings():
+    """
+    Aplica as preferências salvas na inicialização. A variável de ambiente
+    SISSUP_PERF_LOG, se definida, tem prioridade sobre a preferência salva.
+    """
+    if not perf_log.is_set_by_environment():
+        perf_log.set_enabled(QSettings().value(PERF_LOG_SETTING, False, type=bool))
+
+def _format_duration(ms: float) -> str:
+    return f"{ms / 1000:.2f} s" if ms >= 1000 else f"{ms:.0f} ms"
+
+def _format_size(size: int) -> str:
+    return f"{size / 1024 / 1024:.1f} MB"
+
+def _format_int(value) -> str:
+    return f"{value:,}".replace(",", ".")
+
+class SettingsPage(QWidget):
+    """
+    Configurações e diagnóstico: liga o log de desempenho, resume as
+    importações e exportações registradas nele, mostra o tamanho e as tabelas
+    do banco e executa tarefas de manutenção. Os dados são recarregados em
+    segundo plano sempre que a página é exibida.
+
+    O banco é o da clínica e competência escolhidas na tela de relatórios
+    (set_database); antes da escolha, só o log de desempenho é mostrado.
+    """
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._diagnostics_job = None
+        self._maintenance_job = None
+        self._setup_ui()
+        self._update_maintenance_buttons()
+
+    def set_database(self, db):
+        """ Troca o banco mostrado e mantido pela página. """
+        self.db = db
+        self._update_maintenance_buttons()
+        if self.isVisible():
+            self.refresh()
+
+    def _update_maintenance_buttons(self):
+        enabled = self.db is not None and self._maintenance_job is None
+        for button in self.maintenance_buttons:
+            button.setEnabled(enabled)
+
+    def _setup_ui(self):
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+
+        scroll_area = QScrollArea()
+        scroll_area.setObjectName("scrollArea")
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        main_layout.addWidget(scroll_area)
+
+        scroll_content_widget = QWidget()
+        scroll_area.setWidget(scroll_content_widget)
+        self.content_layout = QVBoxLayout(scroll_content_widget)
+        self.content_layout.setContentsMargins(30, 20, 30, 30)
+        self.content_layout.setSpacing(25)
+
+        self.content_layout.addWidget(self._create_section_header("Diagnóstico de Desempenho", icon_name='fa5s.stopwatch'))
+        self.content_layout.addWidget(self._create_perf_log_panel())
+
+        runs_header = self._create_section_header("Importações e Exportações Recentes", icon_name='fa5s.history')
+        self.refresh_button = QPushButton(qta.icon('fa5s.sync-alt', color=COLORS['icon-color-light-bg']), " Atualizar")
+        self.refresh_button.setObjectName("exportButton")
+        self.refresh_button.setCursor(Qt.PointingHandCursor)
+        self.refresh_button.clicked.connect(self.refresh)
+        runs_header.layout().addWidget(self.refresh_button)
+        self.content_layout.addWidget(runs_header)
+        self.content_layout.addWidget(self._create_runs_panel())
+
+        self.content_layout.addWidget(self._create_section_header("Banco de Dados", icon_name='fa5s.database'))
+        self.content_layout.addWidget(self._create_storage_panel())
+
+        self.content_layout.addWidget(self._create_section_header("Manutenção", icon_name='fa5s.tools'))
+        self.content_layout.addWidget(self._create_maintenance_panel())
+        self.content_layout.addStretch(1)
+
+    def _create_section_header(self, text, icon_name='fa5s.caret-right'):
+        header_frame = QFrame()
+        header_frame.setObjectName("sectionHeaderFrame")
+        layout = QHBoxLayout(header_frame)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(10)
+        icon = QLabel()
+        icon.setPixmap(qta.icon(icon_name, color=COLORS['primary']).pixmap(QSize(18, 18)))
+        layout.addWidget(icon)
+        title = QLabel(text)
+        title.setObjectName("sectionTitle")
+        layout.addWidget(title)
+        layout.addStretch()
+        return header_frame
+
+    def _create_panel(self):
+        panel = QFrame()
+        panel.setObjectName("settingsPanel")
+        layout = QVBoxLayout(panel)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(10)
+        return panel, layout
+
+    def _create_table(self, headers):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setAlternatingRowColors(True)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        return table
+
+    def _create_perf_log_panel(self):
+        panel, layout = self._create_panel()
+
+        self.perf_log_checkbox = QCheckBox("Registrar o tempo das importações e exportações")
+        self.perf_log_checkbox.setCursor(Qt.PointingHandCursor)
+        self.perf_log_checkbox.setChecked(perf_log.is_enabled())
+        self.perf_log_checkbox.toggled.connect(self.on_perf_log_toggled)
+        layout.addWidget(self.perf_log_checkbox)
+
+        description = QLabel(
+            "Cada etapa (leitura, limpeza, consulta, geração do arquivo...) grava a duração, "
+            "o número de linhas e o pico de memória em um arquivo de log. "
+            "Anexe esse arquivo aos chamados de suporte sobre lentidão."
+        )
+        description.setObjectName("infoLabel")
+        description.setWordWrap(True)
+        layout.addWidget(description)
+
+        path_layout = QHBoxLayout()
+        path_label = QLabel(f"<b>Arquivo:</b> {perf_log.log_path()}")
+        path_label.setObjectName("infoLabel")
+        path_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        path_layout.addWidget(path_label, 1)
+        clear_log_button = QPushButton(qta.icon('fa5s.trash-alt', color=COLORS['icon-color-light-bg']), " Limpar Log")
+        clear_log_button.setObjectName("exportButton")
+        clear_log_button.setCursor(Qt.PointingHandCursor)
+        clear_log_button.clicked.connect(self.on_clear_log_clicked)
+        path_layout.addWidget(clear_log_button)
+        layout.addLayout(path_layout)
+
+        if perf_log.is_set_by_environment():
+            self.perf_log_checkbox.setEnabled(False)
+            env_label = QLabel(f"Definido pela variável de ambiente {perf_log.PERF_LOG_ENV}.")
+            env_label.setObjectName("infoLabel")
+            layout.addWidget(env_label)
+        return panel
+
+    def _create_runs_panel(self):
+        panel, layout = self._create_panel()
+        self.runs_info_label = QLabel("Carregando...")
+        self.runs_info_label.setObjectName("infoLabel")
+        self.runs_info_label.setWordWrap(True)
+        layout.addWidget(self.runs_info_label)
+        self.runs_table = self._create_table(RUN_COLUMNS)
+        self.runs_table.setMinimumHeight(260)
+        layout.addWidget(self.runs_table)
+        return panel
+
+    def _create_storage_panel(self):
+        panel, layout = self._create_panel()
+        summary_layout = QGridLayout()
+        summary_layout.setHorizontalSpacing(30)
+        self.storage_labels = {}
+        for index, (key, title) in enumerate([
+            ('file', "Arquivo"), ('size', "Tamanho"), ('wal', "WAL"),
+            ('journal', "Modo de diário"), ('cache', "Cache de relatórios"),
+        ]):
+            label = QLabel(f"<b>{title}:</b> -")
+            label.setObjectName("infoLabel")
+            label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+            summary_layout.addWidget(label, index // 3, index % 3)
+            self.storage_labels[key] = (label, title)
+        layout.addLayout(summary_layout)
+        self.tables_table = self._create_table(TABLE_COLUMNS)
+        self.tables_table.setMinimumHeight(240)
+        layout.addWidget(self.tables_table)
+        return panel
+
+    def _create_maintenance_panel(self):
+        panel, layout = self._create_panel()
+        buttons_layout = QHBoxLayout()
+        buttons_layout.setSpacing(10)
+        self.maintenance_buttons = []
+        for action, text, icon_name, tooltip in MAINTENANCE_BUTTONS:
+            button = QPushButton(qta.icon(icon_name, color=COLORS['icon-color-light-bg']), text)
+            button.setObjectName("exportButton")
+            button.setCursor(Qt.PointingHandCursor)
+            button.setToolTip(tooltip)
+            button.clicked.connect(lambda checked=False, a=action: self.run_maintenance(a))
+            buttons_layout.addWidget(button)
+            self.maintenance_buttons.append(button)
+        buttons_layout.addStretch()
+        layout.addLayout(buttons_layout)
+        self.maintenance_label = QLabel("")
+        self.maintenance_label.setObjectName("infoLabel")
+        self.maintenance_label.setWordWrap(True)
+        layout.addWidget(self.maintenance_label)
+        return panel
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+
+    @Slot()
+    def refresh(self):
+        if self._diagnostics_job is not None:
+            return
+        self.refresh_button.setEnabled(False)
+        self._diagnostics_job = DiagnosticsJob(self.db)
+        self._diagnostics_job.signals.finished.connect(self.on_diagnostics_ready)
+        self.pool.start(self._diagnostics_job)
+
+    @Slot(object, str)
+    def on_diagnostics_ready(self, result, error: str):
+        job, self._diagnostics_job = self._diagnostics_job, None
+        self.refresh_button.setEnabled(True)
+        if job is not None and job.db is not self.db:
+            # O banco foi trocado durante a consulta.
+            self.refresh()
+            return
+        if error or result is None:
+            self.runs_info_label.setText(f"Não foi possível carregar o diagnóstico: {error}")
+            return
+        self._fill_runs(result)
+        self._fill_storage(result)
+
+    def _fill_runs(self, result):
+        runs = result['runs']
+        if runs:
+            self.runs_info_label.setText(f"{_format_int(result['log_records'])} registro(s) no log de desempenho.")
+        elif perf_log.is_enabled():
+            self.runs_info_label.setText("Nenhuma importação ou exportação registrada ainda.")
+        else:
+            self.runs_info_label.setText("O registro de desempenho está desligado. Ligue-o acima para acompanhar os tempos.")
+        self.runs_table.setRowCount(len(runs))
+        for row, run in enumerate(runs):
+            name = DATA_SOURCE_TITLES.get(run['name'], run['name']) if run['kind'] == 'Importação' else run['name']
+            rate = run['rows_per_second']
+            values = [
+                run['kind'], name, run['format'], run['clinic'],
+                run['last_run'].replace('T', ' ')[:19],
+                _format_duration(run['duration_ms']),
+                _format_duration(run['average_ms']),
+                _format_int(run['runs']),
+                _format_int(run['rows']),
+                _format_int(round(rate)) if rate else "-",
+                f"{run['peak_mb']:.1f} MB" if run['peak_mb'] is not None else "-",
+            ]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col >= 5:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.runs_table.setItem(row, col, item)
+
+    def _fill_storage(self, result):
+        storage = result['storage']
+        if storage is None:
+            for label, title in self.storage_labels.values():
+                label.setText(f"<b>{title}:</b> -")
+            self.storage_labels['file'][0].setText("<b>Arquivo:</b> selecione a clínica e o período na tela de relatórios")
+            self.tables_table.setRowCount(0)
+            return
+        values = {
+            'file': os.path.abspath(self.db.db_name),
+            'size': _format_size(storage['file_size']),
+            'wal': _format_size(storage['wal_size']),
+            'journal': storage['journal_mode'].upper(),
+            'cache': _format_size(result['render_cache_size']),
+        }
+        for key, (label, title) in self.storage_labels.items():
+            label.setText(f"<b>{title}:</b> {values[key]}")
+
+        tables = storage['tables']
+        self.tables_table.setRowCount(len(tables))
+        for row, table in enumerate(tables):
+            uses_index = "usa índice" if table['status_query_uses_index'] else "leitura completa da tabela"
+            values = [
+                DATA_SOURCE_TITLES.get(table['name'], table['name']),
+                _format_int(table['rows']),
+                ", ".join(table['indexes']) or "nenhum",
+                uses_index,
+            ]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col == 1:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.tables_table.setItem(row, col, item)
+
+    def run_maintenance(self, action: str):
+        if self._maintenance_job is not None or self.db is None:
+            return
+        for button in self.maintenance_buttons:
+            button.setEnabled(False)
+        self.maintenance_label.setText("Executando...")
+        self._maintenance_job = MaintenanceJob(self.db, action)
+        self._maintenance_job.signals.finished.connect(self.on_maintenance_finished)
+        self.pool.start(self._maintenance_job)
+
+    @Slot(object, str)
+    def on_maintenance_finished(self, message, error: str):
+        self._maintenance_job = None
+        self._update_maintenance_buttons()
+        self.maintenance_label.setText(message if not error else f"Erro na manutenção: {error}")
+        self.refresh()
+
+    @Slot(bool)
+    def on_perf_log_toggled(self, checked: bool):
+        perf_log.set_enabled(checked)
+        QSettings().setValue(PERF_LOG_SETTING, checked)
+
+    @Slot()
+    def on_clear_log_clicked(self):
+        reply = QMessageBox.question(self, "Limpar Log", "Apagar todos os registros do log de desempenho?")
+        if reply != QMessageBox.Yes:
+            return
+        perf_log.clear_log()
+        self.refresh()